@@ -11,8 +11,8 @@ from fw.old.core import authorization
 class fw:
     def __init__(self, env=None, **settings):
         util = utilities.Util()
-        self.fw_settings = util.settings()
-        self.fw_settings, test_sets, settings = util.add_settings(self.fw_settings, {}, settings, init=True)
+        self.fw_settings = util.settings().to_series()
+        self.fw_settings, self.test_settings, settings = util.add_settings(self.fw_settings, {}, settings, init=True)
         self.fw_dir = util.fw_dir()
         self.env = environment.Env().load_environment_settings(util.parse_env(env))
         logging.Logging(self.fw_settings).set_logging()
@@ -21,6 +21,17 @@ class fw:
         self.lib = library.Library(self)
         self.sut = sut.SystemInterfaces(self)
 
+    def __getstate__(self):
+        # the helper objects hold keyword classes and handles that cannot be pickled; they are rebuilt instead (e.g.
+        # when rows of a keyword run in a process pool). The evidence archive stays with the test process.
+        return {k: v for k, v in self.__dict__.items() if k not in ('auth', 'lib', 'sut', 'EVIDENCE')}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.auth = authorization.Authorization(self)
+        self.lib = library.Library(self)
+        self.sut = sut.SystemInterfaces(self)
+
     def get_keyword_names(self):
         return keyword.KeywordInfo().get_qualified_keywords()
 
@@ -31,7 +42,16 @@ class fw:
         return keyword.KeywordInfo().get_keyword_documentation(name)
 
     def run_keyword(self, name: str, args: list, kwargs: dict):
-        return execution.Runner().run_kw(self, name, args, kwargs)
+        return execution.Runner(self).run_kw(name, args, kwargs)
+
+    async def arun_keyword(self, name: str, args: list, kwargs: dict):
+        return await execution.Runner(self).arun_kw(name, args, kwargs)
+
+    def start_test(self, test_name: str, evidence_loc: str):
+        return execution.Runner(self).start_test(test_name, evidence_loc)
+
+    def finish_test(self, test_name: str, evidence_loc: str):
+        return execution.Runner(self).finish_test(test_name, evidence_loc)
 
 
 class Debug(fw):
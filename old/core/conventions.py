@@ -1,5 +1,6 @@
 from fw.old.core import Util
 from datetime import datetime
+from functools import lru_cache
 import re
 import logging
 
@@ -17,37 +18,66 @@ class KeywordNameConventions:
                             'The name is given in the settings via the POM_KW_NAMING_CONVENTION parameter.'
                             .format('", "'.join(invalids)))
 
+    @staticmethod
+    def get_translator():
+        convention = Util().settings().POM_KW_NAMING_CONVENTION
+        try:
+            return KeywordNameConventions._translators[convention]
+        except KeyError:
+            translator = NameTranslator(convention, KeywordNameConventions.mapper)
+            KeywordNameConventions._translators[convention] = translator
+            return translator
+
     def make_method_name(self, **variables):
-        name = Util().settings().POM_KW_NAMING_CONVENTION.format(**variables)
-        logging.debug('Resolved default name is: {}'.format(name))
-        for kw_char, m_char in self.mapper.items():
-            name = name.replace(kw_char, m_char)
-            logging.debug('Resolved method name is: {}'.format(name))
-        return name
+        return self.get_translator().make_method_name(**variables)
 
     def make_keyword_name(self, **variables):
-        name = Util().settings().POM_KW_NAMING_CONVENTION.format(**variables)
-        logging.debug('Resolved default name is: {}'.format(name))
-        for kw_char, m_char in self.mapper.items():
-            name = name.replace(m_char, kw_char)
-            logging.debug('Resolved keyword name is: {}'.format(name))
-        return name
+        return self.get_translator().make_keyword_name(**variables)
 
     def convert_name(self, name: str, in_name='method'):
         if in_name.lower() == 'method':
-            for kw_char, m_char in self.mapper.items():
-                name = name.replace(m_char, kw_char)
+            return self.get_translator().to_keyword(name)
         elif in_name.lower() == 'keyword':
-            for kw_char, m_char in self.mapper.items():
-                name = name.replace(kw_char, m_char)
+            return self.get_translator().to_method(name)
         else:
             raise ValueError('The indicated input name ({}) is not a valid option.'.format(in_name))
-        return name
 
     mapper = {r'(': '_BO_',
               r')': '_BC_',
               r' ': '_'}
 
+    _translators = {}
+
+
+class NameTranslator:
+    """
+    Single pass translation between keyword and method names for one naming convention, with a bounded cache of
+    already translated names in both directions.
+    """
+    def __init__(self, convention, mapper, cache_size=4096):
+        self.convention = convention
+        self._to_method_table = str.maketrans(dict(mapper))
+        self._to_keyword_map = {m_char: kw_char for kw_char, m_char in mapper.items()}
+        self._to_keyword_re = re.compile('|'.join(map(re.escape, sorted(self._to_keyword_map, key=len, reverse=True))))
+        self.to_method = lru_cache(maxsize=cache_size)(self._to_method)
+        self.to_keyword = lru_cache(maxsize=cache_size)(self._to_keyword)
+        self._format_name = lru_cache(maxsize=cache_size)(self._format)
+
+    def _to_method(self, name):
+        return name.translate(self._to_method_table)
+
+    def _to_keyword(self, name):
+        return self._to_keyword_re.sub(lambda m: self._to_keyword_map[m.group(0)], name)
+
+    def _format(self, variables):
+        return self.convention.format(**dict(variables))
+
+    def make_method_name(self, **variables):
+        return self.to_method(self._format_name(tuple(sorted(variables.items()))))
+
+    def make_keyword_name(self, **variables):
+        return self.to_keyword(self._format_name(tuple(sorted(variables.items()))))
+
 
 class FileName:
     def __init__(self, name_template=None):
@@ -1,19 +1,414 @@
 import re
 import fw.old.core.keyword as kw
+import numpy as np
 import pandas as pd
+from pathlib import Path
 
-from .datetime import DateParser
+from .datetime import DateParser, run_clock
+from .evaluation import Evaluator
+from .timing import stage_timer
 from .utilities import Util
 
-import copy
 import datetime as dt
+import hashlib
+import io
+import json
+import logging
+import mmap
+import os
+import pickle
+import threading
+
+
+def _json_values(stream, block_size=2 ** 16):
+    """ Yields the rows of a JSON Lines file, a top level JSON array or a single JSON object, reading in blocks. """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = '', 0, False
+    started = in_array = False
+    while True:
+        while pos < len(buffer) and (buffer[pos] in ' \t\r\n' or (in_array and buffer[pos] == ',')):
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                return
+            buffer, pos = stream.read(block_size), 0
+            eof = buffer == ''
+            continue
+        if not started and buffer[pos] == '[':
+            started = in_array = True
+            pos += 1
+            continue
+        if in_array and buffer[pos] == ']':
+            in_array = False
+            pos += 1
+            continue
+        error = end = None
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            error = e
+        # a value running to the end of the buffer may continue in the next block (e.g. a number).
+        if error is not None or (end == len(buffer) and not eof):
+            block = stream.read(max(block_size, len(buffer) - pos))
+            if block == '':
+                if error is not None:
+                    raise error
+                eof = True
+                continue
+            buffer, pos = buffer[pos:] + block, 0
+            continue
+        started = True
+        pos = end
+        yield value
+
+
+class DataFileCache:
+    """
+    Cross process cache of parsed data files.
+
+    Every version of a data file (path, mtime, size and read options) is stored as a stream of pickled, already
+    transformed chunks, so cached reads stream and stop early just like reads from the source file. Only reads that
+    ran to the end of the file are stored.
+
+    The cache is off unless DATA_CACHE_DIR is set. Loading a pickle can run code, so entries are only read from a
+    directory, and only from files, that belong to the current user and that no one else can write.
+    """
+    version = 1
+    suffix = '.pkl'
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _key(self, filename, options):
+        path = Path(filename).resolve()
+        st = path.stat()
+        key = [self.version, pd.__version__, str(path), st.st_mtime_ns, st.st_size,
+               sorted((opt, repr(val)) for opt, val in options.items())]
+        return hashlib.sha1(repr(key).encode()).hexdigest()
+
+    @staticmethod
+    def _private(st):
+        if not hasattr(os, 'getuid'):
+            return True
+        return st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+    def _directory(self, directory):
+        directory = Path(directory).expanduser().absolute()
+        try:
+            directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            if self._private(directory.stat()):
+                return directory
+        except OSError:
+            pass
+        logging.warning('Data cache "{}" is not used, it should be a directory that only the current user can '
+                        'write.'.format(directory))
+        return None
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def chunks(self, filename, options, reader, directory, max_size):
+        # reader() returns the chunks from the source file, it is only called on a miss.
+        directory = self._directory(directory) if directory else None
+        if directory is None:
+            return reader()
+        entry = Path(directory, self._key(filename, options) + self.suffix)
+        try:
+            stream = open(entry, 'rb')
+        except OSError:
+            stream = None
+        if stream is not None and not self._private(os.fstat(stream.fileno())):
+            stream.close()
+            stream = None
+            logging.warning('Data cache entry "{}" does not belong to the current user, it is ignored.'.format(entry))
+        if stream is None:
+            self._count(False)
+            return self._write(entry, reader(), max_size)
+        self._count(True)
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return self._read(stream)
+
+    @staticmethod
+    def _read(stream):
+        with stream:
+            while True:
+                try:
+                    yield pickle.load(stream)
+                except EOFError:
+                    return
+
+    def _write(self, entry, chunks, max_size):
+        temp_file = Path('{}.{}.{}.tmp'.format(entry, os.getpid(), threading.get_ident()))
+        stream = None
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            stream = os.fdopen(os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), 'wb')
+        except OSError as e:
+            logging.warning('Data cache "{d}" could not be written: {e}'.format(d=entry.parent, e=e))
+
+        def dump(chunk):
+            nonlocal stream
+            if stream is None:
+                return
+            try:
+                pickle.dump(chunk, stream, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError as e:
+                logging.warning('Data cache entry "{f}" could not be written: {e}'.format(f=entry, e=e))
+                stream.close()
+                stream = None
+
+        try:
+            # when the caller stops early (e.g. all ROWS were found), GeneratorExit skips storing the entry: only
+            # complete reads are cached and the rest of the file is not read.
+            for chunk in chunks:
+                dump(chunk)
+                yield chunk
+            if stream is not None:
+                stream.close()
+                os.replace(temp_file, entry)
+                stream = None
+                self.evict(entry.parent, max_size)
+        finally:
+            if stream is not None:
+                stream.close()
+            if temp_file.exists():
+                temp_file.unlink()
+
+    def evict(self, directory, max_size):
+        entries = []
+        for file in Path(directory).glob('*' + self.suffix):
+            try:
+                st = file.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, file))
+        total = sum(size for _, size, _ in entries)
+        for _, size, file in sorted(entries, key=lambda e: e[0]):
+            if total <= max_size:
+                break
+            try:
+                file.unlink()
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self, directory):
+        for file in Path(directory).glob('*' + self.suffix):
+            try:
+                file.unlink()
+            except OSError:
+                pass
+        self.hits = 0
+        self.misses = 0
+
+
+data_file_cache = DataFileCache()
+
+
+class RowIndex:
+    """
+    Byte offsets of the lines of a csv file, kept in the data cache directory and invalidated by mtime and size.
+
+    Selected rows are read by seeking to their lines in a memory mapped file. Files where a quoted field spans
+    lines are not indexed, since their lines are not rows.
+    """
+    version = 2
+    suffix = '.idx.npy'
+    block_size = 2 ** 26
+    blanks = np.frombuffer(b' \t\r', dtype=np.uint8)
+
+    def __init__(self):
+        self.built = 0
+        self._lock = threading.Lock()
+        self._indexes = {}
+
+    def _key(self, filename):
+        path = Path(filename).resolve()
+        st = path.stat()
+        return hashlib.sha1(repr([self.version, str(path), st.st_mtime_ns, st.st_size]).encode()).hexdigest()
+
+    def _build(self, view):
+        size = len(view)
+        newlines, quotes = [], []
+        for offset in range(0, size, self.block_size):
+            block = view[offset:offset + self.block_size]
+            newlines.append(np.flatnonzero(block == ord('\n')) + offset)
+            quotes.append(np.flatnonzero(block == ord('"')) + offset)
+        ends = np.concatenate(newlines + [np.array([size], dtype=np.int64)]).astype(np.int64)
+        starts = np.concatenate([[0], ends[:-1] + 1]).astype(np.int64)
+        quotes = np.concatenate(quotes + [np.array([], dtype=np.int64)])
+        if ((np.searchsorted(quotes, ends) - np.searchsorted(quotes, starts)) % 2).any():
+            return np.empty(0, dtype=np.int64)
+        # blank lines (empty or only spaces, tabs and carriage returns) are skipped by the csv reader, so they are
+        # left out to keep lines and rows aligned. Only lines starting with such a character can be blank.
+        keep = ends > starts
+        keep[keep] = np.isin(view[starts[keep]], self.blanks, invert=True)
+        for line in np.flatnonzero((ends > starts) & ~keep):
+            keep[line] = not np.isin(view[starts[line]:ends[line]], self.blanks).all()
+        return np.stack([starts[keep], ends[keep]])
+
+    def _load(self, file):
+        try:
+            return np.load(file, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, file, index):
+        temp_file = Path('{}.{}.{}.tmp'.format(file, os.getpid(), threading.get_ident()))
+        try:
+            file.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_file, 'wb') as stream:
+                np.save(stream, index)
+            os.replace(temp_file, file)
+        except OSError as e:
+            logging.warning('Row index "{f}" could not be written: {e}'.format(f=file, e=e))
+            if temp_file.exists():
+                temp_file.unlink()
+
+    def get(self, filename, directory, view=None):
+        key = self._key(filename)
+        index = self._indexes.get(key)
+        if index is not None:
+            return index
+        file = Path(directory, key + self.suffix)
+        index = self._load(file)
+        if index is None:
+            if view is None:
+                return None
+            index = self._build(view)
+            self.built += 1
+            self._save(file, index)
+        with self._lock:
+            if len(self._indexes) >= 32:
+                self._indexes.pop(next(iter(self._indexes)))
+            self._indexes[key] = index
+        return index
+
+    def read(self, filename, numbers, directory):
+        """ Returns the header and the (0-based) rows as csv bytes, or None when the file cannot be indexed. """
+        with open(filename, 'rb') as stream:
+            if os.fstat(stream.fileno()).st_size == 0:
+                return None
+            with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = np.frombuffer(mapped, dtype=np.uint8)
+                try:
+                    index = self.get(filename, directory, view)
+                finally:
+                    del view
+                if index.ndim != 2 or index.shape[1] == 0:
+                    return None
+                starts, ends = index
+                missing = [n + 1 for n in numbers if not 0 <= n < len(starts) - 1]
+                if missing:
+                    raise KeyError('Row(s) {r} are not in data file "{f}".'.format(r=missing, f=filename))
+                lines = [mapped[starts[line]:ends[line]] for line in [0] + [n + 1 for n in numbers]]
+        return b'\n'.join(lines) + b'\n'
+
+
+row_index = RowIndex()
+
+
+class ColumnSchema:
+    """
+    Column types a keyword declares in its config (key "schema"), applied to data files while they are read.
+
+    A schema maps columns to a type, or to a dict with a type and options, e.g.
+    {'AMOUNT': 'float', 'STATUS': 'category', 'DATE': {'type': 'datetime', 'format': '%Y/%m/%d', 'tz': 'CET'}}.
+    Types are str, int, float (or a sized numpy name like int32 or float32), bool, category and datetime; datetimes
+    are returned in UTC. Undeclared columns stay strings. Declared columns should hold plain values, they are not
+    evaluated nor searched for dates.
+    """
+    types = ('str', 'int', 'float', 'bool', 'category', 'datetime')
+    sized_types = ('int8', 'int16', 'int32', 'int64', 'float32', 'float64')
+    booleans = {'true': True, 'yes': True, '1': True, 'false': False, 'no': False, '0': False}
+
+    def __init__(self, schema=None):
+        self.columns = {}
+        for col, spec in (schema or {}).items():
+            spec = dict(spec) if isinstance(spec, dict) else {'type': spec}
+            if spec.get('type') not in self.types + self.sized_types:
+                raise ValueError('Type "{t}" of column "{c}" is not supported (use one of: "{opts}").'
+                                 .format(t=spec.get('type'), c=col, opts='", "'.join(self.types + self.sized_types)))
+            self.columns[str(col).upper()] = spec
+
+    @classmethod
+    def for_keyword(cls, name):
+        if name is None:
+            return cls()
+        try:
+            return cls(kw.keyword_index.get(name).schema)
+        except AttributeError:
+            return cls()
+
+    def __bool__(self):
+        return len(self.columns) > 0
+
+    @property
+    def key(self):
+        return sorted((col, sorted(spec.items())) for col, spec in self.columns.items())
+
+    def _convert(self, column, spec):
+        kind = spec['type']
+        if kind == 'str':
+            return column
+        if kind == 'category':
+            return column.astype('category')
+        if kind == 'datetime':
+            values = pd.to_datetime(column, format=spec.get('format'), utc=spec.get('tz') is None)
+            if spec.get('tz') is not None:
+                values = values.dt.tz_localize(spec['tz']).dt.tz_convert('UTC')
+            return values
+        if kind == 'bool':
+            values = column.str.strip().str.lower().map(self.booleans)
+            invalid = values.isna() & column.notna()
+            if invalid.any():
+                raise ValueError('"{}" is not a boolean.'.format(column[invalid].iloc[0]))
+            return values.astype('boolean' if values.isna().any() else bool)
+        values = pd.to_numeric(column)
+        if kind.startswith('int'):
+            size = 'int64' if kind == 'int' else kind
+            return values.astype(size.capitalize() if values.isna().any() else size)
+        return values.astype('float64' if kind == 'float' else kind)
+
+    def apply(self, data):
+        for i, col in enumerate(data.columns):
+            spec = self.columns.get(str(col).upper())
+            if spec is None:
+                continue
+            try:
+                data.isetitem(i, self._convert(data.iloc[:, i], spec))
+            except (TypeError, ValueError) as e:
+                raise ValueError('Column "{c}" cannot be read as {t}: {e}'.format(c=col, t=spec['type'], e=e)) from e
+        return data
+
+    @staticmethod
+    def concat(parts):
+        # chunks hold their own categories; without a common set, concat would fall back to object columns.
+        for col in parts[0].columns:
+            if isinstance(parts[0][col].dtype, pd.CategoricalDtype):
+                categories = pd.api.types.union_categoricals([part[col] for part in parts]).categories
+                parts = [part.assign(**{col: part[col].cat.set_categories(categories)}) for part in parts]
+        return pd.concat(parts)
 
 
 class DataLoader:
+    # superset of the strings accepted by _transform_read_datetime, to skip strptime for other cells.
+    _read_datetime_pattern = re.compile(r'\d{4}-\d{1,2}-\d{1,2}\s+\d{1,2}:\d{1,2}:\d{1,2}')
+
     def __init__(self, fwo):
         self._fw = fwo
         self._eval_ind = fwo.fw_settings.EVAL_INDICATOR
         self._eval_len = len(self._eval_ind)
+        self._evaluator = Evaluator(self._eval_ind)
 
     @staticmethod
     def _add_args_to_kwargs(name, args, kwargs):
@@ -60,84 +455,81 @@ class DataLoader:
         except ValueError:
             return val
 
-    def _reduce_rows(self, data, rows):
-        if rows is None:
-            return data
-        rows = str(rows)
-        if rows[0:self._eval_len] == self._eval_ind:
-            context = {}
-            fltr = data.apply(lambda r: self._evaluate_cell(rows, r, context), axis=1)
-            data = data[fltr]
-        elif rows is not None or rows.upper() not in ('ALL', 'NONE'):
-            rows_int = [int(x) - 1 for x in rows.split(',')]
-            data = data.loc[rows_int]
+    @staticmethod
+    def _row_numbers(rows):
+        if rows is None or rows.upper() in ('ALL', 'NONE'):
+            return None
+        return [int(x) - 1 for x in rows.split(',')]
+
+    def _transform_read_datetimes(self, data):
+        for i in range(data.shape[1]):
+            col = data.iloc[:, i]
+            if col.dtype != object:
+                continue
+            try:
+                candidates = col.str.match(self._read_datetime_pattern, na=False)
+            except AttributeError:
+                continue
+            if candidates.any():
+                data.isetitem(i, col.map(self._transform_read_datetime))
         return data
 
-    def _extract_data(self, kwargs):
+    def _reduce_rows(self, data, rows, columns=None):
+        # data is a DataFrame or an iterable of DataFrame chunks (e.g. from iter_csv); the extra
+        # columns are assigned per chunk so row filters can refer to them.
+        columns = columns or {}
+        chunks = [data] if isinstance(data, pd.DataFrame) else data
+        rows = None if rows is None else str(rows)
+        row_filter = rows is not None and rows[0:self._eval_len] == self._eval_ind
+        numbers = None if row_filter else self._row_numbers(rows)
+        wanted = None if numbers is None else set(numbers)
+        last = None if numbers is None else max(numbers)
+        parts = []
+        for chunk in chunks:
+            if wanted is not None:
+                parts.append(chunk.loc[chunk.index.isin(wanted)].assign(**columns))
+                if len(chunk) > 0 and chunk.index[-1] >= last:
+                    break
+            elif row_filter:
+                chunk = chunk.assign(**columns)
+                parts.append(chunk[self._evaluator.evaluate_mask(rows, chunk)])
+            else:
+                parts.append(chunk.assign(**columns))
+        if hasattr(chunks, 'close'):
+            chunks.close()
+        if not parts:
+            # the chunks held no frame at all (e.g. an empty cached read).
+            data = pd.DataFrame()
+        else:
+            data = parts[0] if len(parts) == 1 else ColumnSchema.concat(parts)
+        if numbers is not None:
+            missing = [n + 1 for n in numbers if n not in data.index]
+            if missing:
+                raise KeyError('Row(s) {r} are not in the data, it holds {n} row(s).'.format(r=missing, n=len(data)))
+            data = data.loc[numbers]
+        return data
+
+    def _extract_data(self, kwargs, schema=None):
         data = kwargs.get('DATA')
         if data is not None:
             kwargs.pop('DATA')
         data_file = kwargs.get('DATA_FILE')
         if data_file is not None:
             kwargs.pop('DATA_FILE')
-            try:
-                file_data = self.load_csv(data_file)
-            except ImportError:
-                try:
-                    file_data = self.load_csv(data_file)
-                except ImportError:
-                    try:
-                        file_data = self.load_csv(data_file)
-                    except ImportError:
-                        raise ImportError('Data file was not recognized as a valid data file '
-                                          '(csv, json or excel file).')
-            file_data = file_data.applymap(self._transform_read_datetime)
+            file_type = self._data_file_type(data_file)
+            if file_type == 'csv':
+                file_data = self._read_csv_file(data_file, kwargs.get('ROWS'), schema)
+            elif file_type == 'json':
+                file_data = self._read_json_file(data_file, schema)
+            else:
+                file_data = self.load_excel(data_file)
             result = self._combine_data_object_and_file_data(data, file_data)
         else:
             result = data
         return result, kwargs
 
-    def _eval_needed(self, val):
-        if not isinstance(val, str):
-            return False
-        if val[0:self._eval_len] != self._eval_ind:
-            return False
-        return True
-
     def _evaluate_data(self, data):
-        context_clean = {}
-
-        def per_cell(val, row, context):
-            if self._eval_needed(val) is True:
-                return self._evaluate_cell(val, row, context)
-            else:
-                return val
-
-        def per_row(row):
-            context_row = copy.deepcopy(context_clean)
-            return row.apply(per_cell, row=row, context=context_row)
-
-        eval_rows = data.applymap(self._eval_needed).apply(any, axis=1)
-        data.loc[eval_rows] = data.loc[eval_rows].apply(per_row, axis=1)
-        return data
-
-    def _eval_till_error(self, val, row, context):
-        try:
-            result = eval(val, context)
-        except NameError as e:
-            try:
-                missing = e.args[0].split("'")[1]
-                context[missing] = self._evaluate_cell(row[missing], row, context)
-                result = self._eval_till_error(val, row, context)
-            except KeyError:
-                raise e
-        return result
-
-    def _evaluate_cell(self, val, row, context):
-        if not self._eval_needed(val):
-            return val
-        val = val.replace(self._eval_ind, '')
-        return self._eval_till_error(val, row, context)
+        return self._evaluator.evaluate_frame(data)
 
     def _add_settings(self, kwargs, init=False):
         fw_sets = self._fw.fw_settings
@@ -147,15 +539,101 @@ class DataLoader:
         self._fw.test_settings = test_sets
         return kwargs
 
-    def load_csv(self, filename, **options):
+    def _csv_options(self, options):
         options['sep'] = options.get('sep', self._fw.fw_settings.CSV_SEP)
         options['header'] = options.get('header', 0)
         options['dtype'] = options.get('dtype', str)
-        file_data = pd.read_csv(filename, **options)
+        return options
+
+    def load_csv(self, filename, **options):
+        file_data = pd.read_csv(filename, **self._csv_options(options))
         return file_data
 
+    def iter_csv(self, filename, chunk_size=None, **options):
+        chunk_size = chunk_size or int(self._fw.fw_settings.CSV_CHUNK_SIZE)
+        reader = pd.read_csv(filename, chunksize=chunk_size, **self._csv_options(options))
+
+        def chunks():
+            with reader:
+                yield from reader
+        return chunks()
+
+    def _read_csv_rows(self, filename, numbers, options, schema=None):
+        # reads only the selected rows through the row index; returns None when the file cannot be indexed.
+        numbers = sorted(set(numbers))
+        content = row_index.read(filename, numbers, self._fw.fw_settings.DATA_CACHE_DIR)
+        if content is None:
+            return None
+        data = pd.read_csv(io.BytesIO(content), **options)
+        if len(data) != len(numbers):
+            return None
+        data.index = numbers
+        return self._transform_read_datetimes(schema.apply(data) if schema else data)
+
+    def _read_csv_file(self, filename, rows=None, schema=None):
+        sets = self._fw.fw_settings
+        options = self._csv_options({})
+        rows = None if rows is None else str(rows)
+        if sets.DATA_CACHE_DIR and rows is not None and rows[0:self._eval_len] != self._eval_ind:
+            numbers = self._row_numbers(rows)
+            data = None if numbers is None else self._read_csv_rows(filename, numbers, options, schema)
+            if data is not None:
+                return data
+
+        def reader():
+            return (self._transform_read_datetimes(schema.apply(chunk) if schema else chunk)
+                    for chunk in self.iter_csv(filename, **options))
+        key = dict(options, schema=schema.key) if schema else options
+        return data_file_cache.chunks(filename, key, reader, sets.DATA_CACHE_DIR, int(sets.DATA_CACHE_MAX_MB) * 2 ** 20)
+
+    def _read_json_file(self, filename, schema=None):
+        sets = self._fw.fw_settings
+
+        def reader():
+            return (self._transform_read_datetimes(schema.apply(chunk) if schema else chunk)
+                    for chunk in self.iter_json(filename))
+        key = {'type': 'json', 'schema': schema.key} if schema else {'type': 'json'}
+        return data_file_cache.chunks(filename, key, reader, sets.DATA_CACHE_DIR, int(sets.DATA_CACHE_MAX_MB) * 2 ** 20)
+
+    @staticmethod
+    def _data_file_type(filename):
+        extension = Path(filename).suffix.lower()
+        types = {'.csv': 'csv', '.txt': 'csv', '.json': 'json', '.jsonl': 'json', '.ndjson': 'json',
+                 '.xls': 'excel', '.xlsx': 'excel'}
+        if extension in types:
+            return types[extension]
+        try:
+            with open(filename, 'r') as stream:
+                start = stream.read(1024).lstrip()
+        except UnicodeDecodeError:
+            raise ImportError('Data file was not recognized as a valid data file (csv, json or excel file).')
+        return 'json' if start[0:1] in ('{', '[') else 'csv'
+
+    def iter_json(self, filename, chunk_size=None, sep='.'):
+        chunk_size = chunk_size or int(self._fw.fw_settings.JSON_CHUNK_SIZE)
+        stream = open(filename, 'r', encoding='utf-8')
+
+        def make_frame(records, start):
+            if any(not isinstance(rec, dict) for rec in records):
+                raise ValueError('Json data file "{}" should hold objects (one per row).'.format(filename))
+            frame = pd.json_normalize(records, sep=sep)
+            frame.index = pd.RangeIndex(start, start + len(records))
+            return frame
+
+        def chunks():
+            with stream:
+                records, start = [], 0
+                for value in _json_values(stream):
+                    records.append(value)
+                    if len(records) == chunk_size:
+                        yield make_frame(records, start)
+                        records, start = [], start + chunk_size
+                if records or start == 0:
+                    yield make_frame(records, start)
+        return chunks()
+
     def load_json(self, filename, **options):
-        raise TypeError('Json files not supported yet.')
+        return pd.concat(list(self.iter_json(filename, **options)))
 
     def load_excel(self, filename, **options):
         raise TypeError('Excel files not supported yet.')
@@ -166,23 +644,24 @@ class DataLoader:
 
         kwargs = self._add_settings(kwargs)
         rows = kwargs.get('ROWS')
-        data, kwargs = self._extract_data(kwargs)
+        with stage_timer.span('read'):
+            data, kwargs = self._extract_data(kwargs, ColumnSchema.for_keyword(name))
+            if data is not None:
+                data = self._reduce_rows(data, rows, kwargs)
+            elif len(kwargs) > 0:
+                kwargs = {k: [v] for k, v in kwargs.items()}
+                data = pd.DataFrame(kwargs)
         if data is not None:
-            data = data.assign(**kwargs)
-            data = self._reduce_rows(data, rows)
-        elif len(kwargs) > 0:
-            kwargs = {k: [v] for k, v in kwargs.items()}
-            data = pd.DataFrame(kwargs)
-        if data is not None:
-            dp = DateParser()
-            data = data.applymap(dp.make_date_or_return)
-            data = self._evaluate_data(data)
+            with run_clock.frozen(), stage_timer.span('dates'):
+                data = DateParser().make_date_frame_or_return(data)
+            with stage_timer.span('evaluate'):
+                data = self._evaluate_data(data)
         return data
 
     def validate_data(self, data, name: str):
         man_vars = kw.KeywordInfo().get_mandatory_arguments(name)
         missing = []
-        cols = DataLibrary().get_cols(data)
+        cols = DataLibrary(self._fw).get_cols(data)
         for var in man_vars:
             if var not in cols:
                 missing.append(var)
@@ -195,33 +674,57 @@ class DataLibrary:
     def __init__(self, fwo):
         self._fwo = fwo
 
-    def _safe_assign_df(self, data, **kwargs):
-        edit_cols = tuple(set(data.columns) & set(kwargs.keys()))
-        new_cols = {col: val for col, val in kwargs.items() if col not in edit_cols}
-        data = data.assign(**new_cols)
-
+    @staticmethod
+    def _column_values(data, col, val):
+        # the values assign would put in an existing column, aligned with the rows of the frame.
+        if callable(val):
+            val = val(data[[col]])
+        if isinstance(val, pd.Series):
+            return val.reindex(data.index).to_numpy(dtype=object)
+        if pd.api.types.is_list_like(val):
+            values = np.empty(len(val), dtype=object)
+            values[:] = list(val)
+            if len(values) != len(data):
+                raise ValueError('Length of values ({v}) does not match length of index ({i})'
+                                 .format(v=len(values), i=len(data)))
+            return values
+        return val
+
+    def _safe_assign_df(self, data, inplace=False, **kwargs):
         def_spec = self._fwo.fw_settings.DEFAULT_SPECIFIER
-        for col in edit_cols:
-            if def_spec in data[col].to_list():
-                new_data = data[[col]].assign(**{col: kwargs.get(col)})
-                new_list = []
-                for old, new in zip(data[col], new_data[col]):
-                    if old == def_spec:
-                        new_list.append(new)
-                    else:
-                        new_list.append(old)
-                data = data.assign(**{col: new_list})
-        return data
+        result = data if inplace else data.copy()
+        for col, val in kwargs.items():
+            if col not in result.columns:
+                result[col] = val(result) if callable(val) else val
+                continue
+            column = result[col]
+            if column.dtype.kind != 'O' and not pd.api.types.is_string_dtype(column.dtype):
+                continue
+            mask = (column == def_spec).to_numpy(dtype=bool)
+            if mask.any():
+                values = self._column_values(result, col, val)
+                new = column.to_numpy(dtype=object, copy=True)
+                new[mask] = values[mask] if isinstance(values, np.ndarray) else values
+                # inferred like assign infers a list, without copying the values into one.
+                result[col] = pd.Series(new, index=result.index).infer_objects()
+        return result
 
-    def _safe_assign_series(self, data, **kwargs):
-        edit_cols = tuple(set(data.index) & set(kwargs.keys()))
-        new_cols = {col: val for col, val in kwargs.items() if col not in edit_cols}
-        data = data.append(pd.Series(new_cols))
+    def _safe_assign_series(self, data, inplace=False, **kwargs):
         def_spec = self._fwo.fw_settings.DEFAULT_SPECIFIER
-        for col in edit_cols:
-            if def_spec == data[col]:
-                data[col] = kwargs.get(col)
-        return data
+        new_labels = {label: val for label, val in kwargs.items() if label not in data.index}
+        if inplace:
+            result = data
+            for label, val in new_labels.items():
+                result.loc[label] = val
+        elif new_labels:
+            result = pd.concat([data, pd.Series(new_labels)])
+            result.name = data.name
+        else:
+            result = data.copy()
+        for label, val in kwargs.items():
+            if label not in new_labels and result[label] == def_spec:
+                result[label] = val
+        return result
 
     def _use_default_data(self, data):
         if data is None:
@@ -231,12 +734,12 @@ class DataLibrary:
                 raise ImportError('No data was passed, and no data was present in the framework object either.')
         return data
 
-    def safe_assign(self, data=None, **kwargs):
+    def safe_assign(self, data=None, *, inplace=False, **kwargs):
         data = self._use_default_data(data)
         if isinstance(data, pd.DataFrame):
-            result = self._safe_assign_df(data, **kwargs)
+            result = self._safe_assign_df(data, inplace, **kwargs)
         elif isinstance(data, pd.Series):
-            result = self._safe_assign_series(data, **kwargs)
+            result = self._safe_assign_series(data, inplace, **kwargs)
         elif data is None:
             if kwargs != {}:
                 result = pd.DataFrame.from_dict(kwargs)
@@ -1,15 +1,172 @@
 import datetime as dt
+import contextlib
+import contextvars
 import regex
 import pytz
 import logging
+import numpy as np
+import pandas as pd
+from functools import lru_cache
 from dateutil import parser
 from dateutil.relativedelta import relativedelta
 from tzlocal import get_localzone
 from .utilities import Util
+from collections.abc import Sequence
+import itertools
+
+
+@lru_cache(maxsize=None)
+def get_timezone(name):
+    return pytz.timezone(name)
+
+
+@lru_cache(maxsize=None)
+def get_local_timezone():
+    return get_localzone()
+
+
+class RunClock:
+    """
+    Clock used to resolve relative dates. While frozen, all relative dates resolve against the same instant; the
+    frozen instant is kept per thread and per asyncio task.
+    """
+    def __init__(self):
+        self._frozen = contextvars.ContextVar('frozen_now', default=None)
+
+    @staticmethod
+    def _parse(at):
+        if isinstance(at, str):
+            at = parser.parse(at)
+        if at.tzinfo is not None:
+            at = at.astimezone().replace(tzinfo=None)
+        return at
+
+    def now(self):
+        frozen = self._frozen.get()
+        return dt.datetime.now() if frozen is None else frozen
+
+    def is_frozen(self):
+        return self._frozen.get() is not None
+
+    @contextlib.contextmanager
+    def frozen(self, at=None):
+        if at is None or at == '':
+            at = self.now()
+        elif self.is_frozen():
+            logging.debug('The run clock was already frozen, it is now frozen at "{}".'.format(at))
+        token = self._frozen.set(self._parse(at))
+        try:
+            yield self._frozen.get()
+        finally:
+            self._frozen.reset(token)
+
+
+run_clock = RunClock()
+
+
+class DateRange(Sequence):
+    """
+    Lazy range of dates as returned by DateParser.make_date_range.
+
+    Fixed size units (days and smaller) are computed arithmetically, so the range has a length and random access
+    without generating it, and is generated in vectorized blocks (see chunks). Months and years are stepped with
+    relativedelta, like before.
+    """
+    fixed_units = ('days', 'hours', 'minutes', 'seconds')
+    default_chunk_size = 100000
+
+    def __init__(self, start, stop, size, unit, inclusive=False, chunk_size=None):
+        if int(size) <= 0:
+            raise ValueError('The size of a date range step should be positive, not {}.'.format(size))
+        self.start = start
+        self.stop = stop
+        self.unit = unit
+        self.inclusive = inclusive
+        self.chunk_size = chunk_size or self.default_chunk_size
+        self.fixed = unit in self.fixed_units
+        self._items = None
+        if self.fixed:
+            self.delta = dt.timedelta(**{unit: int(size)})
+            self._len = self._fixed_len()
+        else:
+            self.delta = relativedelta(**{unit: int(size)})
+
+    def _fixed_len(self):
+        total = self.stop - self.start
+        if self.inclusive:
+            return total // self.delta + 1 if total >= dt.timedelta(0) else 0
+        return -(-total // self.delta) if total > dt.timedelta(0) else 0
+
+    def _tz(self):
+        zone = getattr(self.start.tzinfo, 'zone', None)
+        return get_timezone(zone) if zone else self.start.tzinfo
+
+    def _stepped(self):
+        date = self.start
+        while date < self.stop or (self.inclusive and date == self.stop):
+            yield date
+            date += self.delta
+
+    def _get_items(self):
+        if self._items is None:
+            self._items = list(self._stepped())
+        return self._items
+
+    def __len__(self):
+        return self._len if self.fixed else len(self._get_items())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Date range index out of range.')
+        if not self.fixed:
+            return self._get_items()[index]
+        date = self.start + index * self.delta
+        return self._tz().normalize(date) if hasattr(self._tz(), 'normalize') else date
+
+    def __iter__(self):
+        if not self.fixed:
+            yield from self._get_items() if self._items is not None else self._stepped()
+            return
+        for block in self.chunks():
+            yield from block.to_pydatetime()
+
+    def chunks(self, chunk_size=None):
+        """
+        Yields the range as pandas.DatetimeIndex blocks of at most chunk_size dates.
+        """
+        chunk_size = chunk_size or self.chunk_size
+        if not self.fixed:
+            dates = iter(self._get_items() if self._items is not None else self._stepped())
+            block = list(itertools.islice(dates, chunk_size))
+            while block:
+                yield pd.DatetimeIndex(block)
+                block = list(itertools.islice(dates, chunk_size))
+            return
+        base = pd.Timestamp(self.start).value
+        step = pd.Timedelta(self.delta).value
+        for first in range(0, len(self), chunk_size):
+            ns = base + np.arange(first, min(first + chunk_size, len(self)), dtype=np.int64) * step
+            yield pd.DatetimeIndex(ns.astype('datetime64[ns]')).tz_localize('UTC').tz_convert(self._tz())
+
+    def to_index(self):
+        blocks = list(self.chunks(max(len(self), 1) if self.fixed else None))
+        if not blocks:
+            return pd.DatetimeIndex([], tz=self._tz())
+        return blocks[0].append(blocks[1:]) if len(blocks) > 1 else blocks[0]
 
 
 class DateParser:
-    def __init__(self, *args):
+    _split_pattern = '[.]|,|:|[ ]|/'
+    _absolute_pattern = (r'^(?:(?P<tz>[^\d\s.,:/+-][^\s.,:/]*) )?(?P<year>\d{4})/(?P<month>\d{1,2})/(?P<day>\d{1,2})'
+                         r'(?: (?P<hour>\d{1,2})(?::(?P<minute>\d{1,2})(?::(?P<second>\d{1,2}))?)?)?$')
+    _el_columns = ('year', 'month', 'day', 'hour', 'minute', 'second')
+
+    def __init__(self, *args, clock=None):
+        self._clock = run_clock if clock is None else clock
         order = Util().settings().DEFAULT_DATE_TIME_ORDER
         order = [x.lower() for x in order]
         assert len(order) == 6, 'The given order of datetime elements is incomplete (!= 6)'
@@ -56,20 +213,20 @@ class DateParser:
 
     @staticmethod
     def _extract_timezone(date_li):
-        tz = get_localzone()
+        tz = get_local_timezone()
         iter_date_li = tuple(date_li)
         for dtc in iter_date_li:
             try:
                 int(dtc)
             except ValueError:
-                tz = pytz.timezone(dtc)
+                tz = get_timezone(dtc)
                 date_li.remove(dtc)
                 break
         logging.debug('Extraxted time zone is: {}'.format(tz))
         return tz, date_li
 
     def _resolve_relatives(self, date_li):
-        now = dt.datetime.now()
+        now = self._clock.now()
         for dtc, el in zip(date_li, self._el_name_relative):
             if regex.search('[-]|[+]', dtc):
                 now += relativedelta(**{el: int(dtc)})
@@ -84,7 +241,7 @@ class DateParser:
 
     def make_date(self, date_str: str, tz_out: str = 'UTC'):
         logging.debug('Given datestring is: {}'.format(date_str))
-        date_li = regex.split('[.]|,|:|[ ]|/', date_str)
+        date_li = regex.split(self._split_pattern, date_str)
         tz, date_li = self._extract_timezone(date_li)
         if len(date_li) < 3:
             raise SyntaxError('The provided string was not a valid date nor datetime. '
@@ -100,7 +257,7 @@ class DateParser:
             logging.debug('Parser package is not used for parsing the date string.')
         if date_dt.tzinfo is None:
             date_dt = tz.localize(date_dt)
-        tz_out = pytz.timezone(tz_out)
+        tz_out = get_timezone(tz_out)
         result = date_dt.astimezone(tz_out)
         logging.info('Datestring: "{ds}", returned date: "{dt}"'.format(ds=date_str, dt=result))
         return result
@@ -112,24 +269,105 @@ class DateParser:
             logging.info('Passed date string ("{}") could not be converted to a date.'.format(date_str))
             return date_str
 
-    def make_date_range(self, from_date, till_date=None, through_date=None, size=1, unit='minutes', tz_out='UTC'):
-        func, stop_date = self._resolve_stop_date(till_date, through_date)
-        unit = self._get_unit(unit, self._el_name_relative, self._el_name)
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _is_timezone(name):
+        try:
+            get_timezone(name)
+            return True
+        except (pytz.UnknownTimeZoneError, ValueError, AttributeError):
+            return False
 
-        if not isinstance(from_date, dt.datetime):
-            from_date = self.make_date(from_date, tz_out)
-        if not isinstance(stop_date, dt.datetime):
-            stop_date = self.make_date(stop_date, tz_out)
+    def _may_be_date(self, date_str):
+        for dtc in regex.split(self._split_pattern, date_str):
+            try:
+                int(dtc)
+            except ValueError:
+                return self._is_timezone(dtc)
+        return True
+
+    def _make_date_cell(self, val, tz_out):
+        if not self._may_be_date(val):
+            return val
+        return self.make_date_or_return(val, tz_out=tz_out)
 
-        delta = relativedelta(**{unit: int(size)})
-        return self._date_range(func, from_date, stop_date, delta)
+    @staticmethod
+    def _convert_absolute(parts, tz_name, tz_out):
+        tz = get_timezone(tz_name) if tz_name else get_local_timezone()
+        if not hasattr(tz, 'localize'):
+            raise TypeError('Timezone "{}" cannot be used to localize dates.'.format(tz))
+        # the extracted elements are strings (or NaN for a missing time), they are made numeric before filling.
+        fields = parts.loc[:, DateParser._el_columns].apply(pd.to_numeric).fillna(0).astype(np.int64)
+        naive = pd.to_datetime(fields)
+        local = naive.dt.tz_localize(tz, ambiguous=np.zeros(len(naive), dtype=bool), nonexistent='raise')
+        return pd.DatetimeIndex(local.dt.tz_convert(get_timezone(tz_out))).to_pydatetime()
 
-    def _date_range(self, func, from_date, to_date, delta):
-        while func(from_date, to_date):
-            yield from_date
-            from_date += delta
+    def _verify_sample(self, originals, converted, tz_out):
+        for pos in sorted({0, len(originals) // 2, len(originals) - 1}):
+            try:
+                expected = self.make_date(originals[pos], tz_out=tz_out)
+            except Exception:
+                return False
+            if expected != converted[pos] or str(expected.tzinfo) != str(converted[pos].tzinfo):
+                return False
+        return True
 
+    def make_date_column_or_return(self, column: pd.Series, tz_out='UTC'):
+        """
+        Column wise variant of make_date_or_return: absolute dates sharing one format (e.g. "UTC 2019/01/01 00:00:00")
+        are converted at once; all other possible dates are converted cell by cell.
+        """
+        if column.dtype.kind in 'biufmM' or isinstance(column.dtype, pd.CategoricalDtype):
+            return column
+        values = column.to_numpy(dtype=object, copy=True)
+        str_idx = np.flatnonzero([isinstance(v, str) for v in values])
+        if len(str_idx) == 0:
+            return column
+        # a date consists of at least three elements, so at least two separators should be present
+        strs = pd.Series(values[str_idx], dtype=object)
+        cand_idx = str_idx[(strs.str.count(self._split_pattern) >= 2).to_numpy()]
+        if len(cand_idx) == 0:
+            return column
+
+        parts = pd.Series(values[cand_idx], dtype=object).str.extract(self._absolute_pattern)
+        matched = parts['year'].notna().to_numpy()
+        for i in cand_idx[~matched]:
+            values[i] = self._make_date_cell(values[i], tz_out)
+
+        parts = parts[matched].reset_index(drop=True)
+        match_idx = cand_idx[matched]
+        shape = [parts['tz'].fillna('')] + [parts[el].isna() for el in ('hour', 'minute', 'second')]
+        for (tz_name, *_), group in parts.groupby(shape, sort=False):
+            idx = match_idx[group.index.to_numpy()]
+            try:
+                converted = self._convert_absolute(group, tz_name, tz_out)
+            except Exception:
+                converted = None
+            if converted is not None and self._verify_sample(values[idx], converted, tz_out):
+                values[idx] = converted
+            else:
+                logging.debug('Dates "{}" could not be converted column wise.'.format(values[idx[0]]))
+                for i in idx:
+                    values[i] = self._make_date_cell(values[i], tz_out)
+        return pd.Series(values.tolist(), index=column.index, name=column.name)
 
+    def make_date_frame_or_return(self, data: pd.DataFrame, tz_out='UTC'):
+        data = data.copy()
+        for pos in range(data.shape[1]):
+            column = data.iloc[:, pos]
+            converted = self.make_date_column_or_return(column, tz_out=tz_out)
+            if converted is not column:
+                data.isetitem(pos, converted)
+        return data
 
+    def make_date_range(self, from_date, till_date=None, through_date=None, size=1, unit='minutes', tz_out='UTC',
+                        chunk_size=None):
+        func, stop_date = self._resolve_stop_date(till_date, through_date)
+        unit = self._get_unit(unit, self._el_name_relative, self._el_name)
 
+        if not isinstance(from_date, dt.datetime):
+            from_date = self.make_date(from_date, tz_out)
+        if not isinstance(stop_date, dt.datetime):
+            stop_date = self.make_date(stop_date, tz_out)
 
+        return DateRange(from_date, stop_date, size, unit, inclusive=through_date is not None, chunk_size=chunk_size)
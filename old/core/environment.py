@@ -6,7 +6,12 @@ import pandas as pd
 
 
 class Env:
-    def __init__(self):
+    def __init__(self, env_dir=None):
+        if env_dir is None:
+            util = fw.old.core.utilities.Util()
+            env_dir = Path(util.fw_dir(), util.settings().ENV_DIR)
+        self._env_dir = Path(env_dir)
+        self._env_mod = '.'.join(self._env_dir.parts[self._env_dir.parts.index('fw'):])
         self._env_li = self.get_full_env_mods()
 
     def load_environment_settings(self, env):
@@ -18,7 +23,7 @@ class Env:
                 env = tuple(map(str, env))
             for env_part in env:
                 env_part_tuple = env[:env.index(env_part)+1]
-                mod_name = 'fw.env.{}'.format('.'.join(env_part_tuple))
+                mod_name = '{base}.{env}'.format(base=self._env_mod, env='.'.join(env_part_tuple))
                 try:
                     mod = importlib.import_module(mod_name)
                 except ModuleNotFoundError:
@@ -49,6 +54,5 @@ class Env:
         return cont
 
     def get_full_env_mods(self):
-        direct = Path(fw.old.core.utilities.Util().fw_dir(), 'env')
-        flat_tree = self._make_tree(direct, True)
+        flat_tree = self._make_tree(self._env_dir, True)
         return tuple(flat_tree)
@@ -0,0 +1,323 @@
+import ast
+import builtins
+import collections
+import functools
+import operator
+
+import numpy as np
+import pandas as pd
+
+Expression = collections.namedtuple('Expression', ['source', 'code', 'names', 'tree', 'vectorizable'])
+
+_builtin_names = frozenset(dir(builtins))
+
+_binary_operators = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+                     ast.Div: operator.truediv, ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod,
+                     ast.Pow: operator.pow, ast.BitAnd: operator.and_, ast.BitOr: operator.or_,
+                     ast.BitXor: operator.xor, ast.LShift: operator.lshift, ast.RShift: operator.rshift}
+_unary_operators = {ast.UAdd: operator.pos, ast.USub: operator.neg, ast.Not: operator.not_,
+                    ast.Invert: operator.invert}
+_compare_operators = {ast.Eq: operator.eq, ast.NotEq: operator.ne, ast.Lt: operator.lt, ast.LtE: operator.le,
+                      ast.Gt: operator.gt, ast.GtE: operator.ge, ast.Is: operator.is_, ast.IsNot: operator.is_not,
+                      ast.In: lambda a, b: a in b, ast.NotIn: lambda a, b: a not in b}
+_vector_nodes = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.BoolOp, ast.IfExp, ast.Call,
+                 ast.Attribute, ast.Subscript, ast.Slice, ast.Name, ast.Constant, ast.Tuple, ast.List,
+                 ast.Load, ast.operator, ast.unaryop, ast.cmpop, ast.boolop)
+
+
+class _NameCollector(ast.NodeVisitor):
+    def __init__(self):
+        self.loaded = set()
+        self.bound = set()
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            self.loaded.add(node.id)
+        else:
+            self.bound.add(node.id)
+
+    def visit_Lambda(self, node):
+        self.bound.update(a.arg for a in ast.walk(node.args) if isinstance(a, ast.arg))
+        self.generic_visit(node)
+
+
+@functools.lru_cache(maxsize=8192)
+def compile_expression(source):
+    try:
+        tree = ast.parse(source.strip(), mode='eval')
+    except SyntaxError as e:
+        raise SyntaxError('Expression "{}" could not be parsed: {}.'.format(source, e.msg)) from None
+    collector = _NameCollector()
+    collector.visit(tree)
+    names = frozenset(collector.loaded - collector.bound - _builtin_names)
+    vectorizable = all(isinstance(node, _vector_nodes) for node in ast.walk(tree)) and \
+        not any(isinstance(node, ast.Call) and node.keywords for node in ast.walk(tree))
+    return Expression(source, compile(tree, '<ev:{}>'.format(source), 'eval'), names, tree, vectorizable)
+
+
+def _operand(value):
+    # wraps scalars (including containers) so numpy broadcasts them as a single element.
+    if isinstance(value, np.ndarray):
+        return value
+    wrapped = np.empty((), dtype=object)
+    wrapped[()] = value
+    return wrapped
+
+
+def _and(a, b):
+    return a and b
+
+
+def _or(a, b):
+    return a or b
+
+
+_arithmetic = (operator.add, operator.sub, operator.mul, operator.truediv, operator.floordiv, operator.mod,
+               operator.pow, operator.neg, operator.pos)
+_comparisons = (operator.eq, operator.ne, operator.lt, operator.le, operator.gt, operator.ge)
+_simple_scalars = (str, int, float, bool, type(None))
+
+
+def _native(func, arrays, scalars, values):
+    # numpy operations that give the same outcome as applying func per element; None when there is none.
+    kinds = {a.dtype.kind for a in arrays}
+    if not all(isinstance(s, _simple_scalars) for s in scalars):
+        return None
+    if func in _comparisons:
+        if 'O' in kinds or not any(isinstance(s, str) for s in scalars):
+            return func(*values)
+    elif func in _arithmetic:
+        if kinds == {'f'} and not any(isinstance(s, str) for s in scalars):
+            with np.errstate(all='raise'):
+                return func(*values)
+    elif func in (_and, _or, operator.not_):
+        if kinds == {'b'} and all(isinstance(s, bool) for s in scalars):
+            return (operator.and_ if func is _and else operator.or_ if func is _or else operator.inv)(*values)
+    elif func is float and len(values) == 1:
+        if kinds <= {'f', 'b'} or not np.equal(arrays[0], None).any():
+            return arrays[0].astype(np.float64)
+    return None
+
+
+def _apply(func, *values):
+    arrays = [v for v in values if isinstance(v, np.ndarray)]
+    if not arrays:
+        return func(*values)
+    result = _native(func, arrays, [v for v in values if not isinstance(v, np.ndarray)], values)
+    if isinstance(result, np.ndarray) and result.shape == arrays[0].shape:
+        return result
+    return np.frompyfunc(func, len(values), 1)(*(_operand(v) for v in values))
+
+
+def _if(test, body, orelse):
+    return body if test else orelse
+
+
+def _call(func, *args):
+    return func(*args)
+
+
+def _vector_eval(node, arrays):
+    # evaluates an expression tree over whole columns, applying every operation per element
+    # so the outcome is the same as evaluating row by row.
+    if isinstance(node, ast.Expression):
+        return _vector_eval(node.body, arrays)
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Name):
+        if node.id in arrays:
+            return arrays[node.id]
+        return getattr(builtins, node.id)
+    if isinstance(node, ast.BinOp):
+        return _apply(_binary_operators[type(node.op)], _vector_eval(node.left, arrays),
+                      _vector_eval(node.right, arrays))
+    if isinstance(node, ast.UnaryOp):
+        return _apply(_unary_operators[type(node.op)], _vector_eval(node.operand, arrays))
+    if isinstance(node, ast.BoolOp):
+        func = _and if isinstance(node.op, ast.And) else _or
+        return functools.reduce(lambda a, b: _apply(func, a, b), (_vector_eval(v, arrays) for v in node.values))
+    if isinstance(node, ast.Compare):
+        left = _vector_eval(node.left, arrays)
+        result = None
+        for op, comparator in zip(node.ops, node.comparators):
+            right = _vector_eval(comparator, arrays)
+            outcome = _apply(_compare_operators[type(op)], left, right)
+            result = outcome if result is None else _apply(_and, result, outcome)
+            left = right
+        return result
+    if isinstance(node, ast.IfExp):
+        return _apply(_if, _vector_eval(node.test, arrays), _vector_eval(node.body, arrays),
+                      _vector_eval(node.orelse, arrays))
+    if isinstance(node, ast.Call):
+        func = _vector_eval(node.func, arrays)
+        args = [_vector_eval(a, arrays) for a in node.args]
+        if isinstance(func, np.ndarray):
+            return _apply(_call, func, *args)
+        return _apply(func, *args)
+    if isinstance(node, ast.Attribute):
+        return _apply(getattr, _vector_eval(node.value, arrays), node.attr)
+    if isinstance(node, ast.Subscript):
+        return _apply(operator.getitem, _vector_eval(node.value, arrays), _vector_eval(node.slice, arrays))
+    if isinstance(node, ast.Slice):
+        parts = [None if p is None else _vector_eval(p, arrays) for p in (node.lower, node.upper, node.step)]
+        return _apply(slice, *parts)
+    if isinstance(node, (ast.Tuple, ast.List)):
+        items = [_vector_eval(e, arrays) for e in node.elts]
+        if any(isinstance(i, np.ndarray) for i in items):
+            raise TypeError('Containers of columns are not evaluated per column.')
+        return tuple(items) if isinstance(node, ast.Tuple) else list(items)
+    raise TypeError('Expression part "{}" is not evaluated per column.'.format(type(node).__name__))
+
+
+def column_array(column):
+    # float and bool columns are used as they are, other columns as python objects.
+    if column.dtype.kind in 'fb':
+        return column.to_numpy()
+    return column.to_numpy(dtype=object)
+
+
+def evaluate_column(expr, arrays, length, as_objects=True):
+    # returns an object array with the expression evaluated for every row, or None when the
+    # expression has to be evaluated row by row instead.
+    if not expr.vectorizable or not expr.names or not expr.names <= arrays.keys():
+        return None
+    try:
+        result = _vector_eval(expr.tree, {name: arrays[name] for name in expr.names})
+    except Exception:
+        return None
+    if not isinstance(result, np.ndarray) or result.shape != (length,):
+        return None
+    return result.astype(object, copy=False) if as_objects else result
+
+
+def order_columns(dependencies):
+    # dependencies: {column: set of columns it needs}; returns an evaluation order
+    # following the given column order where possible.
+    order = []
+    state = {}
+
+    def visit(col, path):
+        if state.get(col) == 'done':
+            return
+        if state.get(col) == 'busy':
+            cycle = path[path.index(col):]
+            raise ValueError('Circular reference between evaluated columns: {}.'.format(' -> '.join(cycle)))
+        state[col] = 'busy'
+        for dep in dependencies.get(col, ()):
+            if dep in dependencies:
+                visit(dep, path + [dep])
+        state[col] = 'done'
+        order.append(col)
+
+    for column in dependencies:
+        visit(column, [column])
+    return tuple(order)
+
+
+@functools.lru_cache(maxsize=1024)
+def _evaluation_order(signature):
+    return order_columns({col: names for col, names in signature})
+
+
+class Evaluator:
+    def __init__(self, eval_ind='ev:'):
+        self._eval_ind = eval_ind
+        self._eval_len = len(eval_ind)
+
+    def is_expression(self, val):
+        return isinstance(val, str) and val[0:self._eval_len] == self._eval_ind
+
+    def has_expressions(self, values):
+        if values.dtype.kind != 'O':
+            return False
+        try:
+            # cutting every value to the indicator length is done in C, a (rare) false positive is checked per row.
+            return bool((values.astype('U{}'.format(self._eval_len)) == self._eval_ind).any())
+        except (TypeError, ValueError, UnicodeError):
+            return any(self.is_expression(v) for v in values)
+
+    def compile(self, val):
+        return compile_expression(val[self._eval_len:])
+
+    @staticmethod
+    def _run(expr, values):
+        scope = {name: values[name] for name in expr.names if name in values}
+        return eval(expr.code, scope)
+
+    def evaluate_row(self, values):
+        # values: {column: raw value}; returns {column: evaluated value} for the evaluated columns only.
+        expressions = {col: self.compile(val) for col, val in values.items() if self.is_expression(val)}
+        if not expressions:
+            return {}
+        resolved = dict(values)
+        result = {}
+        for col in _evaluation_order(tuple((col, expr.names) for col, expr in expressions.items())):
+            resolved[col] = result[col] = self._run(expressions[col], resolved)
+        return result
+
+    def evaluate(self, val, values):
+        # evaluates a single (possibly non-row) expression against a row's values.
+        if not self.is_expression(val):
+            return val
+        expr = self.compile(val)
+        needed = {name: values[name] for name in expr.names if name in values}
+        if any(self.is_expression(v) for v in needed.values()):
+            resolved = dict(values)
+            resolved.update(self.evaluate_row(values))
+        else:
+            resolved = needed
+        return self._run(expr, resolved)
+
+    def _is_uniform(self, values):
+        return len(values) > 0 and self.is_expression(values[0]) and bool((values == values[0]).all())
+
+    @staticmethod
+    def _evaluate_uniform(uniform, arrays, length):
+        # columns holding the same expression on every row are evaluated once over whole columns.
+        result = {}
+        for col in order_columns({col: expr.names & uniform.keys() for col, expr in uniform.items()}):
+            values = evaluate_column(uniform[col], arrays, length)
+            if values is not None:
+                arrays[col] = result[col] = values
+        return result
+
+    def evaluate_frame(self, data):
+        columns = list(data.columns)
+        positions = {col: i for i, col in enumerate(columns)}
+        # only object columns can hold expressions; typed columns (e.g. from a keyword schema) are not scanned.
+        texts = {i: data.iloc[:, i].to_numpy(dtype=object) for i, dtype in enumerate(data.dtypes) if dtype == object}
+        uniform = {columns[i]: self.compile(col[0]) for i, col in texts.items() if self._is_uniform(col)}
+        eval_cols = [i for i, col in texts.items() if columns[i] in uniform or self.has_expressions(col)]
+        if not eval_cols:
+            return data
+        cols = [texts[i] if i in texts else data.iloc[:, i].to_numpy(dtype=object) for i in range(len(columns))]
+        evaluated = {columns[i] for i in eval_cols}
+        arrays = {col: column_array(data[col]) for col in columns if col not in evaluated}
+        new_cols = {positions[col]: values for col, values in self._evaluate_uniform(uniform, arrays, len(data)).items()}
+        row_cols = [i for i in eval_cols if i not in new_cols]
+        new_cols.update({i: cols[i].copy() for i in row_cols})
+        eval_rows = sorted({r for i in row_cols for r, v in enumerate(cols[i]) if self.is_expression(v)})
+        for r in eval_rows:
+            values = {col: new_cols[i][r] if i in new_cols else cols[i][r] for i, col in enumerate(columns)}
+            for col, value in self.evaluate_row(values).items():
+                new_cols[positions[col]][r] = value
+        data = data.copy()
+        for i, values in new_cols.items():
+            data.isetitem(i, pd.Series(values, index=data.index, dtype=object))
+        return data
+
+    def evaluate_mask(self, val, data):
+        # evaluates a row filter to a boolean array, over whole columns where possible.
+        expr = self.compile(val)
+        referenced = [col for col in data.columns if col in expr.names]
+        if any(self.has_expressions(data[col].to_numpy(dtype=object)) for col in referenced):
+            source = self.evaluate_frame(data)
+        else:
+            source = data
+        arrays = {col: column_array(source[col]) for col in referenced}
+        result = evaluate_column(expr, arrays, len(data), as_objects=False)
+        if result is not None:
+            return result.astype(bool)
+        columns = list(data.columns)
+        return np.array([bool(self.evaluate(val, dict(zip(columns, row))))
+                         for row in data.itertuples(index=False, name=None)], dtype=bool)
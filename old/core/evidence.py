@@ -0,0 +1,131 @@
+from pathlib import Path
+import atexit
+import logging
+import os
+import queue
+import threading
+import zipfile
+
+from .utilities import Util
+
+
+class EvidenceArchiver:
+    """
+    Zip archive of the evidence of a test (screenshots, api dumps), written by a background thread so that adding
+    evidence does not block the test.
+
+    Files (add, add_dir) and data (add_data) are written in the order they were added, under their path relative to
+    the evidence directory; a name that is already archived is skipped. The compression method (stored, deflated,
+    bzip2 or lzma) and level are set per file type with EVIDENCE_COMPRESSION_TYPES, falling back to
+    EVIDENCE_COMPRESSION and EVIDENCE_COMPRESSION_LEVEL. flush waits until everything added so far is written and
+    close (also called at exit) finishes the archive; both raise the first error of the background thread.
+    """
+    methods = {'stored': zipfile.ZIP_STORED, 'deflated': zipfile.ZIP_DEFLATED, 'bzip2': zipfile.ZIP_BZIP2,
+               'lzma': zipfile.ZIP_LZMA}
+
+    def __init__(self, archive, root, settings=None):
+        sets = Util().settings() if settings is None else settings
+        self.archive = Path(archive)
+        self.root = Path(root)
+        level = sets.get('EVIDENCE_COMPRESSION_LEVEL')
+        self._default = self._compression(sets.get('EVIDENCE_COMPRESSION') or 'deflated', level)
+        self._types = {}
+        for ext, val in dict(sets.get('EVIDENCE_COMPRESSION_TYPES') or {}).items():
+            self._types[str(ext).lower().lstrip('.')] = self._compression(*val) if isinstance(val, (list, tuple)) \
+                else self._compression(val, level)
+        self._queue = queue.Queue()
+        self._names = set()
+        self._error = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._zip = zipfile.ZipFile(self.archive, 'w')
+        self._thread = threading.Thread(target=self._work, name='fw-evidence-archiver', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _compression(self, method, level=None):
+        if str(method).lower() not in self.methods:
+            raise ValueError('Compression "{m}" is not supported (use one of: "{opts}").'
+                             .format(m=method, opts='", "'.join(self.methods)))
+        method = self.methods[str(method).lower()]
+        if method == zipfile.ZIP_STORED or level is None or level == '':
+            return method, None
+        return method, int(level)
+
+    def _arcname(self, path):
+        path = Path(path).absolute()
+        try:
+            return path.relative_to(self.root.absolute()).as_posix()
+        except ValueError:
+            return path.name
+
+    def _write(self, arcname, path, data):
+        if arcname in self._names:
+            logging.debug('Evidence "{}" is already archived.'.format(arcname))
+            return
+        method, level = self._types.get(Path(arcname).suffix.lower().lstrip('.'), self._default)
+        if data is None:
+            self._zip.write(path, arcname, method, level)
+        else:
+            self._zip.writestr(arcname, data, method, level)
+        self._names.add(arcname)
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except Exception as e:
+                logging.error('Evidence "{n}" could not be archived: {e}'.format(n=item[0], e=e))
+                if self._error is None:
+                    self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _put(self, item):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Evidence cannot be added to archive "{}", it is closed.'.format(self.archive))
+            self._queue.put(item)
+
+    def _raise(self):
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def add(self, path, arcname=None):
+        self._put((arcname or self._arcname(path), Path(path), None))
+
+    def add_data(self, arcname, data):
+        self._put((arcname, None, data))
+
+    def add_dir(self, path=None):
+        archive = self.archive.absolute()
+        for root, dirs, files in os.walk(path or self.root):
+            for file in sorted(files):
+                file = Path(root, file)
+                if file.absolute() != archive:
+                    self.add(file)
+
+    def flush(self):
+        self._queue.join()
+        self._raise()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+        self._zip.close()
+        atexit.unregister(self.close)
+        self._raise()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,43 +1,240 @@
-from fw.old.core import KeywordMethods, DataMethods
+from fw.old.core import keyword_registry, keyword_index
 from fw.old.core import DataLoader
+from fw.old.core import run_clock
+from fw.old.core import stage_timer
+from fw.old.core import keyword_profiler
+from fw.old.core import EvidenceArchiver
 from fw.old.core import KeywordNameConventions, FileName
+from fw.old.core import Util
 
-import zipfile
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_EXCEPTION, ALL_COMPLETED
+import asyncio
+import contextlib
+import copy
+import inspect
+import pandas as pd
+import threading
+import weakref
 from pathlib import Path
 import os
 import shutil
 
+
+class KeywordLoop:
+    """
+    Event loop owned by the framework, running in a daemon thread. Synchronous callers run coroutine keywords
+    (async def methods, also behind the pom wrappers) on it and wait for the result.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop = None
+        self._pid = None
+
+    def _get_loop(self):
+        with self._lock:
+            # a forked process does not have the loop thread of its parent.
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='fw-keyword-loop', daemon=True).start()
+                self._loop, self._pid = loop, os.getpid()
+            return self._loop
+
+    @staticmethod
+    async def _await(awaitable, at):
+        # the task gets the context of the loop thread, so the frozen run clock is carried over explicitly.
+        if at is None:
+            return await awaitable
+        with run_clock.frozen(at):
+            return await awaitable
+
+    def run(self, awaitable):
+        loop = self._get_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            raise RuntimeError('A coroutine keyword cannot be waited for on the framework loop itself, '
+                               'use arun_keyword instead.')
+        at = run_clock.now() if run_clock.is_frozen() else None
+        return asyncio.run_coroutine_threadsafe(self._await(awaitable, at), loop).result()
+
+
+keyword_loop = KeywordLoop()
+
+
+def _resolve(result):
+    return keyword_loop.run(result) if inspect.isawaitable(result) else result
+
+
+async def _acall(method, fwo):
+    if inspect.iscoroutinefunction(method):
+        return await method(fwo)
+    result = await asyncio.to_thread(method, fwo)
+    return await result if inspect.isawaitable(result) else result
+
+
+def _isolated(fwo, attrs=('fw_settings', 'test_settings')):
+    # shallow copy of the framework object with its own settings, for keyword runs that share the original.
+    fwo = copy.copy(fwo)
+    for attr in attrs:
+        if hasattr(fwo, attr):
+            setattr(fwo, attr, copy.copy(getattr(fwo, attr)))
+    return fwo
+
+
+def _run_row(method_name, fwo, at):
+    # module level, so process pools can pickle it; the frozen run clock does not cross threads or processes.
+    with run_clock.frozen(at):
+        _resolve(keyword_registry.get('data', method_name)(fwo))
+        result = _resolve(keyword_registry.get('keyword', method_name)(fwo))
+    return fwo.DATA, result
+
+
+class RowExecutor:
+    """
+    Runs the data and keyword method of a row iterable keyword (property iterable: R) once per row of its data.
+
+    Every row gets its own shallow copy of the framework object, with its own settings and a one row DATA frame.
+    Rows run serially, in a thread pool or in a process pool (ROW_EXECUTOR), the results are returned in row order.
+    With ROW_FAIL_FAST the first failing row stops the run, otherwise all rows run and the failures are reported
+    together afterwards.
+    """
+    iterable_marker = 'R'
+    pools = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}
+
+    def __init__(self, fwo, mode=None, workers=None, fail_fast=None):
+        sets = fwo.fw_settings
+        self._fwo = fwo
+        self.mode = str(mode or sets.get('ROW_EXECUTOR') or 'serial').lower()
+        if self.mode != 'serial' and self.mode not in self.pools:
+            raise ValueError('Row executor "{m}" is not supported (use one of: "serial", "{opts}").'
+                             .format(m=self.mode, opts='", "'.join(self.pools)))
+        self.workers = int(workers or sets.get('ROW_WORKERS') or 0) or os.cpu_count()
+        self.fail_fast = Util.is_on(sets.get('ROW_FAIL_FAST', True) if fail_fast is None else fail_fast)
+
+    @classmethod
+    def is_row_iterable(cls, name):
+        return str(keyword_index.get(name).properties.get('iterable')).upper() == cls.iterable_marker
+
+    def _row_context(self, data, i):
+        fwo = _isolated(self._fwo)
+        fwo.DATA = data.iloc[i:i + 1].copy()
+        return fwo
+
+    def _run_serial(self, method_name, data, at):
+        outcomes = []
+        for i in range(len(data)):
+            try:
+                outcomes.append(_run_row(method_name, self._row_context(data, i), at))
+            except Exception as e:
+                if self.fail_fast:
+                    raise
+                outcomes.append(e)
+        return outcomes
+
+    def _run_pool(self, method_name, data, at):
+        with self.pools[self.mode](max_workers=min(self.workers, len(data))) as pool:
+            futures = [pool.submit(_run_row, method_name, self._row_context(data, i), at) for i in range(len(data))]
+            wait(futures, return_when=FIRST_EXCEPTION if self.fail_fast else ALL_COMPLETED)
+            if self.fail_fast:
+                failed = [f for f in futures if f.done() and f.exception() is not None]
+                if failed:
+                    for future in futures:
+                        future.cancel()
+                    raise failed[0].exception()
+        return [f.result() if f.exception() is None else f.exception() for f in futures]
+
+    def run(self, method_name, data):
+        at = run_clock.now()
+        if self.mode == 'serial' or len(data) < 2:
+            outcomes = self._run_serial(method_name, data, at)
+        else:
+            outcomes = self._run_pool(method_name, data, at)
+
+        failed = [(data.index[i], out) for i, out in enumerate(outcomes) if isinstance(out, Exception)]
+        frames = [data.iloc[i:i + 1] if isinstance(out, Exception) else out[0] for i, out in enumerate(outcomes)]
+        results = [out if isinstance(out, Exception) else out[1] for out in outcomes]
+        self._fwo.DATA = pd.concat(frames) if frames else data
+        self._fwo.ROW_RESULTS = results
+        if failed:
+            raise RuntimeError('Keyword method "{kw}" failed for {n} of {t} rows ({rows}); first error: {e!r}.'
+                               .format(kw=method_name, n=len(failed), t=len(data),
+                                       rows=', '.join([str(r) for r, _ in failed]), e=failed[0][1])) from failed[0][1]
+        return results
+
+
 class Runner:
+    _limits = weakref.WeakKeyDictionary()
+
     def __init__(self, fwo):
         self._fwo = fwo
 
-    @staticmethod
-    def _zipdir(path, ziph):
-        # ziph is zipfile handle
-        for root, dirs, files in os.walk(path):
-            for file in files:
-                os.chdir(root)
-                ziph.write(os.path.relpath(os.path.join(root, file)))
-
     def run_kw(self, name, args, kwargs):
         fwo = self._fwo
-        fwo.DATA = DataLoader(fwo).get_data(name, *args, **kwargs)
         method_name = KeywordNameConventions().convert_name(name, in_name='keyword')
-        DataLoader(fwo).validate_data(fwo.DATA, name)
-        getattr(DataMethods(), method_name)(fwo)
-        getattr(KeywordMethods(), method_name)(fwo)
+        with run_clock.frozen(fwo.fw_settings.get('RUN_CLOCK')), \
+                stage_timer.keyword(name, Util.is_on(fwo.fw_settings.get('TIMING'))), \
+                keyword_profiler.profile(fwo, method_name, kwargs):
+            with stage_timer.span('get_data'):
+                fwo.DATA = DataLoader(fwo).get_data(name, *args, **kwargs)
+            with stage_timer.span('validate_data'):
+                DataLoader(fwo).validate_data(fwo.DATA, name)
+            if isinstance(fwo.DATA, pd.DataFrame) and RowExecutor.is_row_iterable(name):
+                with stage_timer.span('rows'):
+                    return RowExecutor(fwo).run(method_name, fwo.DATA)
+            with stage_timer.span('data'):
+                _resolve(keyword_registry.get('data', method_name)(fwo))
+            with stage_timer.span('keyword'):
+                return _resolve(keyword_registry.get('keyword', method_name)(fwo))
 
-    def finish_test(self, test_name, evidence_loc):
-        base_name = '{}.zip'.format(self._fwo.fw_settings.EVIDENCE_ARCHIVE_NAME)
-        archive_name = FileName(base_name).get_filename(test_name=test_name)
-        loc = Path(*Path(evidence_loc), archive_name)
+    @classmethod
+    def _limit(cls, size):
+        # one semaphore per event loop, shared by all keywords awaited on it.
+        size = int(size or 0)
+        if size <= 0:
+            return contextlib.nullcontext()
+        loop = asyncio.get_running_loop()
+        limit = cls._limits.get(loop)
+        if limit is None or limit[0] != size:
+            limit = cls._limits[loop] = (size, asyncio.Semaphore(size))
+        return limit[1]
 
-        # Create a zip file handler, zip and close the archive
-        ziph = zipfile.ZipFile(loc, 'w', zipfile.ZIP_DEFLATED)
-        self._zipdir(evidence_loc, ziph)
-        ziph.close()
+    async def arun_kw(self, name, args, kwargs):
+        # runs on a copy of the framework object, so concurrent keywords do not share DATA or settings.
+        async with self._limit(self._fwo.fw_settings.get('ASYNC_CONCURRENCY')):
+            fwo = _isolated(self._fwo)
+            with run_clock.frozen(fwo.fw_settings.get('RUN_CLOCK')), \
+                    stage_timer.keyword(name, Util.is_on(fwo.fw_settings.get('TIMING'))):
+                with stage_timer.span('get_data'):
+                    fwo.DATA = await asyncio.to_thread(DataLoader(fwo).get_data, name, *args, **kwargs)
+                method_name = KeywordNameConventions().convert_name(name, in_name='keyword')
+                with stage_timer.span('validate_data'):
+                    DataLoader(fwo).validate_data(fwo.DATA, name)
+                if isinstance(fwo.DATA, pd.DataFrame) and RowExecutor.is_row_iterable(name):
+                    with stage_timer.span('rows'):
+                        return await asyncio.to_thread(RowExecutor(fwo).run, method_name, fwo.DATA)
+                with stage_timer.span('data'):
+                    await _acall(keyword_registry.get('data', method_name), fwo)
+                with stage_timer.span('keyword'):
+                    return await _acall(keyword_registry.get('keyword', method_name), fwo)
 
-        # go out of the evidence directory and remove it
-        os.chdir('../..')
-        shutil.rmtree(self._fwo.TEST.EVIDENCE_LOC)
+    def start_test(self, test_name, evidence_loc):
+        # evidence added during the test (fwo.EVIDENCE) is archived in the background, next to evidence_loc.
+        base_name = '{}.zip'.format(self._fwo.fw_settings.EVIDENCE_ARCHIVE_NAME)
+        archive_name = FileName(base_name).get_filename(test_name=test_name)
+        Path(evidence_loc).mkdir(parents=True, exist_ok=True)
+        self._fwo.EVIDENCE = EvidenceArchiver(Path(Path(evidence_loc).parent, archive_name), evidence_loc,
+                                              self._fwo.fw_settings)
+        return self._fwo.EVIDENCE
 
+    def finish_test(self, test_name, evidence_loc):
+        archiver = getattr(self._fwo, 'EVIDENCE', None) or self.start_test(test_name, evidence_loc)
+        self._fwo.EVIDENCE = None
+        try:
+            # the files in the evidence directory that were not added during the test
+            archiver.add_dir(evidence_loc)
+        finally:
+            archiver.close()
+        shutil.rmtree(evidence_loc)
+        return archiver.archive
@@ -0,0 +1,116 @@
+import ast
+from pathlib import Path
+
+
+def _literal(node, env):
+    if isinstance(node, ast.Name):
+        if node.id in env:
+            return env[node.id]
+        raise ValueError('Name "{}" is not a static literal.'.format(node.id))
+    elif isinstance(node, ast.Dict):
+        if None in node.keys:
+            raise ValueError('Dictionary unpacking is not a static literal.')
+        return {_literal(k, env): _literal(v, env) for k, v in zip(node.keys, node.values)}
+    elif isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        values = [_literal(e, env) for e in node.elts]
+        return {ast.List: list, ast.Tuple: tuple, ast.Set: set}[type(node)](values)
+    return ast.literal_eval(node)
+
+
+def _is_docstring(stmt):
+    return isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant)
+
+
+def _static_return(func):
+    env = {}
+    for stmt in func.body:
+        if _is_docstring(stmt):
+            continue
+        elif isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+            env[stmt.targets[0].id] = _literal(stmt.value, env)
+        elif isinstance(stmt, ast.Return) and stmt.value is not None:
+            return _literal(stmt.value, env)
+        else:
+            raise ValueError('Function "{}" does not return a static literal.'.format(func.name))
+    raise ValueError('Function "{}" does not return a value.'.format(func.name))
+
+
+class StaticModule:
+    """
+    Static view on a keyword or pom module, created by parsing the source instead of importing it.
+
+    A ValueError is raised for any construct that cannot be resolved without importing the module (e.g. class
+    inheritance, decorators or computed class attributes); the caller should then fall back to a real import.
+    """
+    def __init__(self, file):
+        self.file = Path(file)
+        self.tree = ast.parse(self.file.read_bytes(), filename=str(self.file))
+        self.classes = {}
+        for stmt in self.tree.body:
+            if isinstance(stmt, ast.ClassDef):
+                self.classes[stmt.name] = stmt
+            elif any(isinstance(n, ast.ClassDef) for n in ast.walk(stmt)):
+                raise ValueError('Module "{}" defines classes conditionally.'.format(self.file))
+
+    @staticmethod
+    def get_methods(cls, allowed_decorators=('staticmethod',)):
+        if cls.bases or cls.keywords or cls.decorator_list:
+            raise ValueError('Class "{}" uses inheritance or decorators.'.format(cls.name))
+        methods = {}
+        for stmt in cls.body:
+            if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                decorators = [d.id if isinstance(d, ast.Name) else None for d in stmt.decorator_list]
+                if not set(decorators) <= set(allowed_decorators):
+                    raise ValueError('Method "{}" uses unsupported decorators.'.format(stmt.name))
+                if stmt.name[0] != '_':
+                    methods[stmt.name] = stmt
+            elif isinstance(stmt, ast.Assign):
+                _literal(stmt.value, {})
+            elif not (_is_docstring(stmt) or isinstance(stmt, ast.Pass)):
+                raise ValueError('Class "{}" contains non-static statements.'.format(cls.name))
+        return methods
+
+    def get_class(self, name):
+        try:
+            return self.classes[name]
+        except KeyError:
+            raise ValueError('Class "{n}" is not defined in module "{f}".'.format(n=name, f=self.file))
+
+    def scan_keywords(self):
+        """
+        Returns the keyword names (present in Keywords, Config and Data), the static configs and the docstrings.
+        Keywords whose config is not a static literal are left out of the configs.
+        """
+        kw_methods, conf_methods, data_methods = [self.get_methods(self.get_class(c))
+                                                  for c in ('Keywords', 'Config', 'Data')]
+        names = sorted(set(kw_methods) & set(conf_methods) & set(data_methods))
+        configs = {}
+        for name in names:
+            try:
+                configs[name] = _static_return(conf_methods[name])
+            except (ValueError, SyntaxError):
+                pass
+        docs = {name: ast.get_docstring(kw_methods[name], clean=False) for name in names}
+        return names, configs, docs
+
+    @staticmethod
+    def get_arguments(func):
+        args = func.args.posonlyargs + func.args.args
+        all_vars = tuple(a.arg for a in args[1:])
+        defaults = tuple(_literal(d, {}) for d in func.args.defaults)
+        if defaults:
+            return all_vars[:-len(defaults)], dict(zip(all_vars[-len(defaults):], defaults))
+        return all_vars, {}
+
+    def scan_pom(self, valid_prefixes):
+        """
+        Returns per pom action (screen class, action name, mandatory variables, optional variables, docstring).
+        """
+        actions = []
+        for cls_name in sorted(self.classes):
+            methods = self.get_methods(self.classes[cls_name], allowed_decorators=())
+            for name in sorted(methods):
+                if any(name[:len(pref)] == pref for pref in valid_prefixes):
+                    man, opt = self.get_arguments(methods[name])
+                    actions.append((cls_name, name, man, opt, ast.get_docstring(methods[name], clean=False)))
+        return actions
@@ -1,20 +1,29 @@
 from pathlib import Path
 import importlib
+import hashlib
+import json
+import sys
 import os
 import re
 import inspect
+import threading
+from collections import namedtuple
+from types import MappingProxyType
 
 from fw.old.core import Util
 from fw.old.core import KeywordNameConventions
+from fw.old.core.introspection import StaticModule
 
 import logging
 import pandas as pd
 
 
 class ExtendedKeywords:
-    def __init__(self):
+    def __init__(self, kw_dirs=None):
         self._fw_dir = Path(*Path(__file__).parts[:-2])
-        self._kw_dirs = [Path(self._fw_dir, d) for d in Util().settings().EXTENDED_KW_DIRECTORY]
+        if kw_dirs is None:
+            kw_dirs = Util().settings().EXTENDED_KW_DIRECTORY
+        self._kw_dirs = [Path(self._fw_dir, d) for d in kw_dirs]
         self._kw_files, self.mods = self._get_kw_files_and_mods()
         logging.debug('The following extended keyword modules are detected: "{}".'.format('", "'.join(self.mods)))
 
@@ -24,6 +33,8 @@ class ExtendedKeywords:
         for kw_dir in self._kw_dirs:
             for d in os.listdir(kw_dir):
                 base_dir = Path(kw_dir, d)
+                if d[0] == '_' or not base_dir.is_dir():
+                    continue
                 if 'keywords.py' in os.listdir(base_dir):
                     files.append(Path(base_dir, 'keywords.py'))
                     base_mod = '.'.join(base_dir.parts[base_dir.parts.index('fw'):])
@@ -76,19 +87,24 @@ class ExtendedKeywords:
 
 
 class PageObjectModelKeywords:
-    def __init__(self):
+    def __init__(self, pom_dirs=None):
         self._fw_dir = Path(*Path(__file__).parts[:-2])
-        self.mods = self._get_all_modules()
+        self._pom_files, self.mods = self._get_pom_files_and_mods(pom_dirs)
         KeywordNameConventions.validate_pom_default_name()
 
-    def _get_all_modules(self):
+    def _get_pom_files_and_mods(self, pom_dirs=None):
+        all_files = []
         all_mods = []
-        for p in Util().settings().POM_DIRECTORY:
+        if pom_dirs is None:
+            pom_dirs = Util().settings().POM_DIRECTORY
+        for p in pom_dirs:
             folder_li = [p for p in re.split(r'[.]|/|\\', p) if p != 'fw']
             folder_path = Path(self._fw_dir, *folder_li)
             mods = [f[:-3] for f in os.listdir(folder_path) if f[0] != '_' and f[-3:] == '.py']
-            all_mods.extend(['fw.{fold}.{mod}'.format(fold='.'.join(folder_li), mod=m) for m in mods])
-        return all_mods
+            base_mod = '.'.join(folder_path.parts[folder_path.parts.index('fw'):])
+            all_files.extend([Path(folder_path, '{}.py'.format(m)) for m in mods])
+            all_mods.extend(['{base_mod}.{mod}'.format(base_mod=base_mod, mod=m) for m in mods])
+        return all_files, all_mods
 
     @staticmethod
     def _decorate_with_new_name(func, screen, cls=None, kw_name=False):
@@ -134,7 +150,7 @@ class PageObjectModelKeywords:
 
     @staticmethod
     def _get_var_info(func):
-        all_vars = func.__code__.co_varnames[1:]
+        all_vars = func.__code__.co_varnames[1:func.__code__.co_argcount]
         defaults = func.__defaults__
         if defaults:
             mandatory = all_vars[:-len(defaults)]
@@ -157,16 +173,21 @@ class PageObjectModelKeywords:
                 methods.append(self._decorate_with_new_name(default_data, screen))
         return methods
 
+    @staticmethod
+    def _make_config_mapping(mandatory, optional):
+        var_reqs = ('mandatory_variables', 'optional_variables')
+        mapping = {r: v for r, v in zip(var_reqs, (mandatory, optional))}
+        for req in Util().settings().REQUIRED_KW_PROPERTIES:
+            if req.lower() not in var_reqs:
+                mapping[req] = Util().settings().POM_DEFAULT_KW_PROPERTIES.get(req)
+        return mapping
+
     def _create_config_methods(self, cls, screen):
         methods = []
         for attr_name in dir(cls):
             func = self._validate_attribute(getattr(cls, attr_name))
             if func:
-                var_reqs = ('mandatory_variables', 'optional_variables')
-                mapping = {r: v for r, v in zip(var_reqs, self._get_var_info(func))}
-                for req in Util().settings().REQUIRED_KW_PROPERTIES:
-                    if req.lower() not in var_reqs:
-                        mapping[req] = Util().settings().POM_DEFAULT_KW_PROPERTIES.get(req)
+                mapping = self._make_config_mapping(*self._get_var_info(func))
 
                 def default_config():
                     return mapping
@@ -239,105 +260,507 @@ class PageObjectModelKeywords:
                 names.extend(self._get_name_per_module(cls, screen, kw_mode=True))
         return names
 
-    def get_keyword_classes(self, kw_mode=True):
-        class PomKeywords:
+    def get_module_methods(self, mod_name, kind='keyword', kw_mode=True):
+        creators = {'keyword': lambda cls, screen: self._create_kw_methods(cls, screen, kw_mode=kw_mode),
+                    'config': self._create_config_methods,
+                    'data': self._create_data_methods}
+        screen = mod_name.split('.')[-1]
+        methods = []
+        for cls in self._get_own_classes(mod_name):
+            methods.extend(creators[kind](cls, screen))
+        return methods
+
+    def _build_class(self, kind, kw_mode=True):
+        class PomMethods:
             pass
-        pom_methods = []
         for mod_name in self.mods:
-            classes = self._get_own_classes(mod_name)
-            for cls in classes:
-                screen = mod_name.split('.')[-1]
-                pom_methods.extend(self._create_kw_methods(cls, screen, kw_mode=kw_mode))
-        for pm in pom_methods:
-            setattr(PomKeywords, pm.__name__, staticmethod(pm))
-        return PomKeywords
+            for pm in self.get_module_methods(mod_name, kind, kw_mode=kw_mode):
+                setattr(PomMethods, pm.__name__, staticmethod(pm))
+        return PomMethods
+
+    def get_keyword_classes(self, kw_mode=True):
+        return self._build_class('keyword', kw_mode=kw_mode)
 
     def get_config_classes(self):
-        class PomConfigs:
-            pass
-        pom_methods = []
-        for mod_name in self.mods:
-            classes = self._get_own_classes(mod_name)
-            for cls in classes:
-                screen = mod_name.split('.')[-1]
-                pom_methods.extend(self._create_config_methods(cls, screen))
-        for pm in pom_methods:
-            setattr(PomConfigs, pm.__name__, staticmethod(pm))
-        return PomConfigs
+        return self._build_class('config')
 
     def get_data_classes(self):
-        class PomConfigs:
-            pass
-        pom_methods = []
-        for mod_name in self.mods:
-            classes = self._get_own_classes(mod_name)
-            for cls in classes:
-                screen = mod_name.split('.')[-1]
-                pom_methods.extend(self._create_data_methods(cls, screen))
-        for pm in pom_methods:
-            setattr(PomConfigs, pm.__name__, staticmethod(pm))
-        return PomConfigs
+        return self._build_class('data')
 
     def get_pom_as_system_interacts(self):
         return self.get_keyword_classes(kw_mode=False)
 
 
-class KeywordMethods(*ExtendedKeywords().get_keyword_classes(),
-                     PageObjectModelKeywords().get_keyword_classes()):
-    pass
+class KeywordRegistry:
+    """
+    Registry of the Keywords, Config and Data methods of all keywords.
+
+    Only the keyword modules are discovered up front. A module is imported, and its methods are bound, the first
+    time one of its keywords is requested; the keyword manifest tells which module that is. Names that no module
+    defines are remembered, so asking for them again does not import anything.
+    """
+    kinds = {'keyword': 'Keywords',
+             'config': 'Config',
+             'data': 'Data'}
+
+    def __init__(self, extended=None, pom=None, manifest=None):
+        self._extended = extended
+        self._pom = pom
+        self._manifest = manifest
+        self._lock = threading.RLock()
+        self._sources = None
+        self._members = {}
+        self._instances = {}
+        self._resolved = {}
+        self._missing = set()
+
+    def _get_sources(self):
+        if self._sources is None:
+            with self._lock:
+                if self._sources is None:
+                    if self._extended is None:
+                        self._extended = ExtendedKeywords()
+                    if self._pom is None:
+                        self._pom = PageObjectModelKeywords()
+                    sources = [('extended', mod) for mod in self._extended.mods]
+                    sources.extend([('pom', mod) for mod in self._pom.mods])
+                    self._sources = sources
+        return self._sources
+
+    def _get_manifest(self):
+        if self._manifest is None:
+            self._get_sources()
+            self._manifest = KeywordManifest(self._extended, self._pom)
+        return self._manifest
+
+    def _get_extended_members(self, mod, kind):
+        cls = ExtendedKeywords._get_class_attr(mod, self.kinds[kind])
+        if cls is None:
+            return {}
+        if cls not in self._instances:
+            self._instances[cls] = cls()
+        instance = self._instances[cls]
+        return {name: getattr(instance, name) for name in ExtendedKeywords._get_kw_attributes(cls)}
+
+    def _get_members(self, source, kind):
+        if (source, kind) not in self._members:
+            origin, mod = source
+            if origin == 'extended':
+                members = self._get_extended_members(mod, kind)
+            else:
+                members = {m.__name__: m for m in self._pom.get_module_methods(mod, kind)}
+            logging.debug('Resolved {n} {kind} methods from module "{mod}".'.format(n=len(members), kind=kind, mod=mod))
+            self._members[(source, kind)] = members
+        return self._members[(source, kind)]
+
+    def _get_candidates(self, name):
+        # the module that owns the keyword according to the manifest, otherwise only the modules without any
+        # keyword in the manifest (e.g. incomplete ones), never all of them.
+        manifest = self._get_manifest()
+        owner = manifest.owner(name)
+        unrecorded = manifest.unrecorded()
+        return [s for s in self._get_sources() if s[1] == owner or s[1] in unrecorded]
+
+    def get(self, kind, name):
+        try:
+            return self._resolved[(kind, name)]
+        except KeyError:
+            pass
+        with self._lock:
+            if (kind, name) not in self._missing:
+                for source in self._get_candidates(name):
+                    members = self._get_members(source, kind)
+                    if name in members:
+                        self._resolved[(kind, name)] = members[name]
+                        return members[name]
+                self._missing.add((kind, name))
+        raise AttributeError('No {kind} method is defined for keyword "{name}".'.format(kind=kind, name=name))
+
+    def names(self, kind):
+        names = []
+        with self._lock:
+            for source in self._get_sources():
+                names.extend([n for n in self._get_members(source, kind) if n not in names])
+        return names
+
+    def build_class(self, kind):
+        self._get_sources()
+        classes = [ExtendedKeywords._get_class_attr(m, self.kinds[kind]) for m in self._extended.mods]
+        classes = [c for c in classes if c is not None]
+        classes.append(self._pom._build_class(kind))
+        return type('{}Methods'.format(self.kinds[kind].rstrip('s')), tuple(classes), {})
+
+    def reset(self, extended=None, pom=None, manifest=None):
+        with self._lock:
+            self._extended = extended
+            self._pom = pom
+            self._manifest = manifest
+            self._sources = None
+            self._members = {}
+            self._instances = {}
+            self._resolved = {}
+            self._missing = set()
+
+
+class _RegistryView:
+    _kind = None
+
+    def __getattr__(self, item):
+        if item[:2] == '__':
+            raise AttributeError(item)
+        return keyword_registry.get(self._kind, item)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(keyword_registry.names(self._kind)))
+
 
+class KeywordMethods(_RegistryView):
+    _kind = 'keyword'
 
-class ConfigMethods(*ExtendedKeywords().get_config_classes(),
-                    PageObjectModelKeywords().get_config_classes()):
-    pass
 
+class ConfigMethods(_RegistryView):
+    _kind = 'config'
 
-class DataMethods(*ExtendedKeywords().get_data_classes(),
-                  PageObjectModelKeywords().get_data_classes()):
-    pass
+
+class DataMethods(_RegistryView):
+    _kind = 'data'
+
+
+class KeywordManifest:
+    """
+    On-disk cache of the keyword information needed by Robot's library introspection.
+
+    A manifest file is kept next to every keyword tree. Its entries are keyed by keyword file and validated by
+    mtime and content hash, so only changed files are imported and scanned again.
+    """
+    file_name = '.fw_keyword_manifest.json'
+    version = 2
+
+    def __init__(self, extended=None, pom=None, static=None):
+        self._extended = extended
+        self._pom = pom
+        self._lock = threading.RLock()
+        self._records = None
+        self._owners = None
+        self._unrecorded = None
+        self.static = Util().settings().get('STATIC_KW_INTROSPECTION', True) if static is None else static
+        self.scanned = 0
+        self.imported = 0
+
+    @staticmethod
+    def _settings_key():
+        sets = Util().settings()
+        key = [sets.REQUIRED_KW_PROPERTIES, sets.POM_KW_NAMING_CONVENTION, dict(sets.POM_DEFAULT_KW_PROPERTIES)]
+        return hashlib.sha1(repr(key).encode()).hexdigest()
+
+    @staticmethod
+    def _jsonable(val):
+        try:
+            json.dumps(val)
+            return val
+        except TypeError:
+            return str(val)
+
+    def _get_sources(self):
+        if self._extended is None:
+            self._extended = ExtendedKeywords()
+        if self._pom is None:
+            self._pom = PageObjectModelKeywords()
+        sources = {}
+        for file, mod in zip(self._extended._kw_files, self._extended.mods):
+            sources.setdefault(Path(file).parents[1], []).append(('extended', Path(file), mod))
+        for file, mod in zip(self._pom._pom_files, self._pom.mods):
+            sources.setdefault(Path(file).parent, []).append(('pom', Path(file), mod))
+        return sources
+
+    def _read(self, manifest_file, settings_key):
+        try:
+            with open(manifest_file, 'r') as stream:
+                manifest = json.load(stream)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('version') != self.version or manifest.get('settings') != settings_key:
+            logging.debug('Keyword manifest "{}" is outdated and will be rebuilt.'.format(manifest_file))
+            return {}
+        return manifest.get('files', {})
+
+    def _write(self, manifest_file, files, settings_key):
+        temp_file = Path('{}.{}.tmp'.format(manifest_file, os.getpid()))
+        try:
+            with open(temp_file, 'w') as stream:
+                json.dump({'version': self.version, 'settings': settings_key, 'files': files}, stream, indent=1)
+            os.replace(temp_file, manifest_file)
+        except OSError as e:
+            logging.warning('Keyword manifest "{m}" could not be written: {e}'.format(m=manifest_file, e=e))
+
+    @staticmethod
+    def _import(mod_name):
+        if mod_name in sys.modules:
+            return importlib.reload(sys.modules[mod_name])
+        return importlib.import_module(mod_name)
+
+    def _make_record(self, origin, method_name, config, doc):
+        optional = config.get('optional_variables') or {}
+        return {'origin': origin,
+                'method_name': method_name,
+                'mandatory_variables': list(config.get('mandatory_variables') or []),
+                'optional_variables': {var: self._jsonable(val) for var, val in optional.items()},
+                'properties': {req: self._jsonable(config.get(req, '{{IKW}}'))
+                               for req in Util().settings().REQUIRED_KW_PROPERTIES},
+                'schema': self._jsonable(dict(config.get('schema') or {})),
+                'doc': doc}
+
+    def _scan_extended(self, mod_name):
+        self.imported += 1
+        mod = self._import(mod_name)
+        classes = [getattr(mod, cls, None) for cls in KeywordRegistry.kinds.values()]
+        if None in classes:
+            return {}
+        kw_cls, conf_cls, _ = classes
+        names = set.intersection(*[set(ExtendedKeywords._get_kw_attributes(cls)) for cls in classes])
+        config = conf_cls()
+        return {name: self._make_record('extended', name, getattr(config, name)(), getattr(kw_cls, name).__doc__)
+                for name in sorted(names)}
+
+    def _scan_pom(self, mod_name):
+        self.imported += 1
+        self._import(mod_name)
+        configs = self._pom.get_module_methods(mod_name, 'config')
+        kws = self._pom.get_module_methods(mod_name, 'keyword')
+        return {conf.__name__: self._make_record('pom', kw.__name__, conf(), kw.__doc__)
+                for conf, kw in zip(configs, kws)}
+
+    def _scan_extended_static(self, file, mod_name):
+        names, configs, docs = StaticModule(file).scan_keywords()
+        records = {name: self._make_record('extended', name, configs[name], docs[name])
+                   for name in names if name in configs}
+        dynamic = [name for name in names if name not in configs]
+        if dynamic:
+            logging.debug('Config of keywords "{}" is not static, module is imported.'.format('", "'.join(dynamic)))
+            imported = self._scan_extended(mod_name)
+            records.update({name: imported[name] for name in dynamic if name in imported})
+        return {name: records[name] for name in names if name in records}
+
+    def _scan_pom_static(self, file, mod_name):
+        screen = mod_name.split('.')[-1]
+        conventions = KeywordNameConventions()
+        records = {}
+        for cls_name, action, man, opt, doc in StaticModule(file).scan_pom(Util().settings().POM_VALID_PREFIXES):
+            kw_name = conventions.make_keyword_name(screen=screen, action=action)
+            method_name = conventions.make_method_name(screen=screen, action=action)
+            config = PageObjectModelKeywords._make_config_mapping(man, opt)
+            records[kw_name] = self._make_record('pom', method_name, config, doc)
+        return records
+
+    def _scan(self, origin, file, mod_name):
+        logging.debug('Scanning keyword module "{}" for the keyword manifest.'.format(mod_name))
+        self.scanned += 1
+        if self.static:
+            try:
+                if origin == 'extended':
+                    return self._scan_extended_static(file, mod_name)
+                return self._scan_pom_static(file, mod_name)
+            except (ValueError, SyntaxError) as e:
+                logging.debug('Module "{m}" cannot be introspected statically ({e}), '
+                              'it is imported instead.'.format(m=mod_name, e=e))
+        if origin == 'extended':
+            return self._scan_extended(mod_name)
+        return self._scan_pom(mod_name)
+
+    def _get_entry(self, stored, origin, file, mod_name):
+        st = file.stat()
+        if stored is not None and (stored['mtime_ns'], stored['size']) == (st.st_mtime_ns, st.st_size):
+            return stored, False
+        digest = hashlib.sha1(file.read_bytes()).hexdigest()
+        if stored is None or stored['hash'] != digest:
+            stored = {'module': mod_name, 'hash': digest, 'keywords': self._scan(origin, file, mod_name)}
+        stored.update({'mtime_ns': st.st_mtime_ns, 'size': st.st_size})
+        return stored, True
+
+    def _load(self):
+        settings_key = self._settings_key()
+        records = {}
+        owners = {}
+        unrecorded = set()
+        for base_dir, sources in self._get_sources().items():
+            manifest_file = Path(base_dir, self.file_name)
+            stored = self._read(manifest_file, settings_key)
+            files = {}
+            changed = False
+            for origin, file, mod_name in sources:
+                key = file.relative_to(base_dir).as_posix()
+                files[key], updated = self._get_entry(stored.get(key), origin, file, mod_name)
+                changed = changed or updated
+            if changed or set(files) != set(stored):
+                self._write(manifest_file, files, settings_key)
+            for entry in files.values():
+                if not entry['keywords']:
+                    unrecorded.add(entry['module'])
+                for name, record in entry['keywords'].items():
+                    records.setdefault(name, record)
+                    owners.setdefault(name, entry['module'])
+                    owners.setdefault(record['method_name'], entry['module'])
+        self._owners, self._unrecorded = owners, frozenset(unrecorded)
+        return records
+
+    def records(self):
+        if self._records is None:
+            with self._lock:
+                if self._records is None:
+                    self._records = self._load()
+        return self._records
+
+    def get(self, name):
+        return self.records().get(name)
+
+    def owner(self, name):
+        self.records()
+        return self._owners.get(name)
+
+    def unrecorded(self):
+        self.records()
+        return self._unrecorded
+
+    def clear(self):
+        with self._lock:
+            self._records = None
+
+    def reset(self, extended=None, pom=None):
+        with self._lock:
+            self._extended = extended
+            self._pom = pom
+            self._records = None
+
+
+keyword_manifest = KeywordManifest()
+keyword_registry = KeywordRegistry(manifest=keyword_manifest)
+
+
+class KeywordRecord(namedtuple('KeywordRecord', ['name', 'normalized', 'origin', 'method_name', 'mandatory',
+                                                 'optional', 'mandatory_upper', 'optional_upper', 'arguments',
+                                                 'robot_arguments', 'properties', 'schema', 'qualified', 'doc'])):
+    __slots__ = ()
+
+    @staticmethod
+    def normalize(name: str):
+        return name.lower().replace(' ', '').replace('_', '')
+
+    def get_method(self, kind):
+        return keyword_registry.get(kind, self.name if kind == 'config' else self.method_name)
+
+
+class KeywordIndex:
+    """ Index of frozen keyword records, built once from the keyword manifest. """
+    def __init__(self, manifest=None):
+        self._manifest = manifest
+        self._lock = threading.RLock()
+        self._records = None
+        self._normalized = None
+        self._qualified = None
+
+    @staticmethod
+    def _make_record(name, record, include_pom):
+        man = tuple(record['mandatory_variables'])
+        opt = MappingProxyType(dict(record['optional_variables']))
+        robot_args = tuple(['{}=()'.format(var) for var in man] + ['{}={}'.format(var, val) for var, val in opt.items()])
+        qualified = '{{IKW}}' not in record['properties'].values() and (include_pom or record['origin'] != 'pom')
+        return KeywordRecord(name=name,
+                             normalized=KeywordRecord.normalize(name),
+                             origin=record['origin'],
+                             method_name=record['method_name'],
+                             mandatory=man,
+                             optional=opt,
+                             mandatory_upper=tuple([var.upper() for var in man]),
+                             optional_upper=tuple([var.upper() for var in opt]),
+                             arguments=man + tuple(opt),
+                             robot_arguments=robot_args,
+                             properties=MappingProxyType(dict(record['properties'])),
+                             schema=MappingProxyType(dict(record.get('schema') or {})),
+                             qualified=qualified,
+                             doc=record['doc'])
+
+    def _build(self):
+        manifest = keyword_manifest if self._manifest is None else self._manifest
+        include_pom = Util().settings().INCLUDE_POM_AS_KEYWORDS
+        records = {name: self._make_record(name, rec, include_pom) for name, rec in manifest.records().items()}
+        self._normalized = {}
+        for record in records.values():
+            self._normalized.setdefault(record.normalized, record)
+        self._qualified = tuple([name for name, record in records.items() if record.qualified])
+        self._records = records
+
+    def _make_config_record(self, name):
+        config = getattr(ConfigMethods(), name)()
+        method_name = KeywordNameConventions().convert_name(name, in_name='keyword').replace(' ', '_')
+        try:
+            doc = keyword_registry.get('keyword', method_name).__doc__
+        except AttributeError:
+            doc = None
+        manifest = keyword_manifest if self._manifest is None else self._manifest
+        record = manifest._make_record('extended', method_name, config, doc)
+        return self._make_record(name, record, Util().settings().INCLUDE_POM_AS_KEYWORDS)
+
+    def records(self):
+        if self._records is None:
+            with self._lock:
+                if self._records is None:
+                    self._build()
+        return self._records
+
+    def qualified_names(self):
+        self.records()
+        return self._qualified
+
+    def get(self, name: str):
+        records = self.records()
+        try:
+            return records[name]
+        except KeyError:
+            pass
+        record = self._normalized.get(KeywordRecord.normalize(name))
+        if record is None:
+            with self._lock:
+                record = self._make_config_record(name)
+                records[name] = record
+        return record
+
+    def reset(self):
+        with self._lock:
+            self._records = None
+            if self._manifest is None:
+                keyword_manifest.clear()
+
+
+keyword_index = KeywordIndex()
+
+
+def set_keyword_sources(extended=None, pom=None):
+    keyword_registry.reset(extended, pom, keyword_manifest)
+    keyword_manifest.reset(extended, pom)
+    keyword_index.reset()
 
 
 class KeywordInfo:
     @staticmethod
     def get_qualified_keywords():
-        names = ExtendedKeywords().get_all_names()
-        if Util().settings().INCLUDE_POM_AS_KEYWORDS:
-            names.extend(PageObjectModelKeywords().get_all_names())
-        req_props = Util().settings().REQUIRED_KW_PROPERTIES
-        qualified_kws = []
-        for name in names:
-            valid = True
-            for req in req_props:
-                if getattr(ConfigMethods(), name)().get(req, '{{IKW}}') == '{{IKW}}':
-                    valid = False
-            if valid:
-                qualified_kws.append(name)
-        return qualified_kws
+        return list(keyword_index.qualified_names())
 
     @staticmethod
     def get_keyword_arguments(name: str, robot_mode=True):
-        man_vars = getattr(ConfigMethods(), name)().get('mandatory_variables')
-        opt_vars = getattr(ConfigMethods(), name)().get('optional_variables')
-        if robot_mode:
-            all_vars = ['{}=()'.format(var) for var in man_vars]
-            if opt_vars is not None:
-                all_vars.extend(['{}={}'.format(var, val) for var, val in opt_vars.items()])
-        else:
-            all_vars = list(man_vars)
-            if opt_vars is not None:
-                all_vars.extend(opt_vars)
-        return all_vars
+        record = keyword_index.get(name)
+        return list(record.robot_arguments if robot_mode else record.arguments)
 
     @staticmethod
     def get_keyword_documentation(name: str):
-        new_name = KeywordNameConventions().convert_name(name, in_name='keyword').replace(' ', '_')
-        if new_name in dir(KeywordMethods()):
-            return str(getattr(KeywordMethods(), new_name).__doc__)
+        try:
+            return str(keyword_index.get(name).doc)
+        except AttributeError:
+            return None
 
     @staticmethod
     def get_mandatory_arguments(name: str):
-        return [v.upper() for v in getattr(ConfigMethods(), name)().get('mandatory_variables')]
+        return list(keyword_index.get(name).mandatory_upper)
 
     @staticmethod
     def get_optional_arguments(name: str):
-        return [v.upper() for v in getattr(ConfigMethods(), name)().get('optional_variables')]
\ No newline at end of file
+        return list(keyword_index.get(name).optional_upper)
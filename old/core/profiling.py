@@ -0,0 +1,128 @@
+from pathlib import Path
+import atexit
+import contextlib
+import cProfile
+import datetime as dt
+import logging
+import pstats
+import threading
+import time
+
+from .conventions import FileName
+from .utilities import Util
+
+
+class KeywordProfiler:
+    """
+    Opt-in cProfile profiling of keyword calls (setting PROFILE: cprofile, also as --PROFILE on a keyword call).
+
+    The profiles of every keyword are accumulated into one pstats file per keyword, and of all keywords into a merged
+    file for the run, written at exit or with write_merged. Files are named with the DEFAULT_FILE_NAME template and
+    written to PROFILE_DIR in LOG_LOC. Only every PROFILE_EVERY-th call of a keyword is profiled, and only calls that
+    take at least PROFILE_MIN_SECONDS are kept. cProfile only sees the calling thread, so rows run in pools are not
+    part of the profile. Keywords called by a profiled keyword are part of its profile, they are not profiled on
+    their own.
+    """
+    modes = ('cprofile',)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._calls = {}
+        self._stats = {}
+        self._merged = None
+        self._directory = None
+        self._started = None
+        atexit.register(self.write_merged)
+
+    @staticmethod
+    def _setting(fwo, kwargs, name, default=None):
+        for key, val in kwargs.items():
+            if key.upper() == '--' + name:
+                return val
+        val = fwo.fw_settings.get(name)
+        return default if val is None else val
+
+    def _filename(self, kind):
+        return FileName().get_filename(prefix='profile_', type='{}_'.format(kind), datetime=self._started,
+                                       extension='pstats')
+
+    def _keep(self, profiler, method_name, directory):
+        with self._lock:
+            if self._started is None:
+                self._started = dt.datetime.now().strftime(Util().settings().DEFAULT_DATETIME_FORMAT)
+            stats = self._stats.get(method_name)
+            if stats is None:
+                stats = self._stats[method_name] = pstats.Stats(profiler)
+            else:
+                stats.add(profiler)
+            if self._merged is None:
+                self._merged = pstats.Stats(profiler)
+            else:
+                self._merged.add(profiler)
+            self._directory = directory
+            directory.mkdir(parents=True, exist_ok=True)
+            stats.dump_stats(Path(directory, self._filename(method_name)))
+
+    @contextlib.contextmanager
+    def profile(self, fwo, method_name, kwargs=None):
+        kwargs = kwargs or {}
+        mode = self._setting(fwo, kwargs, 'PROFILE')
+        if not Util.is_on(mode):
+            yield
+            return
+        mode = str(mode).strip().lower()
+        if mode not in self.modes:
+            raise ValueError('Profiler "{m}" is not supported (use one of: "{opts}").'
+                             .format(m=mode, opts='", "'.join(self.modes)))
+        if getattr(self._local, 'active', False):
+            # a second profiler would replace the one of the outer keyword (Python < 3.12 does not refuse it).
+            yield
+            return
+        with self._lock:
+            call = self._calls[method_name] = self._calls.get(method_name, 0) + 1
+        if (call - 1) % max(int(self._setting(fwo, kwargs, 'PROFILE_EVERY', 1)), 1) != 0:
+            yield
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # e.g. another profiler is already active in this thread.
+            logging.debug('Keyword "{k}" is not profiled: {e}'.format(k=method_name, e=e))
+            yield
+            return
+        self._local.active = True
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self._local.active = False
+            if time.perf_counter() - start >= float(self._setting(fwo, kwargs, 'PROFILE_MIN_SECONDS', 0)):
+                directory = Path(fwo.fw_settings.LOG_LOC, self._setting(fwo, kwargs, 'PROFILE_DIR', ''))
+                try:
+                    self._keep(profiler, method_name, directory)
+                except OSError as e:
+                    logging.warning('Profile of keyword "{k}" could not be written: {e}'.format(k=method_name, e=e))
+
+    def write_merged(self, directory=None):
+        with self._lock:
+            if self._merged is None:
+                return None
+            directory = Path(directory or self._directory)
+            directory.mkdir(parents=True, exist_ok=True)
+            file = Path(directory, self._filename('run'))
+            self._merged.dump_stats(file)
+            return file
+
+    def reset(self):
+        with self._lock:
+            self._calls = {}
+            self._stats = {}
+            self._merged = None
+            self._started = None
+
+
+keyword_profiler = KeywordProfiler()
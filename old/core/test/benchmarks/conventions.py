@@ -0,0 +1,25 @@
+import timeit
+from fw.old.core.utilities import Util
+from fw.old.core.conventions import KeywordNameConventions
+
+
+def _legacy_convert_name(name):
+    Util().settings().POM_KW_NAMING_CONVENTION.format(screen='screen', action='action')
+    for kw_char, m_char in KeywordNameConventions.mapper.items():
+        name = name.replace(kw_char, m_char)
+    return name
+
+
+def run(number=100000):
+    names = ['(screen {n}) click button {n}'.format(n=n) for n in range(50)]
+    conv = KeywordNameConventions()
+    legacy = timeit.timeit(lambda: [_legacy_convert_name(n) for n in names], number=number // len(names))
+    compiled = timeit.timeit(lambda: [conv.convert_name(n, in_name='keyword') for n in names],
+                             number=number // len(names))
+    return {'convert_name_legacy': legacy / number,
+            'convert_name_compiled': compiled / number}
+
+
+if __name__ == '__main__':
+    for name, val in run().items():
+        print('{name:<30} {us:>12.2f} us/call'.format(name=name, us=val * 1e6))
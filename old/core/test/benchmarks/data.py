@@ -0,0 +1,82 @@
+import time
+import timeit
+
+import pandas as pd
+
+from fw.old.core.data import ColumnSchema, DataLibrary, DataLoader
+from fw.old.core.datetime import DateParser
+from fw.old.core.test.benchmarks import synthetic
+
+SCHEMA = {'ID': 'int', 'NAME': 'category', 'STATUS': 'category', 'AMOUNT': 'float',
+          'DATE': {'type': 'datetime', 'format': 'UTC %Y/%m/%d %H:%M:%S'}}
+
+
+def _legacy_safe_assign(def_spec, data, **kwargs):
+    edit_cols = tuple(set(data.columns) & set(kwargs.keys()))
+    new_cols = {col: val for col, val in kwargs.items() if col not in edit_cols}
+    data = data.assign(**new_cols)
+    for col in edit_cols:
+        if def_spec in data[col].to_list():
+            new_data = data[[col]].assign(**{col: kwargs.get(col)})
+            new_list = []
+            for old, new in zip(data[col], new_data[col]):
+                if old == def_spec:
+                    new_list.append(new)
+                else:
+                    new_list.append(old)
+            data = data.assign(**{col: new_list})
+    return data
+
+
+def _frame(def_spec, rows, cols):
+    return pd.DataFrame({'COL_{}'.format(c): [def_spec if r % 2 else 'value' for r in range(rows)]
+                         for c in range(cols)})
+
+
+def run(number=3):
+    from fw.old import fw
+    fwo = fw(**{'--LOG_LEVEL': None})
+    def_spec = fwo.fw_settings.DEFAULT_SPECIFIER
+    lib = DataLibrary(fwo)
+    results = {}
+    for name, rows, cols in (('wide', 1000, 200), ('long', 1000000, 2)):
+        data = _frame(def_spec, rows, cols)
+        edits = {'COL_{}'.format(c): 'new' for c in range(0, cols, 2)}
+        edits['NEW_COL'] = 'added'
+        pd.testing.assert_frame_equal(_legacy_safe_assign(def_spec, data, **edits), lib.safe_assign(data, **edits),
+                                      check_like=True)
+        legacy = timeit.timeit(lambda: _legacy_safe_assign(def_spec, data, **edits), number=number)
+        vectorized = timeit.timeit(lambda: lib.safe_assign(data, **edits), number=number)
+        results.update({'safe_assign_{}_legacy'.format(name): legacy / number,
+                        'safe_assign_{}'.format(name): vectorized / number})
+    return results
+
+
+def _load(loader, file, schema):
+    # the stages of DataLoader.get_data, with the schema a keyword would declare.
+    data = loader._reduce_rows(loader._read_csv_file(file, None, schema), None)
+    return loader._evaluate_data(DateParser().make_date_frame_or_return(data))
+
+
+def run_schema(rows=200000):
+    from fw.old import fw
+    loader = DataLoader(fw(**{'--LOG_LEVEL': None, '--DATA_CACHE_DIR': ''}))
+    file = synthetic.make_csv('bench_schema_{}'.format(rows), rows)
+    results = {}
+    try:
+        for name, schema in (('untyped', ColumnSchema()), ('typed', ColumnSchema(SCHEMA))):
+            start = time.perf_counter()
+            data = _load(loader, file, schema)
+            results['get_data_{}'.format(name)] = time.perf_counter() - start
+            results['get_data_{}_mb'.format(name)] = data.memory_usage(deep=True).sum() / 2 ** 20
+    finally:
+        file.unlink()
+    return results
+
+
+if __name__ == '__main__':
+    for name, val in run().items():
+        print('{name:<40} {ms:>12.2f} ms'.format(name=name, ms=val * 1e3))
+    for name, val in run_schema().items():
+        unit, val = ('MB', val) if name.endswith('_mb') else ('ms', val * 1e3)
+        print('{name:<40} {val:>12.2f} {unit}'.format(name=name, val=val, unit=unit))
@@ -0,0 +1,36 @@
+import timeit
+
+import pandas as pd
+
+from fw.old.core.evaluation import Evaluator
+
+
+def _frame(rows, expression):
+    return pd.DataFrame({'ID': [str(r + 1) for r in range(rows)],
+                         'STATUS': [('OPEN', 'CLOSED', 'PENDING')[r % 3] for r in range(rows)],
+                         'AMOUNT': [str((r % 500) + 0.5) for r in range(rows)],
+                         'TOTAL': ['ev:{}'.format(expression)] * rows,
+                         'OPEN': ['ev:STATUS == "OPEN" and TOTAL > 100'] * rows})
+
+
+def _per_row(evaluator, data):
+    cols = list(data.columns)
+    return [evaluator.evaluate_row(dict(zip(cols, row))) for row in data.itertuples(index=False, name=None)]
+
+
+def run(rows=100000, number=3, mask_rows=1000000):
+    evaluator = Evaluator('ev:')
+    data = _frame(rows, 'float(AMOUNT) * 1.21')
+    per_row = timeit.timeit(lambda: _per_row(evaluator, data), number=number)
+    per_column = timeit.timeit(lambda: evaluator.evaluate_frame(data), number=number)
+    rows_filter = 'ev:STATUS == "OPEN" and float(AMOUNT) > 100'
+    mask_data = _frame(mask_rows, 'float(AMOUNT) * 1.21')[['ID', 'STATUS', 'AMOUNT']]
+    mask = timeit.timeit(lambda: evaluator.evaluate_mask(rows_filter, mask_data), number=number)
+    return {'evaluate_per_row': per_row / number,
+            'evaluate_per_column': per_column / number,
+            'rows_filter_mask_{}'.format(mask_rows): mask / number}
+
+
+if __name__ == '__main__':
+    for name, val in run().items():
+        print('{name:<30} {ms:>12.2f} ms'.format(name=name, ms=val * 1e3))
@@ -0,0 +1,89 @@
+import time
+import timeit
+from pathlib import Path
+import fw.old.core.keyword as kw
+from fw.old.core.keyword import KeywordRegistry, KeywordManifest, KeywordIndex, ExtendedKeywords, PageObjectModelKeywords
+from fw.old.core.test.benchmarks import synthetic
+
+
+def _sources(kw_dir, pom_dir):
+    pom_rel = Path(pom_dir).relative_to(Path(kw.__file__).parents[1])
+    return ExtendedKeywords(kw_dirs=[kw_dir]), PageObjectModelKeywords(pom_dirs=['.'.join(pom_rel.parts)])
+
+
+def _registry(kw_dir, pom_dir):
+    return KeywordRegistry(*_sources(kw_dir, pom_dir))
+
+
+def _time_startup(kw_dir, pom_dir, eager, name='kw_0_0'):
+    synthetic.purge_modules(kw_dir)
+    synthetic.purge_modules(pom_dir)
+    start = time.perf_counter()
+    registry = _registry(kw_dir, pom_dir)
+    if eager:
+        for kind in KeywordRegistry.kinds:
+            registry.build_class(kind)
+    else:
+        for kind in KeywordRegistry.kinds:
+            try:
+                registry.get(kind, name)
+            except AttributeError:
+                pass
+    return time.perf_counter() - start
+
+
+def _time_manifest(kw_dir, pom_dir, static):
+    for path in (kw_dir, pom_dir):
+        synthetic.purge_modules(path)
+        Path(path, KeywordManifest.file_name).unlink(missing_ok=True)
+    start = time.perf_counter()
+    KeywordManifest(*_sources(kw_dir, pom_dir), static=static).records()
+    return time.perf_counter() - start
+
+
+def _legacy_arguments(config_cls, name):
+    man_vars = getattr(config_cls(), name)().get('mandatory_variables')
+    opt_vars = getattr(config_cls(), name)().get('optional_variables')
+    all_vars = ['{}=()'.format(var) for var in man_vars]
+    if opt_vars is not None:
+        all_vars.extend(['{}={}'.format(var, val) for var, val in opt_vars.items()])
+    return all_vars
+
+
+def _time_lookups(kw_dir, pom_dir, number):
+    names = ['kw_{}_0'.format(m) for m in range(10)]
+    config_cls = _registry(kw_dir, pom_dir).build_class('config')
+    index = KeywordIndex(KeywordManifest(*_sources(kw_dir, pom_dir)))
+    index.records()
+    legacy = timeit.timeit(lambda: [_legacy_arguments(config_cls, n) for n in names], number=number // len(names))
+    indexed = timeit.timeit(lambda: [list(index.get(n).robot_arguments) for n in names], number=number // len(names))
+    return legacy, indexed
+
+
+def run(n_modules=300, n_screens=50, repeat=3):
+    kw_dir = synthetic.make_keyword_tree('bench_keywords', n_modules)
+    pom_dir = synthetic.make_pom_tree('bench_pom', n_screens)
+    try:
+        eager = min(_time_startup(kw_dir, pom_dir, True) for _ in range(repeat))
+        lazy = min(_time_startup(kw_dir, pom_dir, False) for _ in range(repeat))
+        lazy_last = min(_time_startup(kw_dir, pom_dir, False, 'kw_{}_0'.format(n_modules - 1)) for _ in range(repeat))
+        lazy_missing = min(_time_startup(kw_dir, pom_dir, False, 'no_such_keyword') for _ in range(repeat))
+        manifest_import = min(_time_manifest(kw_dir, pom_dir, False) for _ in range(repeat))
+        manifest_static = min(_time_manifest(kw_dir, pom_dir, True) for _ in range(repeat))
+        lookups_legacy, lookups_indexed = _time_lookups(kw_dir, pom_dir, number=10000)
+    finally:
+        synthetic.remove_tree('bench_keywords')
+        synthetic.remove_tree('bench_pom')
+    return {'keyword_startup_eager': eager,
+            'keyword_startup_lazy': lazy,
+            'keyword_startup_lazy_last': lazy_last,
+            'keyword_startup_lazy_missing': lazy_missing,
+            'keyword_manifest_import': manifest_import,
+            'keyword_manifest_static': manifest_static,
+            'keyword_10k_lookups_legacy': lookups_legacy,
+            'keyword_10k_lookups_indexed': lookups_indexed}
+
+
+if __name__ == '__main__':
+    for name, val in run().items():
+        print('{name:<30} {ms:>12.2f} ms'.format(name=name, ms=val * 1e3))
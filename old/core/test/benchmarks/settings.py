@@ -0,0 +1,19 @@
+import timeit
+from fw.old.core.utilities import Util
+
+
+def run(number=1000):
+    util = Util()
+    Util.reload_settings()
+    util.settings()
+    uncached = timeit.timeit(util._load_settings, number=number) / number
+    cached = timeit.timeit(util.settings, number=number) / number
+    attribute = timeit.timeit(lambda: util.settings().POM_KW_NAMING_CONVENTION, number=number) / number
+    return {'settings_uncached': uncached,
+            'settings_cached': cached,
+            'settings_attribute_lookup': attribute}
+
+
+if __name__ == '__main__':
+    for name, val in run().items():
+        print('{name:<30} {us:>12.2f} us/call'.format(name=name, us=val * 1e6))
@@ -0,0 +1,264 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from fw.old.core.test.benchmarks import synthetic
+
+BASELINE_FILE = Path(Path(__file__).parent, 'baseline.json')
+
+
+class Context:
+    def __init__(self, rows=1000, keyword_modules=200, pom_screens=20, env_depth=3):
+        self.params = {'rows': rows,
+                       'keyword_modules': keyword_modules,
+                       'pom_screens': pom_screens,
+                       'env_depth': env_depth}
+        self.rows = rows
+        self._fw = None
+        self.kw_dir = synthetic.make_keyword_tree('bench_keywords', keyword_modules)
+        self.pom_dir = synthetic.make_pom_tree('bench_pom', pom_screens)
+        self.env_dir, self.env = synthetic.make_env_tree('bench_envs', depth=env_depth)
+        self.csv_file = synthetic.make_csv('bench_data_{}'.format(rows), rows)
+        self.json_file = synthetic.make_jsonl('bench_data_{}'.format(rows), rows)
+        self.cache_dir = Path(synthetic.TEMP_DIR, 'bench_data_cache')
+
+        from fw.old.core import keyword
+        from fw.old.core.test.benchmarks.keyword import _sources
+        keyword.set_keyword_sources(*_sources(self.kw_dir, self.pom_dir))
+
+    def fw(self, **settings):
+        from fw.old import fw
+        defaults = {'--LOG_LEVEL': None, '--DATA_CACHE_DIR': str(self.cache_dir)}
+        if settings:
+            return fw(**dict(defaults, **settings))
+        if self._fw is None:
+            self._fw = fw(**defaults)
+        return self._fw
+
+    def close(self):
+        from fw.old.core import keyword
+        keyword.set_keyword_sources()
+        for name in ('bench_keywords', 'bench_pom', 'bench_envs', 'bench_data_cache'):
+            synthetic.remove_tree(name)
+        self.csv_file.unlink()
+        self.json_file.unlink()
+
+
+def stage_import_library(ctx):
+    code = 'import time; start = time.perf_counter(); import fw.old; print(time.perf_counter() - start)'
+    cwd = Path(*Path(__file__).parts[:Path(__file__).parts.index('fw')])
+
+    def run():
+        out = subprocess.run([sys.executable, '-c', code], cwd=str(cwd), capture_output=True, text=True, check=True)
+        return float(out.stdout.strip().splitlines()[-1])
+    return run
+
+
+def stage_settings(ctx):
+    from fw.old.core.utilities import Util
+    return Util().settings
+
+
+def stage_get_keyword_names(ctx):
+    from fw.old.core import keyword
+    fwo = ctx.fw()
+
+    def run():
+        keyword.keyword_index.reset()
+        return fwo.get_keyword_names()
+    return run
+
+
+def stage_run_keyword(ctx):
+    fwo = ctx.fw()
+    return lambda: fwo.run_keyword('kw_0_0', [], {'VAR1': 'value1', 'VAR2': 'value2'})
+
+
+def stage_get_data(ctx):
+    from fw.old.core.data import DataLoader
+    fwo = ctx.fw()
+    return lambda: DataLoader(fwo).get_data(None, DATA_FILE=str(ctx.csv_file))
+
+
+def stage_get_data_uncached(ctx):
+    from fw.old.core.data import DataLoader
+    fwo = ctx.fw(**{'--DATA_CACHE_DIR': ''})
+    return lambda: DataLoader(fwo).get_data(None, DATA_FILE=str(ctx.csv_file))
+
+
+def stage_get_data_rows(ctx):
+    from fw.old.core.data import DataLoader
+    fwo = ctx.fw()
+    return lambda: DataLoader(fwo).get_data(None, DATA_FILE=str(ctx.csv_file), ROWS='3,7')
+
+
+def stage_get_data_last_row(ctx):
+    from fw.old.core.data import DataLoader
+    fwo = ctx.fw()
+    return lambda: DataLoader(fwo).get_data(None, DATA_FILE=str(ctx.csv_file), ROWS=str(ctx.rows))
+
+
+def stage_get_data_json(ctx):
+    from fw.old.core.data import DataLoader
+    fwo = ctx.fw(**{'--DATA_CACHE_DIR': ''})
+    return lambda: DataLoader(fwo).get_data(None, DATA_FILE=str(ctx.json_file))
+
+
+def stage_safe_assign(ctx):
+    from fw.old.core.data import DataLibrary
+    fwo = ctx.fw()
+    spec = fwo.fw_settings.DEFAULT_SPECIFIER
+    data = pd.DataFrame({'COL_{}'.format(c): [spec if r % 2 else 'value' for r in range(ctx.rows)]
+                         for c in range(20)})
+    edits = {'COL_{}'.format(c): 'new' for c in range(0, 20, 2)}
+    edits['NEW_COL'] = 'added'
+    return lambda: DataLibrary(fwo).safe_assign(data, **edits)
+
+
+def stage_make_date(ctx):
+    from fw.old.core.datetime import DateParser
+    dp = DateParser()
+    return lambda: dp.make_date('UTC 2019/01/01 00:00:00')
+
+
+def stage_make_date_relative(ctx):
+    from fw.old.core.datetime import DateParser
+    dp = DateParser()
+    return lambda: dp.make_date('UTC +0/+0/-1 +0:+0:+0')
+
+
+def stage_make_date_range(ctx):
+    from fw.old.core.datetime import DateParser
+    dp = DateParser()
+    return lambda: list(dp.make_date_range('UTC 2019/01/01', through_date='UTC 2019/01/08', unit='minute'))
+
+
+def stage_make_date_index(ctx):
+    from fw.old.core.datetime import DateParser
+    dp = DateParser()
+    return lambda: dp.make_date_range('UTC 2019/01/01', through_date='UTC 2019/01/08', unit='minute').to_index()
+
+
+def stage_load_environment(ctx):
+    from fw.old.core.environment import Env
+    return lambda: Env(env_dir=ctx.env_dir).load_environment_settings(ctx.env)
+
+
+# stage name: (setup function, calls per measurement, whether the stage reports its own duration)
+STAGES = {'import_library': (stage_import_library, 1, True),
+          'settings': (stage_settings, 10000, False),
+          'get_keyword_names': (stage_get_keyword_names, 1, False),
+          'run_keyword': (stage_run_keyword, 10, False),
+          'get_data': (stage_get_data, 1, False),
+          'get_data_uncached': (stage_get_data_uncached, 1, False),
+          'get_data_rows': (stage_get_data_rows, 1, False),
+          'get_data_last_row': (stage_get_data_last_row, 1, False),
+          'get_data_json': (stage_get_data_json, 1, False),
+          'safe_assign': (stage_safe_assign, 1, False),
+          'make_date': (stage_make_date, 1000, False),
+          'make_date_relative': (stage_make_date_relative, 1000, False),
+          'make_date_range': (stage_make_date_range, 1, False),
+          'make_date_index': (stage_make_date_index, 10, False),
+          'load_environment': (stage_load_environment, 10, False)}
+
+
+def time_stage(func, number, self_timed, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            result = func()
+        elapsed = (time.perf_counter() - start) / number
+        timings.append(result if self_timed else elapsed)
+    return {'median': statistics.median(timings),
+            'min': min(timings),
+            'max': max(timings),
+            'repeat': repeat,
+            'number': number}
+
+
+def run(stages=None, repeat=5, **params):
+    ctx = Context(**params)
+    results = {}
+    try:
+        for name in stages or STAGES:
+            setup, number, self_timed = STAGES[name]
+            try:
+                results[name] = time_stage(setup(ctx), number, self_timed, repeat)
+            except Exception as e:
+                results[name] = {'error': '{}: {}'.format(e.__class__.__name__, e)}
+    finally:
+        ctx.close()
+    return {'meta': {'created': datetime.now().isoformat(),
+                     'python': platform.python_version(),
+                     'pandas': pd.__version__,
+                     'platform': platform.platform(),
+                     'params': ctx.params},
+            'results': results}
+
+
+def compare(report, baseline, threshold):
+    if baseline['meta'].get('params') != report['meta']['params']:
+        print('Warning: the baseline was recorded with different parameters ({}).'.format(baseline['meta'].get('params')))
+    regressions = {}
+    for name, result in report['results'].items():
+        base = baseline['results'].get(name, {})
+        if 'median' in result and base.get('median'):
+            ratio = result['median'] / base['median']
+            result['baseline_ratio'] = ratio
+            if ratio > 1 + threshold:
+                regressions[name] = ratio
+    return regressions
+
+
+def print_report(report):
+    for name, result in report['results'].items():
+        if 'error' in result:
+            print('{name:<22} ERROR {err}'.format(name=name, err=result['error']))
+        else:
+            ratio = result.get('baseline_ratio')
+            print('{name:<22} {ms:>12.4f} ms {ratio}'.format(name=name, ms=result['median'] * 1e3,
+                                                           ratio='' if ratio is None else 'x{:.2f}'.format(ratio)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the hot paths of the framework.')
+    parser.add_argument('--rows', type=int, default=1000, help='rows in the generated data file')
+    parser.add_argument('--keyword-modules', type=int, default=200, help='generated keyword modules')
+    parser.add_argument('--pom-screens', type=int, default=20, help='generated pom screens')
+    parser.add_argument('--env-depth', type=int, default=3, help='levels of the generated environment')
+    parser.add_argument('--repeat', type=int, default=5, help='measurements per stage')
+    parser.add_argument('--stages', default=','.join(STAGES), help='comma separated stages to run')
+    parser.add_argument('--output', default='bench_results.json', help='file to write the results to')
+    parser.add_argument('--baseline', default=str(BASELINE_FILE), help='baseline results to compare with')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed relative slowdown')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline')
+    args = parser.parse_args(argv)
+
+    report = run(stages=args.stages.split(','), repeat=args.repeat, rows=args.rows,
+                 keyword_modules=args.keyword_modules, pom_screens=args.pom_screens, env_depth=args.env_depth)
+    regressions = {}
+    if Path(args.baseline).exists() and not args.save_baseline:
+        with open(args.baseline, 'r') as stream:
+            regressions = compare(report, json.load(stream), args.threshold)
+    print_report(report)
+    with open(args.output, 'w') as stream:
+        json.dump(report, stream, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as stream:
+            json.dump(report, stream, indent=2)
+    for name, ratio in regressions.items():
+        print('Regression in "{n}": {r:.2f} times slower than the baseline.'.format(n=name, r=ratio))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import json
+from pathlib import Path
+import shutil
+import sys
+
+TEMP_DIR = Path(*Path(__file__).parts[:-2], 'temp')
+
+KEYWORD_TEMPLATE = '''
+class Keywords:
+{keywords}
+
+class Config:
+{configs}
+
+class Data:
+{datas}
+'''
+
+POM_TEMPLATE = '''
+class Screen{n}:
+{actions}
+'''
+
+
+def module_name(path):
+    path = Path(path)
+    return '.'.join(path.parts[path.parts.index('fw'):])
+
+
+def purge_modules(path):
+    prefix = module_name(path)
+    for mod in [m for m in sys.modules if m == prefix or m.startswith(prefix + '.')]:
+        sys.modules.pop(mod)
+
+
+def _package(path):
+    path.mkdir(parents=True, exist_ok=True)
+    Path(path, '__init__.py').touch()
+    return path
+
+
+def make_keyword_tree(name, n_modules, kws_per_module=1):
+    base = Path(TEMP_DIR, name)
+    shutil.rmtree(base, ignore_errors=True)
+    _package(TEMP_DIR)
+    _package(base)
+    for m in range(n_modules):
+        kws = ['kw_{m}_{k}'.format(m=m, k=k) for k in range(kws_per_module)]
+        keywords = ''.join(['    def {kw}(self, fw):\n        """ Synthetic keyword {kw}. """\n'
+                            '        return fw\n\n'.format(kw=kw) for kw in kws])
+        configs = ''.join(['    @staticmethod\n    def {kw}():\n'
+                           '        return {{\'mandatory_variables\': [\'VAR1\', \'VAR2\'],\n'
+                           '                \'optional_variables\': {{\'VAR3\': 1}},\n'
+                           '                \'iterable\': \'R\'}}\n\n'.format(kw=kw) for kw in kws])
+        datas = ''.join(['    def {kw}(self, fw):\n        pass\n\n'.format(kw=kw) for kw in kws])
+        mod_dir = _package(Path(base, 'kwmod_{}'.format(m)))
+        Path(mod_dir, 'keywords.py').write_text(KEYWORD_TEMPLATE.format(keywords=keywords, configs=configs,
+                                                                         datas=datas))
+    return base
+
+
+def make_pom_tree(name, n_screens, actions_per_screen=5):
+    base = Path(TEMP_DIR, name)
+    shutil.rmtree(base, ignore_errors=True)
+    _package(TEMP_DIR)
+    _package(base)
+    for n in range(n_screens):
+        actions = ''.join(['    def click_action_{a}(self, field_a, field_b=\'{a}\'):\n'
+                           '        """ Synthetic pom action {a}. """\n'
+                           '        return field_a, field_b\n\n'.format(a=a) for a in range(actions_per_screen)])
+        Path(base, 'screen_{}.py'.format(n)).write_text(POM_TEMPLATE.format(n=n, actions=actions))
+    return base
+
+
+def remove_tree(name):
+    path = Path(TEMP_DIR, name)
+    purge_modules(path)
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def make_env_tree(name, depth=3, n_vars=50):
+    base = Path(TEMP_DIR, name)
+    shutil.rmtree(base, ignore_errors=True)
+    _package(TEMP_DIR)
+    _package(base)
+    path = base
+    env = []
+    for level in range(depth):
+        env.append('level_{}'.format(level))
+        lines = ['VAR_{v} = {val!r}\n'.format(v=v, val='level_{l}_value_{v}'.format(l=level, v=v))
+                 for v in range(n_vars)]
+        if level == depth - 1:
+            Path(path, '{}.py'.format(env[-1])).write_text(''.join(lines))
+        else:
+            path = _package(Path(path, env[-1]))
+            Path(path, '__init__.py').write_text(''.join(lines))
+    return base, tuple(env)
+
+
+def make_csv(name, rows, sep=';', eval_indicator='ev:', chunk_size=100000):
+    _package(TEMP_DIR)
+    file = Path(TEMP_DIR, '{}.csv'.format(name))
+    statuses = ('OPEN', 'CLOSED', 'PENDING')
+    with open(file, 'w') as stream:
+        stream.write(sep.join(['ID', 'NAME', 'STATUS', 'AMOUNT', 'DATE', 'TOTAL']) + '\n')
+        for start in range(0, rows, chunk_size):
+            lines = []
+            for r in range(start, min(start + chunk_size, rows)):
+                lines.append(sep.join([str(r + 1),
+                                       'name_{}'.format(r % 1000),
+                                       statuses[r % len(statuses)],
+                                       str((r % 500) + 0.5),
+                                       'UTC 2019/{m}/{d} {h}:00:00'.format(m=r % 12 + 1, d=r % 28 + 1, h=r % 24),
+                                       '{}float(AMOUNT)*1.21'.format(eval_indicator)]) + '\n')
+            stream.write(''.join(lines))
+    return file
+
+
+def make_jsonl(name, rows, chunk_size=100000):
+    _package(TEMP_DIR)
+    file = Path(TEMP_DIR, '{}.jsonl'.format(name))
+    statuses = ('OPEN', 'CLOSED', 'PENDING')
+    with open(file, 'w') as stream:
+        for start in range(0, rows, chunk_size):
+            stream.write(''.join(json.dumps({'ID': r + 1,
+                                             'STATUS': statuses[r % len(statuses)],
+                                             'CUSTOMER': {'NAME': 'name_{}'.format(r % 1000),
+                                                          'ADDRESS': {'CITY': 'city_{}'.format(r % 50)}},
+                                             'AMOUNT': (r % 500) + 0.5}) + '\n'
+                                 for r in range(start, min(start + chunk_size, rows))))
+    return file
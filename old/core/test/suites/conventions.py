@@ -1,2 +1,35 @@
+import unittest as ut
+from fw.old.core.conventions import KeywordNameConventions, NameTranslator
+
+
 class ConventionsTests:
     pass
+
+
+class NameTranslatorTests(ut.TestCase):
+    def setUp(self):
+        self.tr = NameTranslator('({screen}) {action}', KeywordNameConventions.mapper)
+
+    def test_make_names(self):
+        self.assertEqual('_BO_screen_1_BC__click_here', self.tr.make_method_name(screen='screen_1', action='click_here'),
+                         'The method name should be made from the convention.')
+        self.assertEqual('(screen 1) click here', self.tr.make_keyword_name(screen='screen_1', action='click_here'),
+                         'The keyword name should be made from the convention.')
+
+    def test_round_trip(self):
+        method = self.tr.to_method('(screen 1) click here')
+        self.assertEqual('_BO_screen_1_BC__click_here', method, 'Keyword name should be translated.')
+        self.assertEqual('(screen 1) click here', self.tr.to_keyword(method), 'Method name should be translated.')
+
+    def test_same_as_chained_replace(self):
+        for name in ('__BO_x', '_BO_C_', 'a__BC__b', 'plain'):
+            expected = name
+            for kw_char, m_char in KeywordNameConventions.mapper.items():
+                expected = expected.replace(m_char, kw_char)
+            self.assertEqual(expected, self.tr.to_keyword(name), 'Translation should match the chained replace.')
+
+    def test_convert_name(self):
+        conv = KeywordNameConventions()
+        self.assertEqual('a_BO_b', conv.convert_name('a(b', in_name='keyword'), 'Keyword name should be converted.')
+        with self.assertRaises(ValueError):
+            conv.convert_name('a', in_name='invalid')
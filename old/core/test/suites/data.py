@@ -1,7 +1,11 @@
 import unittest as ut
 from fw import Framework
 import fw.old.core.data as dl
+from fw.old.core.test.benchmarks.data import _legacy_safe_assign
 import pandas as pd
+from pathlib import Path
+import json
+import os
 
 
 class AddSettingsTests(ut.TestCase):
@@ -66,3 +70,311 @@ class AddSettingsTests(ut.TestCase):
         self.assertDictEqual(rest_kwargs, {'Extra': 1}, 'All arguments should be consumed')
 
 
+
+
+class ReduceRowsTests(ut.TestCase):
+    def setUp(self):
+        fw = Framework(**{'--LOG_LEVEL': None})
+        self.dl = dl.DataLoader(fw)
+        self.dir = Path(Path(__file__).parents[1], 'temp')
+        self.dir.mkdir(exist_ok=True)
+        self.file = Path(self.dir, 'rows.csv')
+        sep = fw.fw_settings.CSV_SEP
+        lines = ['ID{s}AMOUNT'.format(s=sep)] + ['{r}{s}{a}'.format(r=r + 1, s=sep, a=r * 10) for r in range(10)]
+        self.file.write_text('\n'.join(lines) + '\n')
+
+    def tearDown(self):
+        self.file.unlink()
+
+    def _chunks(self, read):
+        for chunk in self.dl.iter_csv(str(self.file), chunk_size=3):
+            read.append(chunk)
+            yield chunk
+
+    def test_row_numbers(self):
+        read = []
+        data = self.dl._reduce_rows(self._chunks(read), '5,2')
+        self.assertListEqual(['5', '2'], data.ID.to_list(), 'Rows should be returned in the requested order.')
+        self.assertEqual(2, len(read), 'Reading should stop after the last requested row.')
+
+    def test_row_filter(self):
+        data = self.dl._reduce_rows(self._chunks([]), 'ev:int(AMOUNT) > 60 or ID == EXTRA', {'EXTRA': '1'})
+        self.assertListEqual(['1', '8', '9', '10'], data.ID.to_list(), 'Rows should be filtered per chunk.')
+        self.assertListEqual(['1'] * 4, data.EXTRA.to_list(), 'Extra columns should be assigned.')
+
+    def test_all_rows(self):
+        data = self.dl._reduce_rows(self._chunks([]), 'ALL')
+        self.assertEqual(10, len(data), 'All rows should be read.')
+
+    def test_no_rows(self):
+        self.file.write_text('ID;AMOUNT\n')
+        data = self.dl._reduce_rows(self._chunks([]), None)
+        self.assertListEqual(['ID', 'AMOUNT'], list(data.columns), 'A file without rows should give an empty frame.')
+        self.assertEqual(0, len(data), 'A file without rows should give an empty frame.')
+        self.assertEqual(0, len(self.dl._reduce_rows(iter([]), None)), 'No chunks should give an empty frame.')
+        for chunks in (self._chunks([]), iter([])):
+            with self.assertRaisesRegex(KeyError, r'Row\(s\) \[2\] are not in the data, it holds 0 row\(s\)'):
+                self.dl._reduce_rows(chunks, '2')
+
+    def test_missing_row(self):
+        with self.assertRaisesRegex(KeyError, r'Row\(s\) \[11\] are not in the data'):
+            self.dl._reduce_rows(self._chunks([]), '2,11')
+
+
+class DataFileCacheTests(ut.TestCase):
+    def setUp(self):
+        self.dir = Path(Path(__file__).parents[1], 'temp')
+        self.cache_dir = Path(self.dir, 'data_cache')
+        self.dir.mkdir(exist_ok=True)
+        self.file = Path(self.dir, 'cached.csv')
+        self.file.write_text('ID;AMOUNT\n' + ''.join('{r};{a}\n'.format(r=r + 1, a=r * 10) for r in range(10)))
+        self.cache = dl.DataFileCache()
+        self.parsed = 0
+
+    def tearDown(self):
+        self.cache.clear(self.cache_dir)
+        self.file.unlink()
+
+    def _reader(self):
+        self.parsed += 1
+        return pd.read_csv(self.file, sep=';', dtype=str, chunksize=3)
+
+    def _read(self, max_size=2 ** 20, options=None):
+        options = {'sep': ';'} if options is None else options
+        chunks = self.cache.chunks(self.file, options, self._reader, self.cache_dir, max_size)
+        return pd.concat(list(chunks))
+
+    def test_hit(self):
+        first = self._read()
+        second = self._read()
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(1, self.parsed, 'The file should be parsed once.')
+        self.assertEqual((1, 1), (self.cache.misses, self.cache.hits), 'One miss and one hit should be counted.')
+
+    def test_changed_file(self):
+        self._read()
+        self.file.write_text('ID;AMOUNT\n1;1\n')
+        self.assertEqual(1, len(self._read()), 'A changed file should be read again.')
+        self.assertEqual(2, self.parsed, 'The changed file should be parsed again.')
+
+    def test_options_in_key(self):
+        self._read()
+        self._read(options={'sep': ','})
+        self.assertEqual(2, self.cache.misses, 'Other read options should not use the same entry.')
+
+    def test_stopped_early(self):
+        chunks = self.cache.chunks(self.file, {}, self._reader, self.cache_dir, 2 ** 20)
+        next(chunks)
+        chunks.close()
+        self.assertListEqual([], list(self.cache_dir.glob('*')), 'A partial read should not be cached.')
+        self.assertEqual(10, len(self._read(options={})), 'The file should be read again.')
+        self.assertEqual(2, self.parsed, 'The file should be parsed again.')
+
+    @ut.skipUnless(hasattr(os, 'getuid'), 'File ownership is only checked on posix systems.')
+    def test_untrusted_directory(self):
+        self._read()
+        self.cache_dir.chmod(0o777)
+        try:
+            self._read()
+        finally:
+            self.cache_dir.chmod(0o700)
+        self.assertEqual(2, self.parsed, 'A directory that others can write should not be used.')
+
+    @ut.skipUnless(hasattr(os, 'getuid'), 'File ownership is only checked on posix systems.')
+    def test_untrusted_entry(self):
+        self._read()
+        for entry in self.cache_dir.glob('*.pkl'):
+            entry.chmod(0o666)
+        self._read()
+        self._read()
+        self.assertEqual(2, self.parsed, 'An entry that others can write should be replaced.')
+        self.assertEqual(1, self.cache.hits, 'The replaced entry should be used.')
+
+    def test_eviction(self):
+        self._read()
+        self._read(max_size=0, options={'sep': ','})
+        self.assertEqual(0, len(list(self.cache_dir.glob('*.pkl'))), 'Entries above the size cap should be evicted.')
+
+
+class JsonDataTests(ut.TestCase):
+    def setUp(self):
+        fw = Framework(**{'--LOG_LEVEL': None, '--DATA_CACHE_DIR': ''})
+        self.dl = dl.DataLoader(fw)
+        self.dir = Path(Path(__file__).parents[1], 'temp')
+        self.dir.mkdir(exist_ok=True)
+        self.records = [{'ID': r + 1, 'USER': {'NAME': 'user_{}'.format(r), 'ROLE': {'ID': r % 2}}} for r in range(10)]
+        self.file = Path(self.dir, 'data.jsonl')
+        self.file.write_text(''.join(json.dumps(rec) + '\n' for rec in self.records))
+
+    def tearDown(self):
+        self.file.unlink()
+
+    def test_flattened(self):
+        data = self.dl.load_json(self.file)
+        self.assertListEqual(['ID', 'USER.NAME', 'USER.ROLE.ID'], list(data.columns), 'Objects should be flattened.')
+        self.assertEqual(10, len(data), 'All rows should be read.')
+
+    def test_chunks(self):
+        chunks = list(self.dl.iter_json(self.file, chunk_size=4))
+        self.assertListEqual([4, 4, 2], [len(c) for c in chunks], 'The file should be read in chunks.')
+        self.assertListEqual([8, 9], list(chunks[-1].index), 'Chunks should be numbered like the rows.')
+
+    def test_json_array(self):
+        array_file = Path(self.dir, 'data.json')
+        array_file.write_text(json.dumps(self.records, indent=2))
+        try:
+            pd.testing.assert_frame_equal(self.dl.load_json(self.file), self.dl.load_json(array_file))
+        finally:
+            array_file.unlink()
+
+    def test_rows(self):
+        data = self.dl.get_data(None, DATA_FILE=str(self.file), ROWS='9,2')
+        self.assertListEqual([9, 2], data.ID.to_list(), 'Rows should be selected from the json file.')
+
+    def test_sniffing(self):
+        sniffed = Path(self.dir, 'data')
+        sniffed.write_text(self.file.read_text())
+        try:
+            self.assertEqual('json', self.dl._data_file_type(sniffed), 'Json content should be recognized.')
+            self.assertEqual('csv', self.dl._data_file_type(self.file.with_suffix('.csv')),
+                             'The extension should decide first.')
+        finally:
+            sniffed.unlink()
+
+
+class RowIndexTests(ut.TestCase):
+    def setUp(self):
+        self.dir = Path(Path(__file__).parents[1], 'temp')
+        self.cache_dir = Path(self.dir, 'index_cache')
+        self.dir.mkdir(exist_ok=True)
+        self.file = Path(self.dir, 'indexed.csv')
+        self.file.write_bytes(b'ID;NAME\r\n1;a\r\n\r\n2;"b;c"\r\n3;d')
+        self.index = dl.RowIndex()
+
+    def tearDown(self):
+        self.file.unlink()
+        for file in self.cache_dir.glob('*'):
+            file.unlink()
+
+    def test_read(self):
+        content = self.index.read(self.file, [2, 0], self.cache_dir)
+        self.assertEqual(b'ID;NAME\r\n3;d\n1;a\r\n', content, 'Only the header and the rows should be read.')
+
+    def test_built_once(self):
+        self.index.read(self.file, [0], self.cache_dir)
+        dl.RowIndex().read(self.file, [1], self.cache_dir)
+        self.assertEqual(1, self.index.built, 'The index should be built once.')
+        self.assertEqual(1, len(list(self.cache_dir.glob('*.idx.npy'))), 'The index should be stored.')
+
+    def test_missing_row(self):
+        with self.assertRaises(KeyError):
+            self.index.read(self.file, [3], self.cache_dir)
+
+    def test_blank_lines(self):
+        self.file.write_bytes(b'A;B\n1;x\n   \n \t\r\n  2;y\n')
+        self.assertEqual(b'A;B\n  2;y\n', self.index.read(self.file, [1], self.cache_dir),
+                         'Lines with only whitespace should not be rows.')
+        with self.assertRaises(KeyError):
+            self.index.read(self.file, [2], self.cache_dir)
+
+    def test_blank_line_rows(self):
+        self.file.write_bytes(b'A;B\n1;x\n   \n2;y\n')
+        loader = dl.DataLoader(Framework(**{'--LOG_LEVEL': None, '--DATA_CACHE_DIR': str(self.cache_dir)}))
+        self.assertListEqual(['y'], loader.get_data(None, DATA_FILE=str(self.file), ROWS='2').B.to_list(),
+                             'Rows should be numbered like the csv reader does.')
+        with self.assertRaises(KeyError):
+            loader.get_data(None, DATA_FILE=str(self.file), ROWS='3')
+
+    def test_quoted_line_break(self):
+        self.file.write_bytes(b'ID;NAME\n1;"a\nb"\n')
+        self.assertIsNone(self.index.read(self.file, [0], self.cache_dir), 'Rows spanning lines cannot be indexed.')
+
+
+class SafeAssignTests(ut.TestCase):
+    def setUp(self):
+        fw = Framework(**{'--LOG_LEVEL': None})
+        self.spec = fw.fw_settings.DEFAULT_SPECIFIER
+        self.lib = dl.DataLibrary(fw)
+        self.data = pd.DataFrame({'A': [self.spec, 'x', self.spec], 'B': [self.spec] * 3, 'C': [1, 2, 3]})
+
+    def test_defaults_replaced(self):
+        result = self.lib.safe_assign(self.data, A='new', B=[1, 2, 3], C=0, D='added')
+        self.assertListEqual(['new', 'x', 'new'], result.A.to_list(), 'Only default cells should be replaced.')
+        self.assertListEqual([1, 2, 3], result.B.to_list(), 'Lists should be assigned per row.')
+        self.assertEqual('int64', str(result.B.dtype), 'Fully replaced columns should get the new dtype.')
+        self.assertListEqual([1, 2, 3], result.C.to_list(), 'Columns without defaults should be kept.')
+        self.assertListEqual(['added'] * 3, result.D.to_list(), 'New columns should be added.')
+        self.assertEqual(self.spec, self.data.A[0], 'The given frame should not be changed.')
+
+    def test_aligned_series(self):
+        result = self.lib.safe_assign(self.data, A=pd.Series(['c', 'b', 'a'], index=[2, 1, 0]))
+        self.assertListEqual(['a', 'x', 'c'], result.A.to_list(), 'Series should be aligned on the index.')
+
+    def test_wide_frame(self):
+        data = pd.DataFrame({'COL_{}'.format(c): [self.spec if r % 2 else 'v' for r in range(10)] for c in range(60)})
+        values = [1, 2.5, pd.Timestamp('2019-01-01', tz='UTC'), list(range(10)), None, 'new']
+        edits = {'COL_{}'.format(c): values[c % len(values)] for c in range(0, 60, 2)}
+        pd.testing.assert_frame_equal(_legacy_safe_assign(self.spec, data, **edits),
+                                      self.lib.safe_assign(data, **edits), check_like=True)
+
+    def test_inplace(self):
+        result = self.lib.safe_assign(self.data, inplace=True, A='new', D='added')
+        self.assertIs(self.data, result, 'The frame itself should be returned.')
+        self.assertListEqual(['new', 'x', 'new'], self.data.A.to_list(), 'The frame itself should be changed.')
+        self.assertIn('D', self.data.columns, 'New columns should be added to the frame itself.')
+
+    def test_series(self):
+        row = pd.Series({'A': self.spec, 'B': 'b'}, name=4)
+        result = self.lib.safe_assign(row, A=1, B=2, C=3)
+        self.assertDictEqual({'A': 1, 'B': 'b', 'C': 3}, result.to_dict(), 'Defaults should be replaced and new '
+                                                                               'values added.')
+        self.assertEqual(4, result.name, 'The name of the series should be kept.')
+        self.assertEqual(self.spec, row.A, 'The given series should not be changed.')
+
+
+class ColumnSchemaTests(ut.TestCase):
+    def setUp(self):
+        fw = Framework(**{'--LOG_LEVEL': None, '--DATA_CACHE_DIR': '', '--CSV_CHUNK_SIZE': 3})
+        self.dl = dl.DataLoader(fw)
+        self.dir = Path(Path(__file__).parents[1], 'temp')
+        self.dir.mkdir(exist_ok=True)
+        self.file = Path(self.dir, 'typed.csv')
+        self.file.write_text('ID;AMOUNT;ACTIVE;STATUS;DATE;NAME\n' +
+                             ''.join('{i};{a};{b};{s};2019-01-{d:02d} 10:00;name_{i}\n'
+                                     .format(i=i, a='' if i == 4 else i + 0.5, b=('yes', 'no')[i % 2],
+                                             s=('OPEN', 'CLOSED', 'PENDING', 'NEW')[i // 3 % 4], d=i + 1)
+                                     for i in range(10)))
+        self.schema = dl.ColumnSchema({'id': 'int', 'AMOUNT': 'float32', 'ACTIVE': 'bool', 'STATUS': 'category',
+                                       'DATE': {'type': 'datetime', 'format': '%Y-%m-%d %H:%M', 'tz': 'CET'}})
+
+    def tearDown(self):
+        self.file.unlink()
+
+    def _read(self, rows=None):
+        return self.dl._reduce_rows(self.dl._read_csv_file(self.file, rows, self.schema), rows)
+
+    def test_dtypes(self):
+        data = self._read()
+        self.assertDictEqual({'ID': 'int64', 'AMOUNT': 'float32', 'ACTIVE': 'bool', 'STATUS': 'category',
+                              'DATE': 'datetime64[ns, UTC]', 'NAME': 'object'}, data.dtypes.astype(str).to_dict(),
+                             'Declared columns should be typed, the others should stay strings.')
+        self.assertEqual(['CLOSED', 'NEW', 'OPEN', 'PENDING'], sorted(data.STATUS.cat.categories),
+                         'Categories of all chunks should be combined.')
+        self.assertEqual(pd.Timestamp('2019-01-01 09:00', tz='UTC'), data.DATE[0], 'Dates should be converted to UTC.')
+        self.assertTrue(pd.isna(data.AMOUNT[4]), 'Empty cells should be missing values.')
+
+    def test_rows(self):
+        data = self._read('ev:AMOUNT > 6 and ACTIVE')
+        self.assertListEqual([6, 8], data.ID.to_list(), 'Filters should work on the typed columns.')
+
+    def test_invalid_values(self):
+        with self.assertRaisesRegex(ValueError, 'Column "NAME" cannot be read as int'):
+            dl.ColumnSchema({'NAME': 'int'}).apply(self.dl.load_csv(self.file))
+
+    def test_invalid_type(self):
+        with self.assertRaises(ValueError):
+            dl.ColumnSchema({'ID': 'decimal'})
+
+    def test_untyped(self):
+        data = self.dl.get_data(None, DATA_FILE=str(self.file))
+        self.assertEqual('object', str(data.ID.dtype), 'Without a schema all columns should stay strings.')
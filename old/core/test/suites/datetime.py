@@ -1,7 +1,9 @@
 import unittest as ut
 import datetime as dt
+import warnings
 import fw.old.core.datetime as fw_dt
 import pytz
+import pandas as pd
 
 
 class MakeDateTests(ut.TestCase):
@@ -174,3 +176,94 @@ class MakeDateRangeTests(ut.TestCase):
     def test_negative_no_till_nor_through(self):
         with self.assertRaises(AssertionError):
             self.dp.make_date_range('UTC 2019/01/01')
+
+
+class MakeDateFrameTests(ut.TestCase):
+    def setUp(self):
+        self.dp = fw_dt.DateParser()
+        self.data = pd.DataFrame({'ABS': ['UTC 2019/01/01 00:00:00', 'UTC 2019/01/02 01:00:00', 'CET 2019/2/1 00:00:00'],
+                                  'MIXED': ['UTC 2019/01/01', 'no date', 'UTC +0/+0/+0 +0:+0:+0'],
+                                  'TEXT': ['1.5', 'a b', 'Mon 2019/1/1'],
+                                  'NUM': [1, 2, 3]})
+
+    def _per_cell(self, tz_out):
+        return pd.DataFrame({col: [self.dp.make_date_or_return(v, tz_out=tz_out) if isinstance(v, str) else v
+                                   for v in self.data[col]] for col in self.data}, index=self.data.index)
+
+    def test_same_as_per_cell(self):
+        for tz_out in ('UTC', 'CET'):
+            result = self.dp.make_date_frame_or_return(self.data, tz_out=tz_out)
+            expected = self._per_cell(tz_out)
+            for col in ('ABS', 'TEXT', 'NUM'):
+                self.assertListEqual(list(expected[col]), list(result[col]), 'Column should be converted equally.')
+            self.assertEqual(expected['MIXED'][1], result['MIXED'][1], 'Non dates should be returned.')
+            self.assertEqual(str(tz_out), str(result['ABS'][0].tzinfo), 'The output timezone should be used.')
+
+    def test_no_future_warnings(self):
+        column = pd.Series(['UTC 2019/01/01', 'UTC +1/+2/+3', 'CET 2019/2/1 01:02:03'], dtype=object)
+        parts = column.str.extract(self.dp._absolute_pattern)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', FutureWarning)
+            for (tz_name, _), group in parts.groupby([parts['tz'], parts['hour'].isna()], sort=False):
+                converted = self.dp._convert_absolute(group, tz_name, 'UTC')
+                self.assertEqual(len(group), len(converted), 'All dates should be converted column wise.')
+            result = self.dp.make_date_column_or_return(column)
+        self.assertEqual(dt.datetime(2019, 2, 1, 0, 2, 3, tzinfo=pytz.utc), result[2], 'Dates should be converted.')
+
+    def test_untouched_columns(self):
+        result = self.dp.make_date_frame_or_return(self.data)
+        self.assertIs(result['TEXT'].dtype, self.data['TEXT'].dtype, 'Columns without dates keep their type.')
+        self.assertEqual('UTC 2019/01/01 00:00:00', self.data['ABS'][0], 'The input should not be changed.')
+
+
+class RunClockTests(ut.TestCase):
+    def setUp(self):
+        self.clock = fw_dt.RunClock()
+        self.dp = fw_dt.DateParser(clock=self.clock)
+
+    def test_frozen_relative_date(self):
+        with self.clock.frozen(dt.datetime(2020, 5, 5, 10, 30, 0)):
+            date_dt = self.dp.make_date('UTC +0/+0/-1 +0:+0:+0')
+        self.assertEqual(dt.datetime(2020, 5, 4, 10, 30, 0, tzinfo=pytz.utc), date_dt,
+                         'The relative date should be resolved against the frozen clock.')
+
+    def test_frozen_from_string(self):
+        with self.clock.frozen('2020/05/05 10:30:00') as now:
+            self.assertEqual(dt.datetime(2020, 5, 5, 10, 30, 0), now, 'The clock should be frozen at the given time.')
+            self.assertEqual(now, self.clock.now(), 'The frozen time should be returned.')
+        self.assertFalse(self.clock.is_frozen(), 'The clock should be released afterwards.')
+
+    def test_nested_freeze_keeps_instant(self):
+        with self.clock.frozen() as outer:
+            with self.clock.frozen() as inner:
+                self.assertEqual(outer, inner, 'A nested freeze should keep the outer instant.')
+
+    def test_timezone_cache(self):
+        self.assertIs(fw_dt.get_timezone('CET'), fw_dt.get_timezone('CET'), 'Timezones should be cached.')
+
+
+class DateRangeChunkTests(ut.TestCase):
+    def setUp(self):
+        self.dp = fw_dt.DateParser()
+
+    def test_chunks(self):
+        rng = self.dp.make_date_range('UTC 2019/01/01', till_date='UTC 2019/01/02', unit='minute', chunk_size=100)
+        chunks = list(rng.chunks())
+        self.assertEqual(1440, len(rng), 'The length should be known without generating the range.')
+        self.assertEqual(15, len(chunks), 'The range should be split in blocks of 100.')
+        self.assertEqual(list(rng), [d for c in chunks for d in c.to_pydatetime()], 'Blocks should match the range.')
+
+    def test_to_index(self):
+        rng = self.dp.make_date_range('UTC 2019/01/01', through_date='UTC 2019/01/05', unit='day')
+        idx = rng.to_index()
+        self.assertEqual(5, len(idx), 'All dates should be in the index.')
+        self.assertEqual('UTC', str(idx.tz), 'The index should be timezone aware.')
+
+    def test_month_chunks(self):
+        rng = self.dp.make_date_range('UTC 2019/01/31', through_date='UTC 2019/05/31', unit='month', chunk_size=2)
+        self.assertEqual([2, 2, 1], [len(c) for c in rng.chunks()], 'Month ranges should be chunked as well.')
+        self.assertEqual(28, rng[1].day, 'Months should be stepped like before.')
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            self.dp.make_date_range('UTC 2019/01/01', through_date='UTC 2019/01/05', size=0, unit='day')
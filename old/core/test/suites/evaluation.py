@@ -0,0 +1,119 @@
+import unittest as ut
+import fw.old.core.evaluation as ev
+import pandas as pd
+
+
+class CompileExpressionTests(ut.TestCase):
+    def test_free_names(self):
+        expr = ev.compile_expression('A + len(B) + sum(x for x in C)')
+        self.assertEqual(frozenset({'A', 'B', 'C'}), expr.names, 'Only free, non-builtin names should be listed.')
+
+    def test_lambda_arguments(self):
+        expr = ev.compile_expression('(lambda y: y * A)(2)')
+        self.assertEqual(frozenset({'A'}), expr.names, 'Lambda arguments should not be listed.')
+
+    def test_cached(self):
+        self.assertIs(ev.compile_expression('1 + 1'), ev.compile_expression('1 + 1'),
+                      'The same expression should be compiled once.')
+
+    def test_syntax_error(self):
+        with self.assertRaises(SyntaxError):
+            ev.compile_expression('1 +')
+
+
+class OrderColumnsTests(ut.TestCase):
+    def test_order(self):
+        order = ev.order_columns({'A': {'B'}, 'B': {'C'}, 'C': set(), 'D': {'A'}})
+        self.assertEqual(('C', 'B', 'A', 'D'), order, 'Dependencies should be evaluated first.')
+
+    def test_cycle(self):
+        with self.assertRaisesRegex(ValueError, r'A -> B -> A\.'):
+            ev.order_columns({'A': {'B'}, 'B': {'A'}})
+
+
+class EvaluatorTests(ut.TestCase):
+    def setUp(self):
+        self.ev = ev.Evaluator('ev:')
+
+    def test_row(self):
+        row = {'A': 'ev:B * 2', 'B': 'ev:int(C) + 1', 'C': '3'}
+        self.assertDictEqual({'A': 8, 'B': 4}, self.ev.evaluate_row(row), 'Dependent columns should be evaluated.')
+
+    def test_cycle(self):
+        with self.assertRaises(ValueError):
+            self.ev.evaluate_row({'A': 'ev:B', 'B': 'ev:A'})
+
+    def test_unknown_name(self):
+        with self.assertRaises(NameError):
+            self.ev.evaluate_row({'A': 'ev:UNKNOWN'})
+
+    def test_single_expression(self):
+        row = {'A': 'ev:int(B) * 2', 'B': '2'}
+        self.assertTrue(self.ev.evaluate('ev:A == 4', row), 'Referenced columns should be evaluated.')
+        self.assertEqual('plain', self.ev.evaluate('plain', row), 'Plain values should be returned as is.')
+
+    def test_frame(self):
+        data = pd.DataFrame({'A': ['1', '2'], 'B': ['ev:int(A) * 10', 'x'], 'C': ['ev:B + 1', 'ev:A + B']})
+        result = self.ev.evaluate_frame(data)
+        self.assertListEqual([10, 'x'], result['B'].to_list(), 'Only expressions should be evaluated.')
+        self.assertListEqual([11, '2x'], result['C'].to_list(), 'Expressions should see evaluated values.')
+        self.assertEqual('ev:int(A) * 10', data['B'][0], 'The original frame should not be changed.')
+
+
+class EvaluateColumnTests(ut.TestCase):
+    def setUp(self):
+        self.ev = ev.Evaluator('ev:')
+        self.data = pd.DataFrame({'A': ['1.5', '2', '0'], 'B': ['x', 'y', 'z']})
+
+    def test_same_result_as_rows(self):
+        for expression in ('float(A) * 2', 'B.upper() + A', 'float(A) > 1 and B', '"a" if B == "x" else A[0:1]',
+                           'B in ("x", "z")', 'len(B) + 1', '0 < float(A) < 2'):
+            data = self.data.assign(C=['ev:' + expression] * 3)
+            expected = [self.ev.evaluate_row({'A': a, 'B': b, 'C': c})['C'] for a, b, c in data.to_numpy()]
+            result = self.ev.evaluate_frame(data)['C'].to_list()
+            self.assertListEqual(expected, result, 'Column evaluation of "{}" should match rows.'.format(expression))
+
+    def test_evaluated_per_column(self):
+        arrays = {col: self.data[col].to_numpy(dtype=object) for col in self.data.columns}
+        result = ev.evaluate_column(ev.compile_expression('B * 2'), arrays, 3)
+        self.assertListEqual(['xx', 'yy', 'zz'], list(result), 'The expression should be evaluated at once.')
+        self.assertIsNone(ev.evaluate_column(ev.compile_expression('[x for x in B]'), arrays, 3),
+                          'Comprehensions should be left to the row by row evaluation.')
+
+    def test_fallback_on_error(self):
+        data = self.data.assign(C=['ev:1 / float(A)'] * 3)
+        with self.assertRaises(ZeroDivisionError):
+            self.ev.evaluate_frame(data)
+
+    def test_dependent_columns(self):
+        data = self.data.assign(C=['ev:D + "!"'] * 3, D=['ev:B * 2', 'ev:B', 'ev:B * 3'])
+        result = self.ev.evaluate_frame(data)
+        self.assertListEqual(['xx!', 'y!', 'zzz!'], result['C'].to_list(),
+                             'Columns depending on row by row columns should be evaluated per row.')
+
+
+class EvaluateMaskTests(ut.TestCase):
+    def setUp(self):
+        self.ev = ev.Evaluator('ev:')
+        self.data = pd.DataFrame({'STATUS': ['OPEN', 'CLOSED', 'OPEN', 'OPEN'],
+                                  'AMOUNT': ['150', '200', '50', 'ev:int(BASE) * 2'],
+                                  'BASE': ['0', '0', '0', '100'],
+                                  'RATE': [0.5, 1.5, 2.5, float('nan')]})
+
+    def test_mask(self):
+        mask = self.ev.evaluate_mask('ev:STATUS == "OPEN" and RATE > 1 or not STATUS == "OPEN"', self.data)
+        self.assertListEqual([False, True, True, False], mask.tolist(), 'Boolean operators should apply per row.')
+
+    def test_referenced_expressions(self):
+        mask = self.ev.evaluate_mask('ev:STATUS == "OPEN" and float(AMOUNT) > 100', self.data)
+        self.assertListEqual([True, False, False, True], mask.tolist(), 'Referenced expressions should be evaluated.')
+
+    def test_row_fallback(self):
+        mask = self.ev.evaluate_mask('ev:any(c == "O" for c in STATUS[0:1])', self.data)
+        self.assertListEqual([True, False, True, True], mask.tolist(), 'Other expressions should be evaluated per row.')
+
+    def test_native_columns(self):
+        arrays = {'RATE': ev.column_array(self.data.RATE)}
+        result = ev.evaluate_column(ev.compile_expression('RATE * 2 > 2'), arrays, 4, as_objects=False)
+        self.assertEqual(bool, result.dtype, 'Float columns should be compared natively.')
+        self.assertListEqual([False, True, True, False], result.tolist(), 'Missing values should compare like floats.')
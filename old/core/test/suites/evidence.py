@@ -0,0 +1,71 @@
+import unittest as ut
+from fw import Framework
+import fw.old.core.evidence as ev
+from pathlib import Path
+import shutil
+import zipfile
+
+
+class EvidenceArchiverTests(ut.TestCase):
+    def setUp(self):
+        self.dir = Path(Path(__file__).parents[1], 'temp', 'evidence')
+        self.loc = Path(self.dir, 'test_a')
+        Path(self.loc, 'api').mkdir(parents=True, exist_ok=True)
+        Path(self.loc, 'screen.png').write_bytes(b'png' * 1000)
+        Path(self.loc, 'api', 'response.json').write_text('{"a": 1}' * 1000)
+        self.fw = Framework(**{'--LOG_LEVEL': None})
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_archive(self):
+        archive = Path(self.dir, 'a.zip')
+        with ev.EvidenceArchiver(archive, self.loc, self.fw.fw_settings) as archiver:
+            archiver.add(Path(self.loc, 'screen.png'))
+            archiver.add_data('api/request.json', '{"b": 2}')
+            archiver.flush()
+            archiver.add_dir()
+        with zipfile.ZipFile(archive) as zf:
+            infos = {i.filename: i for i in zf.infolist()}
+            self.assertListEqual(['screen.png', 'api/request.json', 'api/response.json'], list(infos),
+                                 'Evidence should be archived once, in order, by its relative name.')
+            self.assertEqual(zipfile.ZIP_STORED, infos['screen.png'].compress_type, 'Images should be stored.')
+            self.assertEqual(zipfile.ZIP_DEFLATED, infos['api/response.json'].compress_type,
+                             'Other files should be compressed.')
+            self.assertEqual('{"b": 2}', zf.read('api/request.json').decode(), 'Data should be archived.')
+
+    def test_compression_types(self):
+        self.fw.fw_settings['EVIDENCE_COMPRESSION_TYPES'] = {'json': ['lzma', None], '.png': 'bzip2'}
+        archive = Path(self.dir, 'b.zip')
+        with ev.EvidenceArchiver(archive, self.loc, self.fw.fw_settings) as archiver:
+            archiver.add_dir()
+        with zipfile.ZipFile(archive) as zf:
+            self.assertEqual(zipfile.ZIP_LZMA, zf.getinfo('api/response.json').compress_type,
+                             'The compression should be set per file type.')
+            self.assertEqual(zipfile.ZIP_BZIP2, zf.getinfo('screen.png').compress_type,
+                             'The compression should be set per file type.')
+
+    def test_invalid_compression(self):
+        self.fw.fw_settings['EVIDENCE_COMPRESSION'] = 'rar'
+        with self.assertRaises(ValueError):
+            ev.EvidenceArchiver(Path(self.dir, 'c.zip'), self.loc, self.fw.fw_settings)
+
+    def test_errors(self):
+        archiver = ev.EvidenceArchiver(Path(self.dir, 'd.zip'), self.loc, self.fw.fw_settings)
+        archiver.add(Path(self.loc, 'missing.png'))
+        with self.assertRaises(FileNotFoundError):
+            archiver.flush()
+        archiver.close()
+        with self.assertRaises(RuntimeError):
+            archiver.add(Path(self.loc, 'screen.png'))
+
+    def test_test_run(self):
+        archiver = self.fw.start_test('a', str(self.loc))
+        archiver.add_data('steps.txt', 'step 1')
+        archive = self.fw.finish_test('a', str(self.loc))
+        self.assertFalse(self.loc.exists(), 'The evidence directory should be removed.')
+        self.assertEqual(self.dir, archive.parent, 'The archive should be next to the evidence directory.')
+        self.assertTrue(archive.name.startswith('testcase_a_'), 'The archive should be named by the settings.')
+        with zipfile.ZipFile(archive) as zf:
+            self.assertSetEqual({'steps.txt', 'screen.png', 'api/response.json'}, set(zf.namelist()),
+                                'All evidence of the test should be archived.')
@@ -0,0 +1,196 @@
+import asyncio
+import time
+import unittest as ut
+import fw.old.core.execution as ex
+import fw.old.core.keyword as kw
+import pandas as pd
+from pathlib import Path
+import shutil
+from fw import Framework
+
+ROW_KEYWORDS = '''
+import threading
+
+
+class Keywords:
+    def row_check(self, fw):
+        if fw.DATA.VALUE.iloc[0] == 'fail':
+            raise ValueError('Row failed.')
+        fw.DATA = fw.DATA.assign(CHECKED=fw.fw_settings.SEEN + '!')
+        return fw.DATA.VALUE.iloc[0], threading.get_ident()
+
+
+class Config:
+    @staticmethod
+    def row_check():
+        return {'mandatory_variables': ['value'],
+                'iterable': 'R'}
+
+
+class Data:
+    def row_check(self, fw):
+        fw.fw_settings['SEEN'] = fw.DATA.VALUE.iloc[0]
+'''
+
+ASYNC_KEYWORDS = '''
+import asyncio
+
+running = []
+
+
+class Keywords:
+    async def wait_check(self, fw):
+        running.append(1)
+        await asyncio.sleep(0.05)
+        running.pop()
+        return fw.fw_settings.SEEN, len(running) + 1
+
+    def plain_check(self, fw):
+        return fw.DATA.VALUE.iloc[0]
+
+
+class Config:
+    @staticmethod
+    def wait_check():
+        return {'mandatory_variables': ['value'],
+                'iterable': None}
+
+    @staticmethod
+    def plain_check():
+        return {'mandatory_variables': ['value'],
+                'iterable': None}
+
+
+class Data:
+    async def wait_check(self, fw):
+        await asyncio.sleep(0)
+        fw.fw_settings['SEEN'] = fw.DATA.VALUE.iloc[0]
+
+    def plain_check(self, fw):
+        pass
+'''
+
+
+class RowExecutorTests(ut.TestCase):
+    def setUp(self):
+        self.kw_dir = Path(*Path(__file__).parts[0:-2], 'temp', 'row_keywords')
+        for mod, source in (('rowmod', ROW_KEYWORDS), ('asyncmod', ASYNC_KEYWORDS)):
+            Path(self.kw_dir, mod).mkdir(parents=True, exist_ok=True)
+            Path(self.kw_dir, mod, '__init__.py').touch()
+            Path(self.kw_dir, mod, 'keywords.py').write_text(source)
+        Path(self.kw_dir.parent, '__init__.py').touch()
+        Path(self.kw_dir, '__init__.py').touch()
+        kw.set_keyword_sources(kw.ExtendedKeywords(kw_dirs=[self.kw_dir]), kw.PageObjectModelKeywords())
+        self.fw = Framework(**{'--LOG_LEVEL': None, '--SEEN': 'none'})
+        self.data = pd.DataFrame({'VALUE': ['v{}'.format(i) for i in range(20)]}, index=range(100, 120))
+
+    def tearDown(self):
+        kw.set_keyword_sources()
+        shutil.rmtree(self.kw_dir)
+
+    def test_row_iterable(self):
+        self.assertTrue(ex.RowExecutor.is_row_iterable('row_check'), 'Keywords with iterable R should be iterable.')
+
+    def test_rows_in_order(self):
+        for mode in ('serial', 'thread'):
+            results = ex.RowExecutor(self.fw, mode=mode, workers=4).run('row_check', self.data)
+            self.assertListEqual(self.data.VALUE.to_list(), [r[0] for r in results], 'Results should be in row '
+                                                                                      'order ({}).'.format(mode))
+            self.assertListEqual(self.data.index.to_list(), self.fw.DATA.index.to_list(), 'Row data should be '
+                                                                                            'aggregated in order.')
+            self.assertListEqual([v + '!' for v in self.data.VALUE], self.fw.DATA.CHECKED.to_list(),
+                                 'Every row should have seen its own settings.')
+        self.assertEqual('none', self.fw.fw_settings.SEEN, 'Rows should not change the framework settings.')
+
+    def test_threads(self):
+        results = ex.RowExecutor(self.fw, mode='thread', workers=4).run('row_check', self.data)
+        self.assertGreater(len({r[1] for r in results}), 1, 'Rows should be spread over threads.')
+
+    def test_processes(self):
+        results = ex.RowExecutor(self.fw, mode='process', workers=2).run('row_check', self.data)
+        self.assertListEqual(self.data.VALUE.to_list(), [r[0] for r in results], 'Results should be in row order.')
+        self.assertListEqual([v + '!' for v in self.data.VALUE], self.fw.DATA.CHECKED.to_list(),
+                             'Row data should be returned from the processes.')
+
+    def test_fail_fast(self):
+        self.data.loc[105, 'VALUE'] = 'fail'
+        for mode in ('serial', 'thread'):
+            with self.assertRaisesRegex(ValueError, 'Row failed'):
+                ex.RowExecutor(self.fw, mode=mode, workers=4, fail_fast=True).run('row_check', self.data)
+
+    def test_collect_all(self):
+        self.data.loc[[105, 110], 'VALUE'] = 'fail'
+        with self.assertRaisesRegex(RuntimeError, r'2 of 20 rows \(105, 110\)'):
+            ex.RowExecutor(self.fw, mode='thread', workers=4, fail_fast=False).run('row_check', self.data)
+        self.assertEqual(20, len(self.fw.ROW_RESULTS), 'All rows should have run.')
+        self.assertIsInstance(self.fw.ROW_RESULTS[5], ValueError, 'Failed rows should hold their error.')
+        self.assertEqual('v19', self.fw.ROW_RESULTS[19][0], 'Other rows should hold their result.')
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            ex.RowExecutor(self.fw, mode='fibers')
+
+    def test_fail_fast_setting(self):
+        for val, expected in (('no', False), ('False', False), ('yes', True), (True, True)):
+            self.fw.fw_settings['ROW_FAIL_FAST'] = val
+            self.assertEqual(expected, ex.RowExecutor(self.fw).fail_fast,
+                             'ROW_FAIL_FAST "{}" should be parsed as yes or no.'.format(val))
+
+    def test_timing(self):
+        self.fw.fw_settings['TIMING'] = True
+        ex.stage_timer.reset()
+        ex.Runner(self.fw).run_kw('plain_check', [], {'value': 'a'})
+        stages = ex.stage_timer.summary()['plain_check']
+        ex.stage_timer.reset()
+        self.assertTrue({'get_data', 'read', 'validate_data', 'data', 'keyword'} <= set(stages),
+                        'All stages of the keyword call should be timed.')
+
+    def test_timing_off(self):
+        ex.stage_timer.reset()
+        for val in ('no', 'False'):
+            # as stored by a keyword call with --TIMING from Robot.
+            self.fw.fw_settings['TIMING'] = val
+            ex.Runner(self.fw).run_kw('plain_check', [], {'value': 'a'})
+        self.assertDictEqual({}, ex.stage_timer.summary(), 'Timing should be off for "no" and "False".')
+
+    def test_profile(self):
+        self.fw.fw_settings['PROFILE'] = 'cprofile'
+        self.fw.fw_settings['LOG_LOC'] = str(Path(self.kw_dir.parent, 'profiled'))
+        ex.keyword_profiler.reset()
+        ex.Runner(self.fw).run_kw('plain_check', [], {'value': 'a'})
+        files = list(Path(self.kw_dir.parent, 'profiled', 'profiles').glob('profile_plain_check_*.pstats'))
+        ex.keyword_profiler.reset()
+        shutil.rmtree(Path(self.kw_dir.parent, 'profiled'))
+        self.assertEqual(1, len(files), 'The keyword call should be profiled.')
+
+    def test_run_kw(self):
+        self.fw.fw_settings['ROW_EXECUTOR'] = 'thread'
+        results = ex.Runner(self.fw).run_kw('row_check', [], {'data': self.data})
+        self.assertEqual(20, len(results), 'The keyword should have run once per row.')
+
+
+class AsyncKeywordTests(ut.TestCase):
+    setUp = RowExecutorTests.setUp
+    tearDown = RowExecutorTests.tearDown
+
+    def test_sync_call(self):
+        self.assertEqual(('a', 1), self.fw.run_keyword('wait_check', [], {'value': 'a'}),
+                         'Coroutine keywords should be run on the framework loop.')
+
+    def test_fan_out(self):
+        self.fw.fw_settings['ASYNC_CONCURRENCY'] = 4
+
+        async def fan_out():
+            return await asyncio.gather(*[self.fw.arun_keyword('wait_check', [], {'value': str(i)})
+                                          for i in range(12)])
+        start = time.perf_counter()
+        results = asyncio.run(fan_out())
+        self.assertLess(time.perf_counter() - start, 12 * 0.05, 'Keywords should run concurrently.')
+        self.assertListEqual([str(i) for i in range(12)], [r[0] for r in results], 'Every keyword should have '
+                                                                                    'its own data and settings.')
+        self.assertLessEqual(max(r[1] for r in results), 4, 'The concurrency limit should be respected.')
+        self.assertEqual('none', self.fw.fw_settings.SEEN, 'The framework settings should not be changed.')
+
+    def test_sync_keyword(self):
+        self.assertEqual('b', asyncio.run(self.fw.arun_keyword('plain_check', [], {'value': 'b'})),
+                         'Plain keywords should be awaitable too.')
@@ -0,0 +1,45 @@
+import unittest as ut
+from pathlib import Path
+import fw.old.core.introspection as ins
+
+
+class StaticKeywordModuleTest(ut.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(*Path(__file__).parts[0:-2], 'temp')
+        self.temp_dir.mkdir(exist_ok=True)
+        self.file = Path(self.temp_dir, 'static_keywords.py')
+
+    def tearDown(self):
+        if self.file.exists():
+            self.file.unlink()
+
+    def _scan(self, source):
+        self.file.write_text(source)
+        return ins.StaticModule(self.file).scan_keywords()
+
+    def test_static_config(self):
+        kw_file = Path(*Path(__file__).parts[0:-2], 'resources', 'keywords', 'testfolder', 'keywords.py')
+        names, configs, docs = ins.StaticModule(kw_file).scan_keywords()
+        self.assertEqual(['test_case_1', 'test_case_2'], names, 'All keywords should be found.')
+        self.assertEqual({'mandatory_variables': ['var2', 'var3'], 'iterable': 'R'}, configs['test_case_1'],
+                         'Local variables in the config should be resolved.')
+        self.assertEqual(' This is a dummy keyword ', docs['test_case_1'], 'The raw docstring should be returned.')
+
+    def test_dynamic_config(self):
+        source = ('class Keywords:\n    def kw(self, fw):\n        pass\n\n'
+                  'class Config:\n    @staticmethod\n    def kw():\n        return {"iterable": str(1)}\n\n'
+                  'class Data:\n    def kw(self, fw):\n        pass\n')
+        names, configs, docs = self._scan(source)
+        self.assertEqual(['kw'], names, 'The keyword should be found.')
+        self.assertNotIn('kw', configs, 'A computed config is not static.')
+
+    def test_inheritance_not_static(self):
+        with self.assertRaises(ValueError):
+            self._scan('class Keywords(Base):\n    pass\n')
+
+    def test_pom_arguments(self):
+        pom_file = Path(*Path(__file__).parts[0:-4], 'system', 'pom', 'screen_1.py')
+        actions = ins.StaticModule(pom_file).scan_pom(('click', 'select'))
+        self.assertEqual(('Test', 'click_here', ('Ab',), {'b': 123}, 'Stuff happening in this pom thing'),
+                         actions[0], 'Arguments, defaults and docstring should be extracted.')
+        self.assertEqual(2, len(actions), 'Only actions with a valid prefix should be returned.')
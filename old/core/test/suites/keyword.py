@@ -3,6 +3,8 @@ import fw.old.core.keyword as kw
 from pathlib import Path
 import os
 import shutil
+import sys
+from fw.old.core.test.benchmarks import synthetic
 
 
 class KeywordFilesInitTest(ut.TestCase):
@@ -88,3 +90,122 @@ class DataMethodsTests(ut.TestCase):
         # self.assertTrue(hasattr(self.dwm, 'test_case_1'), 'Keyword should be present.')
         # self.assertTrue(hasattr(self.dwm, 'test_case_2'), 'Keyword should be present.')
         pass
+
+
+class KeywordRegistryTests(ut.TestCase):
+    def setUp(self):
+        kw_dir = Path(*Path(__file__).parts[0:-2], 'resources', 'keywords')
+        self.registry = kw.KeywordRegistry(kw.ExtendedKeywords(kw_dirs=[kw_dir]), kw.PageObjectModelKeywords())
+
+    def test_lazy_discovery(self):
+        self.registry.get('config', 'test_case_1')
+        self.assertEqual(1, len(self.registry._members), 'Only the first keyword module should have been resolved.')
+
+    def test_get_methods(self):
+        self.assertEqual('R', self.registry.get('config', 'test_case_1')()['iterable'], 'Config should be returned.')
+        self.assertTrue(callable(self.registry.get('keyword', 'test_case_1')), 'Keyword should be returned.')
+        self.assertTrue(callable(self.registry.get('data', 'test_case_2')), 'Data method should be returned.')
+
+    def test_missing_keyword(self):
+        with self.assertRaises(AttributeError):
+            self.registry.get('keyword', 'non_existing_keyword')
+
+    def test_compatibility_class(self):
+        cls = self.registry.build_class('config')
+        self.assertTrue(hasattr(cls(), 'test_case_1'), 'Keyword should be present in the combined class.')
+
+
+class KeywordRegistryOwnerTests(ut.TestCase):
+    def setUp(self):
+        self.kw_dir = synthetic.make_keyword_tree('owner_keywords', 5)
+        self.registry = kw.KeywordRegistry(kw.ExtendedKeywords(kw_dirs=[self.kw_dir]), kw.PageObjectModelKeywords())
+        self.registry._get_manifest().records()
+        synthetic.purge_modules(self.kw_dir)
+
+    def tearDown(self):
+        synthetic.purge_modules(self.kw_dir)
+        synthetic.remove_tree('owner_keywords')
+
+    def _imported(self):
+        prefix = synthetic.module_name(self.kw_dir)
+        return sorted([m for m in sys.modules if m.startswith(prefix + '.') and m.endswith('.keywords')])
+
+    def test_owner_only(self):
+        self.assertTrue(callable(self.registry.get('keyword', 'kw_4_0')), 'Keyword should be returned.')
+        self.assertListEqual(['{}.kwmod_4.keywords'.format(synthetic.module_name(self.kw_dir))], self._imported(),
+                             'Only the module of the keyword should be imported.')
+
+    def test_missing_imports_nothing(self):
+        for _ in range(2):
+            with self.assertRaises(AttributeError):
+                self.registry.get('keyword', 'non_existing_keyword')
+        self.assertListEqual([], self._imported(), 'No module should be imported for a missing keyword.')
+
+
+class KeywordManifestTests(ut.TestCase):
+    def setUp(self):
+        self.resource_dir = Path(*Path(__file__).parts[0:-2], 'resources', 'keywords')
+        self.kw_dir = Path(*Path(__file__).parts[0:-2], 'temp', 'manifest_keywords')
+        shutil.copytree(self.resource_dir, self.kw_dir)
+        Path(self.kw_dir.parent, '__init__.py').touch()
+        self.manifest_file = Path(self.kw_dir, kw.KeywordManifest.file_name)
+
+    def tearDown(self):
+        shutil.rmtree(self.kw_dir)
+
+    def _manifest(self):
+        return kw.KeywordManifest(kw.ExtendedKeywords(kw_dirs=[self.kw_dir]), kw.PageObjectModelKeywords())
+
+    def test_records(self):
+        record = self._manifest().get('test_case_1')
+        self.assertEqual(['var2', 'var3'], record['mandatory_variables'], 'Mandatory variables should be stored.')
+        self.assertEqual('R', record['properties']['iterable'], 'Required properties should be stored.')
+        self.assertEqual(' This is a dummy keyword ', record['doc'], 'The docstring should be stored.')
+
+    def test_manifest_written(self):
+        self._manifest().records()
+        self.assertTrue(self.manifest_file.exists(), 'The manifest should be written next to the keywords.')
+
+    def test_unchanged_files_not_scanned(self):
+        self._manifest().records()
+        manifest = self._manifest()
+        manifest.records()
+        self.assertEqual(0, manifest.scanned, 'No keyword module should have been scanned again.')
+
+    def test_changed_file_scanned(self):
+        self._manifest().records()
+        kw_file = Path(self.kw_dir, 'testfolder', 'keywords.py')
+        kw_file.write_text(kw_file.read_text().replace("'iterable': 'R'", "'iterable': 'N'"))
+        manifest = self._manifest()
+        self.assertEqual('N', manifest.get('test_case_1')['properties']['iterable'], 'The change should be read.')
+        self.assertEqual(1, manifest.scanned, 'Only the changed module should have been scanned.')
+
+
+class KeywordIndexTests(ut.TestCase):
+    setUp = KeywordManifestTests.setUp
+    tearDown = KeywordManifestTests.tearDown
+
+    def _index(self):
+        return kw.KeywordIndex(KeywordManifestTests._manifest(self))
+
+    def test_record(self):
+        record = self._index().get('test_case_1')
+        self.assertEqual(('VAR2', 'VAR3'), record.mandatory_upper, 'Variables should be uppercased.')
+        self.assertEqual(('var2=()', 'var3=()'), record.robot_arguments, 'Robot argument specs should be built.')
+        self.assertEqual(' This is a dummy keyword ', record.doc, 'The docstring should be stored.')
+
+    def test_pom_arguments(self):
+        record = self._index().get('(screen 1) click here')
+        self.assertEqual(('Ab=()', 'b=123'), record.robot_arguments, 'Optional variables should have defaults.')
+        self.assertEqual('_BO_screen_1_BC__click_here', record.method_name, 'The method name should be stored.')
+
+    def test_qualified(self):
+        self.assertIn('test_case_1', self._index().qualified_names(), 'The keyword should be qualified.')
+
+    def test_normalized_lookup(self):
+        index = self._index()
+        self.assertIs(index.get('test_case_1'), index.get('Test Case 1'), 'Lookup should be normalized.')
+
+    def test_frozen(self):
+        with self.assertRaises(AttributeError):
+            self._index().get('test_case_1').doc = 'new'
@@ -0,0 +1,71 @@
+import unittest as ut
+from fw import Framework
+import fw.old.core.profiling as pf
+from pathlib import Path
+import pstats
+import shutil
+
+
+def busy():
+    return sum(range(10000))
+
+
+class KeywordProfilerTests(ut.TestCase):
+    def setUp(self):
+        self.dir = Path(Path(__file__).parents[1], 'temp', 'profiles')
+        self.fw = Framework(**{'--LOG_LEVEL': None, '--LOG_LOC': str(self.dir), '--PROFILE': 'cprofile'})
+        self.profiler = pf.KeywordProfiler()
+
+    def tearDown(self):
+        self.profiler.reset()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _call(self, name='my_kw', **kwargs):
+        with self.profiler.profile(self.fw, name, kwargs):
+            busy()
+
+    def test_per_keyword(self):
+        self._call()
+        self._call()
+        self._call('other_kw')
+        files = sorted(Path(self.dir, 'profiles').iterdir())
+        self.assertEqual(2, len(files), 'One file per keyword should be written.')
+        self.assertTrue(files[0].name.startswith('profile_my_kw_') and files[0].suffix == '.pstats',
+                        'Files should be named with the file name template.')
+        calls = [v[1] for k, v in pstats.Stats(str(files[0])).stats.items() if k[2] == 'busy']
+        self.assertListEqual([2], calls, 'The calls of a keyword should be accumulated.')
+        merged = pstats.Stats(str(self.profiler.write_merged()))
+        self.assertListEqual([3], [v[1] for k, v in merged.stats.items() if k[2] == 'busy'],
+                             'The run profile should merge all keywords.')
+
+    def test_nested(self):
+        with self.profiler.profile(self.fw, 'outer_kw', {}):
+            self._call('inner_kw')
+            busy()
+        files = [f.name for f in Path(self.dir, 'profiles').iterdir()]
+        self.assertTrue(len(files) == 1 and files[0].startswith('profile_outer_kw_'),
+                        'Nested keywords should not be profiled on their own.')
+        stats = pstats.Stats(str(Path(self.dir, 'profiles', files[0])))
+        self.assertListEqual([2], [v[1] for k, v in stats.stats.items() if k[2] == 'busy'],
+                             'The outer profile should hold the nested keyword.')
+
+    def test_every(self):
+        for _ in range(5):
+            self._call(**{'--PROFILE_EVERY': 2})
+        merged = pstats.Stats(str(self.profiler.write_merged()))
+        self.assertListEqual([3], [v[1] for k, v in merged.stats.items() if k[2] == 'busy'],
+                             'Only every second call should be profiled.')
+
+    def test_threshold(self):
+        self._call(**{'--PROFILE_MIN_SECONDS': 60})
+        self.assertIsNone(self.profiler.write_merged(), 'Fast calls should not be kept.')
+
+    def test_disabled(self):
+        self._call(**{'--PROFILE': None})
+        self.fw.fw_settings['PROFILE'] = False
+        self._call()
+        self.assertFalse(self.dir.exists(), 'Nothing should be profiled.')
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            self._call(**{'--PROFILE': 'yappi'})
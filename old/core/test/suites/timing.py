@@ -0,0 +1,52 @@
+import unittest as ut
+from fw import Framework
+import fw.old.core.data as dl
+import fw.old.core.timing as tm
+import json
+from pathlib import Path
+import shutil
+
+
+class StageTimerTests(ut.TestCase):
+    def setUp(self):
+        self.timer = tm.StageTimer()
+        self.dir = Path(Path(__file__).parents[1], 'temp', 'timings')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_disabled(self):
+        with self.timer.span('stage'):
+            pass
+        with self.timer.keyword('kw', enabled=False), self.timer.span('stage'):
+            pass
+        self.assertDictEqual({}, self.timer.summary(), 'Spans outside timed keywords should not be recorded.')
+        self.assertIs(self.timer.span('a'), self.timer.span('b'), 'A shared no-op span should be returned.')
+
+    def test_summary(self):
+        for i in range(100):
+            self.timer.record('kw', 'stage', (i + 1) / 1000)
+        stats = self.timer.summary()['kw']['stage']
+        self.assertEqual(100, stats['count'], 'All spans should be counted.')
+        self.assertAlmostEqual(5.05, stats['sum'], msg='Spans should be summed.')
+        self.assertEqual(0.1, stats['max'], 'The longest span should be kept.')
+        self.assertListEqual([0.051, 0.096, 0.1], [stats['p50'], stats['p95'], stats['p99']],
+                             'Quantiles should be computed.')
+
+    def test_get_data_stages(self):
+        loader = dl.DataLoader(Framework(**{'--LOG_LEVEL': None}))
+        with dl.stage_timer.keyword('timed'):
+            loader.get_data(None, VALUE='ev:1+1', DATE='2019-01-01')
+        stages = dl.stage_timer.summary()['timed']
+        dl.stage_timer.reset()
+        self.assertListEqual(['dates', 'evaluate', 'read'], sorted(stages), 'The stages of get_data should be timed.')
+
+    def test_exports(self):
+        self.timer.record('my "kw"', 'keyword', 0.25)
+        prom = self.timer.export_prometheus(self.dir).read_text()
+        self.assertIn('fw_keyword_stage_seconds{keyword="my \\"kw\\"",stage="keyword",quantile="0.95"} 0.25',
+                      prom, 'Quantiles should be exported with escaped labels.')
+        self.assertIn('fw_keyword_stage_seconds_count{keyword="my \\"kw\\"",stage="keyword"} 1', prom,
+                      'Counts should be exported.')
+        data = json.loads(self.timer.export_json(self.dir).read_text())
+        self.assertEqual(1, data['my "kw"']['keyword']['count'], 'The summary should be exported as json.')
@@ -0,0 +1,75 @@
+import unittest as ut
+import time
+from pathlib import Path
+from fw.old.core.utilities import Util, Settings, SettingsCache
+
+
+class SettingsSnapshotTest(ut.TestCase):
+    def setUp(self):
+        Util.reload_settings()
+
+    def test_cached(self):
+        self.assertIs(Util().settings(), Util().settings(), 'The same snapshot should be returned.')
+
+    def test_attribute_access(self):
+        sets = Util().settings()
+        self.assertEqual(sets['CSV_SEP'], sets.CSV_SEP, 'Key and attribute access should match.')
+        with self.assertRaises(AttributeError):
+            getattr(sets, 'NON_EXISTING_SETTING')
+
+    def test_read_only(self):
+        sets = Util().settings()
+        with self.assertRaises(TypeError):
+            sets.CSV_SEP = ','
+        with self.assertRaises(TypeError):
+            sets.POM_DEFAULT_KW_PROPERTIES['iterable'] = 'R'
+
+    def test_to_series_is_editable(self):
+        sets = Util().settings().to_series()
+        sets['CSV_SEP'] = ','
+        self.assertEqual(',', sets.CSV_SEP, 'The series copy should be editable.')
+        self.assertNotEqual(',', Util().settings().CSV_SEP, 'The snapshot should not be changed.')
+
+    def test_defaults_added(self):
+        self.assertIn('DEFAULT_SPECIFIER', Util().settings(), 'Default settings should be included.')
+
+
+class SettingsCacheTest(ut.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(*Path(__file__).parts[0:-2], 'temp')
+        self.temp_dir.mkdir(exist_ok=True)
+        self.file = Path(self.temp_dir, 'settings_cache_test.yaml')
+        self.file.write_text('A: 1')
+        self.cache = SettingsCache(check_interval=0)
+
+    def tearDown(self):
+        self.file.unlink()
+
+    def _loader(self):
+        return Settings({'A': self.file.read_text()})
+
+    def test_reload_on_change(self):
+        first = self.cache.get(self._loader, lambda: (self.file,))
+        self.file.write_text('A: 22')
+        second = self.cache.get(self._loader, lambda: (self.file,))
+        self.assertIsNot(first, second, 'A changed file should trigger a reload.')
+        self.assertEqual(2, self.cache.loads, 'The settings should have been loaded twice.')
+
+    def test_no_reload_on_touch(self):
+        self.cache.get(self._loader, lambda: (self.file,))
+        time.sleep(0.01)
+        self.file.write_text('A: 1')
+        self.cache.get(self._loader, lambda: (self.file,))
+        self.assertEqual(1, self.cache.loads, 'Unchanged content should not trigger a reload.')
+
+
+class IsOnTest(ut.TestCase):
+    def test_strings(self):
+        self.assertListEqual([False] * 6, [Util.is_on(v) for v in ('', 'no', 'No', 'FALSE', ' off ', 'None')],
+                             'Off strings should switch a setting off.')
+        self.assertListEqual([True] * 3, [Util.is_on(v) for v in ('yes', 'True', 'cprofile')],
+                             'Other strings should switch a setting on.')
+
+    def test_values(self):
+        self.assertListEqual([False, False, True, True], [Util.is_on(v) for v in (None, False, True, 1)],
+                             'Other values should be used as a boolean.')
@@ -0,0 +1,105 @@
+import os
+import signal
+import time
+import unittest as ut
+import fw.old.core.keyword as kw
+import fw.old.core.workers as wk
+from pathlib import Path
+import shutil
+
+WORKER_KEYWORDS = '''
+import os
+
+
+class Keywords:
+    def worker_pid(self, fw):
+        if fw.DATA.VALUE.iloc[0] == 'fail':
+            raise ValueError('Keyword failed.')
+        return fw.DATA.VALUE.iloc[0], os.getpid()
+
+
+class Config:
+    @staticmethod
+    def worker_pid():
+        return {'mandatory_variables': ['value'],
+                'iterable': None}
+
+
+class Data:
+    def worker_pid(self, fw):
+        pass
+'''
+
+
+class WorkerPoolTests(ut.TestCase):
+    def setUp(self):
+        self.kw_dir = Path(*Path(__file__).parts[0:-2], 'temp', 'worker_keywords')
+        Path(self.kw_dir, 'workermod').mkdir(parents=True, exist_ok=True)
+        for init in (Path(self.kw_dir.parent, '__init__.py'), Path(self.kw_dir, '__init__.py'),
+                     Path(self.kw_dir, 'workermod', '__init__.py')):
+            init.touch()
+        Path(self.kw_dir, 'workermod', 'keywords.py').write_text(WORKER_KEYWORDS)
+        kw.set_keyword_sources(kw.ExtendedKeywords(kw_dirs=[self.kw_dir]), kw.PageObjectModelKeywords())
+
+    def tearDown(self):
+        kw.set_keyword_sources()
+        shutil.rmtree(self.kw_dir)
+
+    def _pool(self, **options):
+        # workers are forked, so they share the keyword sources of the test.
+        return wk.WorkerPool(size=2, settings={'--LOG_LEVEL': None}, context=wk.multiprocessing.get_context('fork'),
+                             **options)
+
+    def test_results(self):
+        with self._pool(max_jobs=0) as pool:
+            futures = [pool.submit('worker_pid', kwargs={'value': str(i)}) for i in range(10)]
+            results = [f.result(timeout=30) for f in futures]
+            stats = pool.stats()
+        self.assertListEqual([str(i) for i in range(10)], [r[0] for r in results], 'All jobs should return.')
+        self.assertLessEqual(len({r[1] for r in results}), 2, 'Jobs should run in the warm workers.')
+        self.assertEqual(10, stats['completed'], 'Completed jobs should be counted.')
+        self.assertGreater(stats['throughput'], 0, 'Throughput should be reported.')
+        self.assertIn('latency_p95', stats, 'Latencies should be reported.')
+
+    def test_exception(self):
+        with self._pool() as pool:
+            error = pool.submit('worker_pid', kwargs={'value': 'fail'}).exception(timeout=30)
+            self.assertEqual('v', pool.run('worker_pid', kwargs={'value': 'v'})[0], 'The worker should continue.')
+        self.assertIsInstance(error, ValueError, 'The exception of the keyword should be returned.')
+        self.assertIn('Traceback', str(error.__cause__), 'The worker traceback should be attached.')
+
+    def test_recycling(self):
+        with self._pool(max_jobs=2) as pool:
+            pids = {pool.run('worker_pid', kwargs={'value': str(i)})[1] for i in range(6)}
+            stats = pool.stats()
+        self.assertGreaterEqual(len(pids), 3, 'Workers should be replaced after their maximum number of jobs.')
+        self.assertGreaterEqual(stats['recycled'], 2, 'Recycled workers should be counted.')
+
+    def test_killed_worker(self):
+        with self._pool() as pool:
+            pid = pool.run('worker_pid', kwargs={'value': 'a'})[1]
+            os.kill(pid, signal.SIGKILL)
+            deadline = time.time() + 30
+            while pool.stats()['crashed'] == 0 and time.time() < deadline:
+                time.sleep(0.05)
+            pids = {pool.run('worker_pid', kwargs={'value': str(i)})[1] for i in range(4)}
+            stats = pool.stats()
+        self.assertNotIn(pid, pids, 'The killed worker should be replaced.')
+        self.assertEqual(2, stats['workers'], 'The pool should keep its size.')
+
+    def test_shutdown_recycling(self):
+        pool = wk.WorkerPool(size=1, settings={'--LOG_LEVEL': None}, max_jobs=1,
+                             context=wk.multiprocessing.get_context('fork'))
+        futures = [pool.submit('worker_pid', kwargs={'value': str(i)}) for i in range(3)]
+        pool.shutdown(wait=False)
+        pool._manager.join(timeout=60)
+        self.assertFalse(pool._manager.is_alive(), 'Shutdown should return with jobs queued.')
+        self.assertListEqual(['0', '1', '2'], [f.result(timeout=0)[0] for f in futures],
+                             'Queued jobs should run on replaced workers.')
+        self.assertEqual(3, pool.stats()['recycled'], 'Every worker should have been recycled.')
+
+    def test_shutdown(self):
+        pool = self._pool()
+        pool.shutdown()
+        with self.assertRaises(RuntimeError):
+            pool.submit('worker_pid', kwargs={'value': 'v'})
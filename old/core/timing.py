@@ -0,0 +1,141 @@
+from collections import deque
+from pathlib import Path
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+
+from .utilities import Util
+
+
+class _StageStats:
+    __slots__ = ('count', 'total', 'max', 'samples')
+
+    def __init__(self, sample_size):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=sample_size)
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.samples.append(duration)
+
+    def summary(self, quantiles):
+        samples = sorted(self.samples)
+        result = {'count': self.count, 'sum': self.total, 'max': self.max}
+        for q in quantiles:
+            result['p{}'.format(int(q * 100))] = samples[min(len(samples) - 1, int(q * len(samples)))]
+        return result
+
+
+class _Span:
+    __slots__ = ('_timer', '_keyword', '_stage', '_start')
+
+    def __init__(self, timer, keyword, stage):
+        self._timer = timer
+        self._keyword = keyword
+        self._stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._timer.record(self._keyword, self._stage, time.perf_counter() - self._start)
+
+
+class StageTimer:
+    """
+    Timing spans of the stages of keyword calls (e.g. get_data, dates, evaluate, data, keyword), aggregated per
+    keyword and stage.
+
+    Spans are only recorded inside keyword(name) with timing enabled (setting TIMING); otherwise span returns a
+    shared no-op context manager. Quantiles are computed over the latest sample_size spans of a stage, counts, sums
+    and maxima over all of them.
+    """
+    quantiles = (0.5, 0.95, 0.99)
+    sample_size = 10000
+    file_name = 'keyword_timings'
+    _null = contextlib.nullcontext()
+
+    def __init__(self):
+        self._keyword = contextvars.ContextVar('timed_keyword', default=None)
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    @contextlib.contextmanager
+    def keyword(self, name, enabled=True):
+        token = self._keyword.set(name if enabled else None)
+        try:
+            yield
+        finally:
+            self._keyword.reset(token)
+
+    def span(self, stage):
+        name = self._keyword.get()
+        if name is None:
+            return self._null
+        return _Span(self, name, stage)
+
+    def record(self, name, stage, duration):
+        with self._lock:
+            stats = self._stats.get((name, stage))
+            if stats is None:
+                stats = self._stats[(name, stage)] = _StageStats(self.sample_size)
+            stats.add(duration)
+
+    def summary(self):
+        with self._lock:
+            items = [(key, stats.summary(self.quantiles)) for key, stats in self._stats.items()]
+        result = {}
+        for (name, stage), stats in sorted(items):
+            result.setdefault(name, {})[stage] = stats
+        return result
+
+    @staticmethod
+    def _label(val):
+        return str(val).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    def to_prometheus(self):
+        metric = 'fw_keyword_stage_seconds'
+        lines = ['# HELP {} Time spent in the stages of keyword calls.'.format(metric),
+                 '# TYPE {} summary'.format(metric)]
+        maxima = ['# HELP {}_max Longest stage of keyword calls.'.format(metric),
+                  '# TYPE {}_max gauge'.format(metric)]
+        for name, stages in self.summary().items():
+            for stage, stats in stages.items():
+                labels = 'keyword="{k}",stage="{s}"'.format(k=self._label(name), s=self._label(stage))
+                for q in self.quantiles:
+                    lines.append('{m}{{{l},quantile="{q}"}} {v!r}'
+                                 .format(m=metric, l=labels, q=q, v=stats['p{}'.format(int(q * 100))]))
+                lines.append('{m}_sum{{{l}}} {v!r}'.format(m=metric, l=labels, v=stats['sum']))
+                lines.append('{m}_count{{{l}}} {v}'.format(m=metric, l=labels, v=stats['count']))
+                maxima.append('{m}_max{{{l}}} {v!r}'.format(m=metric, l=labels, v=stats['max']))
+        return '\n'.join(lines + maxima) + '\n'
+
+    def _write(self, directory, extension, text):
+        directory = Path(directory or Util().settings().LOG_LOC)
+        directory.mkdir(parents=True, exist_ok=True)
+        file = Path(directory, '{}.{}'.format(self.file_name, extension))
+        temp_file = Path('{}.{}.tmp'.format(file, os.getpid()))
+        temp_file.write_text(text)
+        os.replace(temp_file, file)
+        return file
+
+    def export_json(self, directory=None):
+        return self._write(directory, 'json', json.dumps(self.summary(), indent=1))
+
+    def export_prometheus(self, directory=None):
+        return self._write(directory, 'prom', self.to_prometheus())
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+
+stage_timer = StageTimer()
@@ -1,16 +1,136 @@
 import pandas as pd
 from pathlib import Path
+from collections.abc import Mapping
+from types import MappingProxyType
+import hashlib
+import importlib
+import threading
+import time
 import re
 import logging
 
 
+SETTINGS_CHECK_INTERVAL = 1.0
+
+
+class Settings(Mapping):
+    """ Immutable snapshot of the framework settings, accessible by key and by attribute. """
+    def __init__(self, set_dict):
+        object.__setattr__(self, '_data', {k: self._freeze(v) for k, v in set_dict.items()})
+
+    @staticmethod
+    def _freeze(val):
+        if isinstance(val, list):
+            return tuple(val)
+        elif isinstance(val, dict):
+            return MappingProxyType(dict(val))
+        return val
+
+    def __getattr__(self, item):
+        if item[:1] == '_':
+            raise AttributeError(item)
+        try:
+            return self._data[item]
+        except KeyError:
+            raise AttributeError('Setting "{}" is not defined.'.format(item))
+
+    def __setattr__(self, key, value):
+        raise TypeError('The settings snapshot is read-only, use to_series() to get an editable copy.')
+
+    def __getitem__(self, item):
+        return self._data[item]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return 'Settings({})'.format(self._data)
+
+    @property
+    def index(self):
+        return tuple(self._data)
+
+    def to_series(self):
+        return pd.Series({k: dict(v) if isinstance(v, MappingProxyType) else v for k, v in self._data.items()},
+                         dtype=object)
+
+
+class SettingsCache:
+    """ Process wide cache of the settings snapshot, reloaded only when a backing file changed. """
+    def __init__(self, check_interval=SETTINGS_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        self.loads = 0
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._signature = None
+        self._digest = None
+        self._checked = 0.0
+
+    @staticmethod
+    def _stat(sources):
+        signature = []
+        for src in sources:
+            try:
+                st = src.stat()
+                signature.append((str(src), st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                signature.append((str(src), None, None))
+        return tuple(signature)
+
+    @staticmethod
+    def _hash(sources):
+        digest = hashlib.sha1()
+        for src in sources:
+            try:
+                digest.update(src.read_bytes())
+            except FileNotFoundError:
+                digest.update(b'<missing>')
+        return digest.hexdigest()
+
+    def get(self, loader, sources):
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked < self.check_interval:
+            return snapshot
+        with self._lock:
+            paths = sources()
+            signature = self._stat(paths)
+            if self._snapshot is None or signature != self._signature:
+                digest = self._hash(paths)
+                if self._snapshot is None or digest != self._digest:
+                    logging.debug('Loading the framework settings from "{}".'.format('", "'.join(map(str, paths))))
+                    self._snapshot = loader()
+                    self._digest = digest
+                    self.loads += 1
+                self._signature = signature
+            self._checked = time.monotonic()
+            return self._snapshot
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+            self._signature = None
+            self._digest = None
+
+
+_settings_cache = SettingsCache()
+
+
 class Util:
+    _python_settings_loaded = False
+    off_values = ('', 'none', 'no', 'off', 'false')
+
     @staticmethod
     def fw_dir():
         return Path(*Path(__file__).parts[:-2])
 
     def _python_settings(self):
         import fw.old.settings as sets
+        if self._python_settings_loaded:
+            sets = importlib.reload(sets)
+        Util._python_settings_loaded = True
         return {s.upper(): getattr(sets, s) for s in dir(sets) if s[0] != '_'}
 
     def _yaml_settings(self, file=None):
@@ -32,19 +152,29 @@ class Util:
         default = self._yaml_settings(Path(self.fw_dir(), "core", "defaults.yaml"))
         return default
 
-    def settings(self):
+    def _settings_sources(self):
+        yaml_file = Path(self.fw_dir(), "settings.yaml")
+        own_file = yaml_file if yaml_file.exists() else Path(self.fw_dir(), "settings.py")
+        return own_file, Path(self.fw_dir(), "core", "defaults.yaml")
+
+    def _load_settings(self):
         try:
             set_dict = self._yaml_settings()
         except FileNotFoundError:
             set_dict = self._python_settings()
-        sets = pd.Series(set_dict)
         def_sets = self._get_default_settings()
 
-        edit_cols = tuple(set(sets.index) & set(def_sets.keys()))
-        new_cols = {col: val for col, val in def_sets.items() if col not in edit_cols}
-        sets = sets.append(pd.Series(new_cols))
+        new_cols = {col: val for col, val in def_sets.items() if col not in set_dict}
+        set_dict.update(new_cols)
 
-        return sets
+        return Settings(set_dict)
+
+    def settings(self):
+        return _settings_cache.get(self._load_settings, self._settings_sources)
+
+    @staticmethod
+    def reload_settings():
+        _settings_cache.invalidate()
 
     @staticmethod
     def parse_env(env):
@@ -55,6 +185,13 @@ class Util:
         else:
             return tuple([str(env)])
 
+    @staticmethod
+    def is_on(val):
+        # settings given on a keyword call (e.g. from Robot) are strings, so "no" or "False" switch a setting off.
+        if isinstance(val, str):
+            return val.strip().lower() not in Util.off_values
+        return bool(val)
+
     @staticmethod
     def add_settings(fw_settings, test_settings,  kwargs, init=False):
         fw_sets = {k: v for k, v in kwargs.items() if k[0:2] == '--'}
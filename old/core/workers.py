@@ -0,0 +1,267 @@
+from concurrent.futures import Future
+from collections import deque
+from multiprocessing.connection import wait
+from multiprocessing.reduction import ForkingPickler
+import logging
+import multiprocessing
+import os
+import statistics
+import sys
+import threading
+import time
+import traceback
+
+try:
+    import resource
+except ImportError:     # not available on Windows, workers are then only recycled by job count
+    resource = None
+
+from .utilities import Util
+
+
+class _RemoteTraceback(Exception):
+    def __init__(self, tb):
+        super().__init__(tb)
+        self.tb = tb
+
+    def __str__(self):
+        return self.tb
+
+
+def _memory():
+    # peak resident size in bytes (ru_maxrss is in kilobytes on Linux and in bytes on macOS).
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def _error(e):
+    tb = ''.join(traceback.format_exception(type(e), e, e.__traceback__))
+    try:
+        ForkingPickler.dumps(e)
+    except Exception:
+        e = RuntimeError('{t}: {e}'.format(t=type(e).__name__, e=e))
+    return e, tb
+
+
+def _work(conn, env, settings, max_jobs, max_growth):
+    from fw.old import fw
+    fwo = fw(env, **settings)
+    fwo.get_keyword_names()
+    base = _memory()
+    done = 0
+    conn.send(('ready', os.getpid()))
+    while True:
+        job = conn.recv()
+        if job is None:
+            return
+        job_id, name, args, kwargs = job
+        start = time.perf_counter()
+        try:
+            value, error = fwo.run_keyword(name, args, kwargs), None
+            ForkingPickler.dumps(value)
+        except Exception as e:
+            value, error = None, _error(e)
+        done += 1
+        retire = bool((max_jobs and done >= max_jobs) or (max_growth and _memory() - base > max_growth))
+        conn.send(('done', job_id, value, error, time.perf_counter() - start, retire))
+        if retire:
+            return
+
+
+class _Worker:
+    def __init__(self, worker_id, process, conn):
+        self.id = worker_id
+        self.process = process
+        self.conn = conn
+        self.ready = False
+        self.job = None
+
+
+class WorkerPool:
+    """
+    Pool of warm worker processes, each holding an initialized framework object (settings, environment,
+    authorization and keyword index), that run the submitted keywords.
+
+    submit returns a Future with the keyword result; a failing keyword sets its exception, with the traceback of the
+    worker as cause. Workers are replaced after WORKER_MAX_JOBS jobs or when their peak memory grew by more than
+    WORKER_MAX_MEMORY_MB since they were started (0 disables either), and when they die. Every worker has its own
+    pipe, so a killed worker cannot block the others.
+    """
+    latency_window = 10000
+
+    def __init__(self, size=None, env=None, settings=None, max_jobs=None, max_memory_mb=None, context=None):
+        sets = Util().settings()
+        self.size = int(size or sets.get('WORKER_POOL_SIZE') or 0) or os.cpu_count()
+        self.max_jobs = int(sets.get('WORKER_MAX_JOBS', 0) if max_jobs is None else max_jobs)
+        max_memory_mb = sets.get('WORKER_MAX_MEMORY_MB', 0) if max_memory_mb is None else max_memory_mb
+        self.max_growth = int(float(max_memory_mb) * 2 ** 20)
+        self._env = env
+        self._settings = dict(settings or {})
+        self._mp = context or multiprocessing.get_context()
+        self._lock = threading.Lock()
+        self._wakeup_recv, self._wakeup_send = self._mp.Pipe(duplex=False)
+        self._workers = {}
+        self._pending = deque()
+        self._futures = {}
+        self._next_worker = 0
+        self._next_job = 0
+        self._closed = False
+        self._broken = False
+        self._started = time.perf_counter()
+        self._latencies = deque(maxlen=self.latency_window)
+        self._counts = {'submitted': 0, 'completed': 0, 'failed': 0, 'recycled': 0, 'crashed': 0}
+        for _ in range(self.size):
+            self._start_worker()
+        self._manager = threading.Thread(target=self._manage, name='fw-worker-pool', daemon=True)
+        self._manager.start()
+
+    def _start_worker(self):
+        parent_conn, child_conn = self._mp.Pipe()
+        process = self._mp.Process(target=_work, name='fw-worker-{}'.format(self._next_worker), daemon=True,
+                                   args=(child_conn, self._env, self._settings, self.max_jobs, self.max_growth))
+        process.start()
+        child_conn.close()
+        self._workers[self._next_worker] = _Worker(self._next_worker, process, parent_conn)
+        self._next_worker += 1
+
+    def _finish(self, job_id, value=None, error=None, duration=None):
+        future = self._futures.pop(job_id)
+        if duration is not None:
+            self._latencies.append(duration)
+        if error is None:
+            self._counts['completed'] += 1
+            future.set_result(value)
+        else:
+            self._counts['failed'] += 1
+            exc, tb = error
+            if tb:
+                exc.__cause__ = _RemoteTraceback(tb)
+            future.set_exception(exc)
+
+    def _fail_pending(self, message):
+        while self._pending:
+            self._finish(self._pending.popleft()[0], error=(RuntimeError(message), ''))
+
+    def _remove(self, worker, crashed=False):
+        del self._workers[worker.id]
+        worker.conn.close()
+        worker.process.join()
+        if crashed:
+            self._counts['crashed'] += 1
+            logging.warning('Worker {w} exited with code {c}.'.format(w=worker.id, c=worker.process.exitcode))
+            if worker.job is not None:
+                error = RuntimeError('Worker {w} exited with code {c} while running keyword "{n}".'
+                                     .format(w=worker.id, c=worker.process.exitcode, n=worker.job[1]))
+                self._finish(worker.job[0], error=(error, ''))
+        if not worker.ready:
+            # the framework object could not be initialized; another worker would fail the same way.
+            logging.error('Worker {} exited before it was initialized, it is not replaced.'.format(worker.id))
+            if not self._workers:
+                self._broken = True
+                self._fail_pending('No worker of the pool could be initialized.')
+        elif not self._closed or self._pending:
+            # after shutdown, jobs that are still queued need a worker too.
+            self._start_worker()
+
+    def _dispatch(self):
+        for worker in list(self._workers.values()):
+            if not self._pending:
+                return
+            if worker.ready and worker.job is None:
+                worker.job = self._pending.popleft()
+                try:
+                    worker.conn.send(worker.job)
+                except OSError:
+                    self._remove(worker, crashed=True)
+
+    def _receive(self, worker):
+        try:
+            message = worker.conn.recv()
+        except (EOFError, OSError):
+            self._remove(worker, crashed=True)
+            return
+        if message[0] == 'ready':
+            worker.ready = True
+            return
+        job_id, value, error, duration, retire = message[1:]
+        worker.job = None
+        self._finish(job_id, value, error, duration)
+        if retire:
+            self._counts['recycled'] += 1
+            logging.debug('Worker {} is recycled.'.format(worker.id))
+            self._remove(worker)
+
+    def _manage(self):
+        # the only thread talking to the workers: it hands out the pending jobs and collects the results.
+        while True:
+            with self._lock:
+                self._dispatch()
+                if self._closed and not self._pending and all(w.job is None for w in self._workers.values()):
+                    break
+                conns = {w.conn: w for w in self._workers.values()}
+            for conn in wait(list(conns) + [self._wakeup_recv]):
+                if conn is self._wakeup_recv:
+                    self._wakeup_recv.recv_bytes()
+                    continue
+                with self._lock:
+                    if conns[conn].id in self._workers:
+                        self._receive(conns[conn])
+        with self._lock:
+            workers = list(self._workers.values())
+        for worker in workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            worker.process.join()
+            worker.conn.close()
+
+    def submit(self, name, args=(), kwargs=None):
+        future = Future()
+        with self._lock:
+            if self._closed or self._broken:
+                raise RuntimeError('Keywords cannot be submitted to a worker pool that is shut down.')
+            job_id = self._next_job
+            self._next_job += 1
+            self._futures[job_id] = future
+            self._pending.append((job_id, name, list(args), dict(kwargs or {})))
+            self._counts['submitted'] += 1
+        self._wakeup_send.send_bytes(b'')
+        return future
+
+    def run(self, name, args=(), kwargs=None):
+        return self.submit(name, args, kwargs).result()
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counts = dict(self._counts)
+            running = sum(w.job is not None for w in self._workers.values())
+            pending = len(self._pending)
+            workers = len(self._workers)
+        elapsed = time.perf_counter() - self._started
+        stats = dict(counts, running=running, pending=pending, workers=workers, elapsed=elapsed,
+                     throughput=(counts['completed'] + counts['failed']) / elapsed if elapsed > 0 else 0.0)
+        if latencies:
+            stats.update(latency_mean=statistics.fmean(latencies),
+                         latency_p50=latencies[len(latencies) // 2],
+                         latency_p95=latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                         latency_max=latencies[-1])
+        return stats
+
+    def shutdown(self, wait=True, cancel_pending=False):
+        with self._lock:
+            self._closed = True
+            if cancel_pending:
+                self._fail_pending('The worker pool was shut down.')
+        self._wakeup_send.send_bytes(b'')
+        if wait:
+            self._manager.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()